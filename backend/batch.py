@@ -0,0 +1,340 @@
+"""Batch council runs for offline evaluation workloads.
+
+Reads prompts from a JSONL file, runs ``run_full_council`` over them with
+bounded concurrency and an optional request-rate limit, and appends one JSON
+line per prompt to an output file as soon as it finishes. Nothing is written
+to conversation storage and no titles are generated.
+
+Re-running with the same output file resumes: prompts whose id already has
+a successful record in the output are skipped.
+
+Usage:
+    python -m backend.batch prompts.jsonl results.jsonl --concurrency 4 --rate 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from . import config
+from . import shared
+from .council import run_full_council
+
+# Status of batch jobs started through the API lives in the shared state
+# (any worker can answer a poll); the newest BATCH_JOB_HISTORY are kept
+BATCH_JOB_NAMESPACE = "batch_job"
+BATCH_JOB_HISTORY = 1000
+
+# Tasks of the jobs this worker runs, keyed by batch id
+_batch_tasks: Dict[str, asyncio.Task] = {}
+
+
+def resolve_batch_path(path: str) -> str:
+    """
+    Resolve a batch file path given to the API against config.BATCH_DIR.
+
+    Relative paths are taken from the batch directory; absolute paths must
+    lie inside it, so API clients cannot read or append to other files.
+
+    Raises:
+        ValueError: If the path resolves outside the batch directory
+    """
+    root = os.path.realpath(config.BATCH_DIR)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if resolved == root or os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"Batch files must be inside {config.BATCH_DIR}")
+    return resolved
+
+
+def read_prompts(input_path: str) -> List[Dict[str, Any]]:
+    """
+    Read prompts from a JSONL file.
+
+    Each line is an object with a 'prompt' (or 'content') string and an
+    optional 'id'; lines without an id are numbered from 1. Blank lines are
+    ignored.
+
+    Args:
+        input_path: Path to the JSONL file
+
+    Returns:
+        List of dicts with 'id' and 'prompt' keys
+    """
+    prompts = []
+    with open(input_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            prompt = item.get("prompt", item.get("content"))
+            if not isinstance(prompt, str):
+                raise ValueError(f"Line {line_number}: missing 'prompt' string")
+            prompts.append({
+                "id": str(item.get("id", line_number)),
+                "prompt": prompt
+            })
+    return prompts
+
+
+def completed_ids(output_path: str) -> Set[str]:
+    """
+    Return ids that already have a successful record in the output file.
+
+    Args:
+        output_path: Path to a (possibly partial) results JSONL file
+
+    Returns:
+        Set of prompt ids to skip when resuming
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final line from an interrupted run
+                continue
+            if record.get("error") is None and "id" in record:
+                done.add(str(record["id"]))
+    return done
+
+
+def trim_torn_line(output_path: str):
+    """
+    Cut an unterminated last line (from an interrupted run) off the output.
+
+    Appending after it would merge the next record into the partial line,
+    losing that record and re-running its prompt on every resume.
+    """
+    if not os.path.exists(output_path):
+        return
+
+    with open(output_path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - 4096)
+            f.seek(start)
+            chunk = f.read(position - start)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                position = start + newline + 1
+                break
+            position = start
+        if position != end:
+            f.truncate(position)
+
+
+class RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart."""
+
+    def __init__(self, rate: Optional[float]):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_start - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+                now = time.monotonic()
+            self._next_start = now + self.interval
+
+
+async def run_batch(
+    input_path: str,
+    output_path: str,
+    concurrency: int = 4,
+    rate_limit: Optional[float] = None,
+    resume: bool = True,
+    review_size: Optional[int] = None,
+    structured_rankings: bool = False,
+    progress: Optional[Callable[[Dict[str, int]], Awaitable[None]]] = None
+) -> Dict[str, int]:
+    """
+    Run the council over every prompt in a JSONL file.
+
+    Args:
+        input_path: JSONL file of prompts (see read_prompts)
+        output_path: JSONL file results are appended to
+        concurrency: Maximum prompts in flight at once
+        rate_limit: Maximum prompt starts per second (None for unlimited)
+        resume: Skip prompts that already succeeded in output_path
+        review_size: Optional sparse Stage 2 review size
+        structured_rankings: Request JSON rankings in Stage 2
+        progress: Optional coroutine function awaited with the counters after each prompt
+
+    Returns:
+        Dict with 'total', 'skipped', 'completed' and 'failed' counts
+    """
+    prompts = read_prompts(input_path)
+    skip = completed_ids(output_path) if resume else set()
+    pending = [item for item in prompts if item["id"] not in skip]
+
+    counts = {
+        "total": len(prompts),
+        "skipped": len(prompts) - len(pending),
+        "completed": 0,
+        "failed": 0
+    }
+    if progress:
+        await progress(dict(counts))
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in pending:
+        queue.put_nowait(item)
+
+    limiter = RateLimiter(rate_limit)
+    write_lock = asyncio.Lock()
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    if resume:
+        trim_torn_line(output_path)
+
+    with open(output_path, 'a' if resume else 'w', encoding='utf-8') as out:
+
+        async def worker():
+            while True:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                await limiter.acquire()
+                started = time.monotonic()
+                record = {"id": item["id"], "prompt": item["prompt"]}
+                try:
+                    stage1, stage2, stage3, metadata = await run_full_council(
+                        item["prompt"],
+                        review_size=review_size,
+                        structured_rankings=structured_rankings
+                    )
+                    record.update({
+                        "stage1": stage1,
+                        "stage2": stage2,
+                        "stage3": stage3,
+                        "metadata": metadata,
+                        # No Stage 1 response means the "All models failed"
+                        # fallback; record it as an error so resume retries it
+                        "error": None if stage1 else stage3.get("response") or "All models failed"
+                    })
+                except Exception as e:
+                    record["error"] = str(e)
+                record["elapsed"] = round(time.monotonic() - started, 3)
+
+                async with write_lock:
+                    out.write(json.dumps(record) + "\n")
+                    out.flush()
+                    counts["failed" if record["error"] else "completed"] += 1
+                    if progress:
+                        await progress(dict(counts))
+
+        workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+        await asyncio.gather(*workers)
+
+    return counts
+
+
+async def _save_job(job: Dict[str, Any]):
+    await shared.call(
+        shared.get_state().cache_set, BATCH_JOB_NAMESPACE, job["id"], json.dumps(job), BATCH_JOB_HISTORY
+    )
+
+
+def get_batch_job(batch_id: str) -> Optional[Dict[str, Any]]:
+    """Return a batch job's status dict (from whichever worker runs it), or None."""
+    value = shared.get_state().cache_get(BATCH_JOB_NAMESPACE, batch_id)
+    return json.loads(value) if value is not None else None
+
+
+async def start_batch_job(input_path: str, output_path: str, **options) -> Dict[str, Any]:
+    """
+    Start run_batch as a background task and record its status in the shared state.
+
+    Args:
+        input_path: JSONL file of prompts
+        output_path: JSONL file results are appended to
+        **options: Extra keyword arguments for run_batch
+
+    Returns:
+        The job dict (id, status, paths and live counters)
+    """
+    batch_id = str(uuid.uuid4())
+    job = {
+        "id": batch_id,
+        "status": "running",
+        "input_path": input_path,
+        "output_path": output_path,
+        "counts": {},
+        "error": None
+    }
+    await _save_job(job)
+
+    async def on_progress(counts: Dict[str, int]):
+        job["counts"] = counts
+        await _save_job(job)
+
+    async def runner():
+        try:
+            job["counts"] = await run_batch(input_path, output_path, progress=on_progress, **options)
+            job["status"] = "complete"
+        except asyncio.CancelledError:
+            # Shutdown or an explicit cancel: don't leave the job "running"
+            job["status"] = "cancelled"
+            await asyncio.shield(_save_job(job))
+            raise
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = str(e)
+        await _save_job(job)
+
+    task = asyncio.create_task(runner())
+    _batch_tasks[batch_id] = task
+    task.add_done_callback(lambda _task: _batch_tasks.pop(batch_id, None))
+    return dict(job)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Run the LLM Council over a JSONL file of prompts.")
+    parser.add_argument("input", help="JSONL file with one {\"id\", \"prompt\"} object per line")
+    parser.add_argument("output", help="JSONL file to append results to")
+    parser.add_argument("--concurrency", type=int, default=4, help="prompts in flight at once (default: 4)")
+    parser.add_argument("--rate", type=float, default=None, help="maximum prompt starts per second")
+    parser.add_argument("--no-resume", action="store_true", help="overwrite output instead of resuming")
+    parser.add_argument("--review-size", type=int, default=None, help="sparse Stage 2 review size")
+    parser.add_argument("--structured", action="store_true", help="request JSON rankings in Stage 2")
+    args = parser.parse_args(argv)
+
+    async def report(counts: Dict[str, int]):
+        done = counts["skipped"] + counts["completed"] + counts["failed"]
+        print(f"[{done}/{counts['total']}] completed={counts['completed']} failed={counts['failed']} skipped={counts['skipped']}")
+
+    counts = asyncio.run(run_batch(
+        args.input,
+        args.output,
+        concurrency=args.concurrency,
+        rate_limit=args.rate,
+        resume=not args.no_resume,
+        review_size=args.review_size,
+        structured_rankings=args.structured,
+        progress=report
+    ))
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+"""Benchmark SSE event encode/decode cost against payload size.
+
+Builds a ``stage1_complete`` event with N council responses of a given
+length, then times encoding (plain vs compact, with and without gzip) and
+decoding, and reports wire size for each variant.
+
+Usage:
+    python -m backend.bench_events --sizes 1000 10000 100000 --models 4
+"""
+
+import argparse
+import json
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional
+
+from . import events
+
+
+def make_event(response_chars: int, models: int) -> Dict[str, Any]:
+    """A stage1_complete event with ``models`` responses of ``response_chars`` each."""
+    text = ("The council considers the question carefully. " * (response_chars // 46 + 1))[:response_chars]
+    return {
+        "type": "stage1_complete",
+        "data": [{"model": f"provider/model-{i}", "response": text} for i in range(models)],
+    }
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def bench_payload(response_chars: int, models: int = 4, repeat: int = 50) -> List[Dict[str, Any]]:
+    """Measure every encoding variant for one payload size."""
+    event = make_event(response_chars, models)
+    rows = []
+    for compact in (False, True):
+        frame = events.format_event(event, compact=compact)
+        raw = frame.encode("utf-8")
+        gz = events.StreamCompressor("gzip").compress(raw)
+
+        def decode():
+            payload = json.loads(frame[len("data: "):])
+            return events.expand_event(payload) if compact else payload
+
+        rows.append({
+            "response_chars": response_chars,
+            "encoding": "compact" if compact else "plain",
+            "encode_ms": _time(lambda: events.format_event(event, compact=compact), repeat) * 1000,
+            "gzip_encode_ms": _time(
+                lambda: events.StreamCompressor("gzip").compress(
+                    events.format_event(event, compact=compact).encode("utf-8")
+                ),
+                repeat
+            ) * 1000,
+            "decode_ms": _time(decode, repeat) * 1000,
+            "gzip_decode_ms": _time(lambda: zlib.decompressobj(31).decompress(gz), repeat) * 1000,
+            "bytes": len(raw),
+            "gzip_bytes": len(gz),
+        })
+    return rows
+
+
+def format_report(rows: List[Dict[str, Any]]) -> str:
+    """Render benchmark rows as a fixed-width table."""
+    serializer = "orjson" if events.orjson is not None else "json"
+    lines = [
+        f"serializer: {serializer}",
+        f"{'chars':>8} {'encoding':>8} {'enc ms':>8} {'gz enc':>8} {'dec ms':>8} {'gz dec':>8} {'bytes':>9} {'gz bytes':>9}",
+    ]
+    for row in rows:
+        lines.append(
+            f"{row['response_chars']:>8} {row['encoding']:>8} {row['encode_ms']:>8.3f} {row['gzip_encode_ms']:>8.3f} "
+            f"{row['decode_ms']:>8.3f} {row['gzip_decode_ms']:>8.3f} {row['bytes']:>9} {row['gzip_bytes']:>9}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark SSE event encoding.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="characters per council response")
+    parser.add_argument("--models", type=int, default=4, help="responses per event")
+    parser.add_argument("--repeat", type=int, default=50, help="iterations per measurement")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for size in args.sizes:
+        rows.extend(bench_payload(size, models=args.models, repeat=args.repeat))
+    print(json.dumps(rows, indent=2) if args.json else format_report(rows))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
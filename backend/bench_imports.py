@@ -0,0 +1,117 @@
+"""Import-time benchmark for backend cold start, checked against a budget.
+
+Runs ``python -X importtime -c "import backend.main"`` in fresh interpreters,
+keeps the best cumulative time per module across runs and compares it with
+``import_budget.json``. The budget also lists modules that must not be
+imported at all on the way to serving ``/`` (they are initialised lazily).
+
+Usage:
+    python -m backend.bench_imports
+    python -m backend.bench_imports --runs 5 --top 15 --json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+BUDGET_FILE = os.path.join(os.path.dirname(__file__), "import_budget.json")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(output: str) -> Dict[str, Dict[str, int]]:
+    """Map module name -> {"self_us", "cumulative_us"} from ``-X importtime`` output."""
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # the header line
+        modules[parts[2].strip()] = {"self_us": self_us, "cumulative_us": cumulative_us}
+    return modules
+
+
+def measure(module: str = "backend.main", runs: int = 3) -> Dict[str, Dict[str, int]]:
+    """Best-of-``runs`` import times for every module imported by ``module``."""
+    best: Dict[str, Dict[str, int]] = {}
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for name, times in parse_importtime(result.stderr).items():
+            if name not in best or times["cumulative_us"] < best[name]["cumulative_us"]:
+                best[name] = times
+    return best
+
+
+def load_budget(path: str = BUDGET_FILE) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def check_budget(measured: Dict[str, Dict[str, int]], budget: Dict[str, Any]) -> List[str]:
+    """Human-readable budget violations (empty when within budget)."""
+    violations = []
+    for name, limit_ms in budget.get("max_cumulative_ms", {}).items():
+        times = measured.get(name)
+        if times is None:
+            continue
+        took_ms = times["cumulative_us"] / 1000
+        if took_ms > limit_ms:
+            violations.append(f"{name}: {took_ms:.1f} ms > budget {limit_ms} ms")
+    for name in budget.get("forbidden", []):
+        if name in measured:
+            violations.append(f"{name}: imported at startup but should be loaded lazily")
+    return violations
+
+
+def format_report(measured: Dict[str, Dict[str, int]], budget: Dict[str, Any], top: int = 10) -> str:
+    limits = budget.get("max_cumulative_ms", {})
+    rows = sorted(measured.items(), key=lambda item: item[1]["cumulative_us"], reverse=True)
+    shown = [row for row in rows[:top]] + [row for row in rows[top:] if row[0] in limits]
+    lines = [f"{'module':<36} {'self ms':>8} {'cum ms':>8} {'budget':>8}"]
+    for name, times in shown:
+        limit = limits.get(name)
+        lines.append(
+            f"{name:<36} {times['self_us'] / 1000:>8.1f} {times['cumulative_us'] / 1000:>8.1f} "
+            f"{'' if limit is None else limit:>8}"
+        )
+    violations = check_budget(measured, budget)
+    lines.append("over budget:" if violations else "within budget")
+    lines.extend(f"  {violation}" for violation in violations)
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point; exits 1 when the budget is exceeded."""
+    parser = argparse.ArgumentParser(description="Measure backend import time against a budget.")
+    parser.add_argument("--module", default=None, help="module to import (default: the budget's)")
+    parser.add_argument("--runs", type=int, default=None, help="fresh interpreters to run (best is kept)")
+    parser.add_argument("--budget", default=BUDGET_FILE, help="budget JSON file")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list")
+    parser.add_argument("--json", action="store_true", help="print measurements and violations as JSON")
+    args = parser.parse_args(argv)
+
+    budget = load_budget(args.budget)
+    measured = measure(args.module or budget.get("module", "backend.main"), args.runs or budget.get("runs", 3))
+    violations = check_budget(measured, budget)
+    if args.json:
+        print(json.dumps({"modules": measured, "violations": violations}, indent=2))
+    else:
+        print(format_report(measured, budget, top=args.top))
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,119 @@
+"""Offline compaction of stored conversations.
+
+Rewrites every conversation file into a target storage format (optionally
+training a zstd dictionary on the existing conversations first) and reports
+the on-disk size and load time before and after. Run it while the backend
+is stopped.
+
+Usage:
+    python -m backend.compaction --format zstd --train-dict
+    python -m backend.compaction --format gzip --dry-run
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from . import storage
+
+
+def conversation_files() -> List[str]:
+    """Paths of all conversation files in the data directory."""
+    if not os.path.isdir(storage.DATA_DIR):
+        return []
+    return sorted(
+        os.path.join(storage.DATA_DIR, name)
+        for name in os.listdir(storage.DATA_DIR)
+        if storage.format_for_path(name)
+    )
+
+
+def measure(paths: List[str], repeat: int = 3) -> Dict[str, Any]:
+    """Total bytes and best-of-``repeat`` time to load every file."""
+    total_bytes = sum(os.path.getsize(path) for path in paths)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            storage.read_conversation_file(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {"files": len(paths), "bytes": total_bytes, "load_seconds": best or 0.0}
+
+
+def compact(fmt: str, train_dict: bool = False, dict_size: int = 64 * 1024,
+            dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Rewrite all conversations in ``fmt`` and return a size/load-time report.
+
+    Unreadable files are left untouched and listed under ``skipped``.
+    """
+    if fmt not in storage.FORMAT_SUFFIXES:
+        raise ValueError(f"Unknown storage format: {fmt}")
+    if fmt == "zstd" and storage.zstandard is None:
+        raise RuntimeError("zstd storage requires the 'zstandard' package")
+
+    paths = conversation_files()
+    before = measure(paths)
+
+    conversations = []
+    skipped = []
+    for path in paths:
+        try:
+            conversations.append(storage.read_conversation_file(path))
+        except Exception:
+            skipped.append(path)
+
+    if dry_run:
+        # Estimate by encoding in memory without touching the files
+        sizes = [len(storage.encode_conversation(c, fmt)) for c in conversations]
+        return {"format": fmt, "before": before, "after": {"files": len(sizes), "bytes": sum(sizes)},
+                "skipped": skipped, "dry_run": True}
+
+    if fmt == "zstd" and train_dict and conversations:
+        samples = [json.dumps(c, separators=(',', ':')).encode('utf-8') for c in conversations]
+        storage.train_zstd_dict(samples, dict_size=dict_size)
+
+    for conversation in conversations:
+        storage.write_conversation_file(conversation, fmt)
+
+    after = measure(conversation_files())
+    return {"format": fmt, "before": before, "after": after, "skipped": skipped, "dry_run": False}
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render a compaction report for the terminal."""
+    before, after = report["before"], report["after"]
+    ratio = (after["bytes"] / before["bytes"]) if before["bytes"] else 1.0
+    lines = [
+        f"format: {report['format']}{' (dry run)' if report['dry_run'] else ''}",
+        f"files: {before['files']} -> {after['files']}",
+        f"bytes: {before['bytes']} -> {after['bytes']} ({ratio:.1%} of original)",
+    ]
+    if "load_seconds" in after:
+        lines.append(f"load time: {before['load_seconds'] * 1000:.1f} ms -> {after['load_seconds'] * 1000:.1f} ms")
+    if report["skipped"]:
+        lines.append(f"skipped (unreadable): {len(report['skipped'])}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Rewrite stored conversations in a compressed format.")
+    parser.add_argument("--format", choices=sorted(storage.FORMAT_SUFFIXES), default="zstd",
+                        help="target storage format")
+    parser.add_argument("--train-dict", action="store_true", help="train a zstd dictionary on existing conversations")
+    parser.add_argument("--dict-size", type=int, default=64 * 1024, help="dictionary size in bytes")
+    parser.add_argument("--dry-run", action="store_true", help="report the expected size without rewriting")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = compact(args.format, train_dict=args.train_dict, dict_size=args.dict_size, dry_run=args.dry_run)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -19,8 +19,41 @@ COUNCIL_MODELS = [
 # Chairman model - synthesizes final response
 CHAIRMAN_MODEL = "google/gemini-3-pro-preview"
 
+# Conversation history sent with each turn ("none", "last_n", "token_budget", "summary")
+HISTORY_STRATEGY = "none"
+HISTORY_MAX_TURNS = 3
+HISTORY_TOKEN_BUDGET = 2000
+
+# Title generation: cheap model, deadline before the local heuristic is used, cache size
+TITLE_MODEL = "google/gemini-2.5-flash"
+TITLE_TIMEOUT_SECONDS = 5.0
+TITLE_CACHE_SIZE = 256
+
+# Shared upstream HTTP client: connection pool size and concurrent request limit
+UPSTREAM_MAX_CONNECTIONS = 32
+UPSTREAM_MAX_CONCURRENT_REQUESTS = 16
+
+# Backend worker processes (set by `python -m backend.main --workers N`). With
+# more than one, shared state defaults to a SQLite file next to the data dir.
+WORKERS = max(1, int(os.getenv("LLM_COUNCIL_WORKERS", "1")))
+SHARED_STATE = os.getenv("LLM_COUNCIL_SHARED_STATE", "sqlite" if WORKERS > 1 else "local")
+SHARED_STATE_FILE = os.getenv("LLM_COUNCIL_SHARED_STATE_FILE", "data/shared.sqlite3")
+
+# At-rest conversation format: "json" (plain), "gzip" or "zstd" (needs zstandard)
+STORAGE_FORMAT = os.getenv("LLM_COUNCIL_STORAGE_FORMAT", "json")
+
+# Compress SSE streams (gzip/brotli) when the client's Accept-Encoding allows it (opt-in: "1")
+SSE_COMPRESSION = os.getenv("LLM_COUNCIL_SSE_COMPRESSION", "0") == "1"
+
 # OpenRouter API endpoint
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
 
 # Data directory for conversation storage
 DATA_DIR = "data/conversations"
+
+# Directory the batch API reads prompt files from and writes results to
+BATCH_DIR = os.getenv("LLM_COUNCIL_BATCH_DIR", "data/batches")
+
+# Tracing exporter ("none", "memory" or "jsonl") and JSON Lines output path
+TRACE_EXPORTER = os.getenv("LLM_COUNCIL_TRACE_EXPORTER", "none")
+TRACE_FILE = os.getenv("LLM_COUNCIL_TRACE_FILE", "data/traces.jsonl")
@@ -1,26 +1,36 @@
 """3-stage LLM Council orchestration."""
 
-from typing import List, Dict, Any, Tuple, Optional
-
-from .openrouter import query_models_parallel, query_model
-from .config import COUNCIL_MODELS, CHAIRMAN_MODEL
+import asyncio
+import json
+import re
+from collections import OrderedDict
+from typing import AsyncIterator, List, Dict, Any, Tuple, Optional
+
+from . import metrics
+from . import shared
+from . import tracing
+from .openrouter import query_models_parallel, query_models_with_messages, iter_models_with_messages, query_model
+from .config import COUNCIL_MODELS, CHAIRMAN_MODEL, TITLE_TIMEOUT_SECONDS, TITLE_CACHE_SIZE
 from .settings import get_effective_settings
 
 
+@tracing.traced("council.stage1")
 async def stage1_collect_responses(
     user_query: str,
-    council_models: Optional[List[str]] = None
+    council_models: Optional[List[str]] = None,
+    history: Optional[List[Dict[str, str]]] = None
 ) -> List[Dict[str, Any]]:
     """
     Stage 1: Collect individual responses from all council models.
 
     Args:
         user_query: The user's question
+        history: Optional earlier-turn messages to prepend (see backend.history)
 
     Returns:
         List of dicts with 'model' and 'response' keys
     """
-    messages = [{"role": "user", "content": user_query}]
+    messages = list(history or []) + [{"role": "user", "content": user_query}]
     models_to_use = council_models or get_effective_settings().council_models or COUNCIL_MODELS
 
     # Query all models in parallel
@@ -38,37 +48,88 @@ async def stage1_collect_responses(
     return stage1_results
 
 
-async def stage2_collect_rankings(
+async def iter_stage1_responses(
     user_query: str,
-    stage1_results: List[Dict[str, Any]],
-    council_models: Optional[List[str]] = None
-) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    council_models: Optional[List[str]] = None,
+    history: Optional[List[Dict[str, str]]] = None
+) -> AsyncIterator[Dict[str, Any]]:
     """
-    Stage 2: Each model ranks the anonymized responses.
+    Stage 1 as an async iterator: yield each council member's response as
+    soon as it arrives.
+
+    Takes the same arguments as stage1_collect_responses and yields the same
+    'model'/'response' dicts, in completion order; failed models are skipped.
+    Closing the iterator early cancels the calls still in flight.
+    """
+    messages = list(history or []) + [{"role": "user", "content": user_query}]
+    models_to_use = council_models or get_effective_settings().council_models or COUNCIL_MODELS
+
+    with tracing.start_span("council.stage1"):
+        async for model, response in iter_models_with_messages({model: messages for model in models_to_use}):
+            if response is not None:
+                yield {
+                    "model": model,
+                    "response": response.get('content', '')
+                }
+
+
+def build_review_assignments(
+    reviewers: List[str],
+    labels: List[str],
+    review_size: int,
+    seed: Optional[int] = None
+) -> Dict[str, List[str]]:
+    """
+    Assign each reviewer a balanced subset of response labels.
+
+    Uses a cyclic incomplete block design over a shuffled label order: the
+    reviewers' blocks tile the cycle consecutively, so every response is
+    reviewed either floor(r*k/n) or ceil(r*k/n) times (exactly k times when
+    there are as many reviewers as responses).
 
     Args:
-        user_query: The original user query
-        stage1_results: Results from Stage 1
+        reviewers: Model identifiers doing the reviewing
+        labels: Response labels to distribute (e.g., "Response A")
+        review_size: Number of responses each reviewer sees (k)
+        seed: Optional seed for a reproducible assignment
 
     Returns:
-        Tuple of (rankings list, label_to_model mapping)
+        Dict mapping reviewer to its labels, in label order
     """
-    # Create anonymized labels for responses (Response A, Response B, etc.)
-    labels = [chr(65 + i) for i in range(len(stage1_results))]  # A, B, C, ...
+    import random
 
-    # Create mapping from label to model name
-    label_to_model = {
-        f"Response {label}": result['model']
-        for label, result in zip(labels, stage1_results)
-    }
+    order = list(labels)
+    random.Random(seed).shuffle(order)
+    n = len(order)
+    k = min(review_size, n)
+
+    position = {label: i for i, label in enumerate(labels)}
+    assignments = {}
+    for i, reviewer in enumerate(reviewers):
+        start = (i * k) % n
+        subset = [order[(start + j) % n] for j in range(k)]
+        assignments[reviewer] = sorted(subset, key=position.__getitem__)
+
+    return assignments
+
+
+def build_ranking_prompt(user_query: str, labelled_responses: List[Tuple[str, str]]) -> str:
+    """
+    Build the Stage 2 ranking prompt for a set of labelled responses.
 
-    # Build the ranking prompt
+    Args:
+        user_query: The original user query
+        labelled_responses: List of (label, response text) pairs, e.g. ("Response A", "...")
+
+    Returns:
+        The prompt text
+    """
     responses_text = "\n\n".join([
-        f"Response {label}:\n{result['response']}"
-        for label, result in zip(labels, stage1_results)
+        f"{label}:\n{response}"
+        for label, response in labelled_responses
     ])
 
-    ranking_prompt = f"""You are evaluating different responses to the following question:
+    return f"""You are evaluating different responses to the following question:
 
 Question: {user_query}
 
@@ -99,33 +160,367 @@ FINAL RANKING:
 
 Now provide your evaluation and ranking:"""
 
-    messages = [{"role": "user", "content": ranking_prompt}]
 
-    # Get rankings from all council models in parallel
+# Score range for structured rankings (prompt, schema and validation agree)
+MIN_SCORE = 1
+MAX_SCORE = 10
+
+# JSON schema for structured Stage 2 output (OpenAI-style response_format)
+RANKING_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "council_ranking",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "ranking": {
+                    "type": "array",
+                    "items": {"type": "string"}
+                },
+                "scores": {
+                    "type": "object",
+                    "additionalProperties": {"type": "number", "minimum": MIN_SCORE, "maximum": MAX_SCORE}
+                }
+            },
+            "required": ["ranking", "scores"],
+            "additionalProperties": False
+        }
+    }
+}
+
+# Per-model counts of how Stage 2 rankings were parsed
+_ranking_parse_stats: Dict[str, Dict[str, int]] = {}
+
+RANKING_PARSE_MODES = ("structured", "fallback", "text", "failed")
+
+
+def build_structured_ranking_prompt(user_query: str, labelled_responses: List[Tuple[str, str]]) -> str:
+    """
+    Build the Stage 2 prompt asking for a JSON ranking instead of prose.
+
+    Args:
+        user_query: The original user query
+        labelled_responses: List of (label, response text) pairs
+
+    Returns:
+        The prompt text
+    """
+    responses_text = "\n\n".join([
+        f"{label}:\n{response}"
+        for label, response in labelled_responses
+    ])
+    labels = [label for label, _ in labelled_responses]
+    example = json.dumps({
+        "ranking": labels,
+        "scores": {label: 7 for label in labels}
+    })
+
+    return f"""You are evaluating different responses to the following question:
+
+Question: {user_query}
+
+Here are the responses from different models (anonymized):
+
+{responses_text}
+
+Rank the responses from best to worst and score each one from {MIN_SCORE} (poor) to {MAX_SCORE} (excellent).
+
+Reply with ONLY a JSON object, no prose and no code fences, with exactly these keys:
+- "ranking": every response label, best first (e.g. "Response A")
+- "scores": an object mapping each response label to its score
+
+Example of the expected shape:
+{example}"""
+
+
+def validate_structured_ranking(text: str, labels: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    Validate a structured Stage 2 reply against the ranking schema.
+
+    The ranking must be a permutation of the labels the reviewer was shown;
+    scores are optional per label but must be numbers from MIN_SCORE to
+    MAX_SCORE, as the prompt and schema ask.
+
+    Args:
+        text: Raw model output
+        labels: Labels the reviewer was asked to rank
+
+    Returns:
+        Dict with 'ranking' and 'scores', or None if the output is invalid
+    """
+    payload = text.strip()
+    if payload.startswith("```"):
+        # Tolerate a fenced block despite the instructions
+        payload = payload.strip("`")
+        if payload.startswith("json"):
+            payload = payload[len("json"):]
+
+    try:
+        data = json.loads(payload)
+    except (TypeError, ValueError):
+        return None
+
+    if not isinstance(data, dict):
+        return None
+
+    ranking = data.get("ranking")
+    if not isinstance(ranking, list) or sorted(map(str, ranking)) != sorted(labels):
+        return None
+    if not all(isinstance(label, str) for label in ranking):
+        return None
+
+    scores = data.get("scores", {})
+    if not isinstance(scores, dict):
+        return None
+    for label, score in scores.items():
+        if label not in labels:
+            return None
+        if isinstance(score, bool) or not isinstance(score, (int, float)) or not MIN_SCORE <= score <= MAX_SCORE:
+            return None
+
+    return {"ranking": list(ranking), "scores": dict(scores)}
+
+
+def render_structured_ranking(structured_ranking: Dict[str, Any]) -> str:
+    """
+    Render a validated structured ranking as text in the prose format.
+
+    Keeps Stage 3 prompts, stored messages and clients that read the
+    'ranking' text working unchanged.
+    """
+    scores = structured_ranking["scores"]
+    lines = [
+        f"{label}: {scores[label]}/{MAX_SCORE}"
+        for label in structured_ranking["ranking"]
+        if label in scores
+    ]
+    if lines:
+        lines.append("")
+    lines.append("FINAL RANKING:")
+    lines.extend(
+        f"{position}. {label}"
+        for position, label in enumerate(structured_ranking["ranking"], start=1)
+    )
+    return "\n".join(lines)
+
+
+def record_ranking_parse(model: str, mode: str) -> None:
+    """Count how a model's Stage 2 output was parsed."""
+    counts = _ranking_parse_stats.setdefault(model, {m: 0 for m in RANKING_PARSE_MODES})
+    counts[mode] += 1
+
+
+def get_ranking_parse_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Return per-model Stage 2 parse counts and success rates.
+
+    'success_rate' is the share of replies that yielded a ranking at all;
+    'structured_rate' is the share of structured-mode replies that passed
+    schema validation without falling back to text parsing.
+    """
+    stats = {}
+    for model, counts in _ranking_parse_stats.items():
+        total = sum(counts.values())
+        structured_attempts = counts["structured"] + counts["fallback"]
+        stats[model] = {
+            **counts,
+            "total": total,
+            "success_rate": round((total - counts["failed"]) / total, 4) if total else None,
+            "structured_rate": (
+                round(counts["structured"] / structured_attempts, 4)
+                if structured_attempts else None
+            ),
+        }
+    return stats
+
+
+def anonymize_responses(stage1_results: List[Dict[str, Any]]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Label Stage 1 responses "Response A", "Response B", ... in list order.
+
+    Returns:
+        Tuple of (label_to_model, label_to_response) mappings
+    """
+    labels = [f"Response {chr(65 + i)}" for i in range(len(stage1_results))]  # A, B, C, ...
+    label_to_model = {label: result['model'] for label, result in zip(labels, stage1_results)}
+    label_to_response = {label: result['response'] for label, result in zip(labels, stage1_results)}
+    return label_to_model, label_to_response
+
+
+def _stage2_requests(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    council_models: Optional[List[str]],
+    review_size: Optional[int],
+    review_seed: Optional[int],
+    structured: bool
+) -> Tuple[Dict[str, List[Dict[str, str]]], Dict[str, List[str]], bool]:
+    """
+    Build each reviewer's Stage 2 messages.
+
+    Returns:
+        Tuple of (model -> messages, model -> assigned labels, sparse)
+    """
+    _, label_to_response = anonymize_responses(stage1_results)
     models_to_use = council_models or get_effective_settings().council_models or COUNCIL_MODELS
 
-    responses = await query_models_parallel(models_to_use, messages)
+    if review_size is not None and review_size < 2:
+        raise ValueError("review_size must be at least 2")
+    sparse = review_size is not None and review_size < len(stage1_results)
+    prompt_builder = build_structured_ranking_prompt if structured else build_ranking_prompt
+
+    all_labels = list(label_to_response.keys())
+    if sparse:
+        assignments = build_review_assignments(
+            models_to_use, all_labels, review_size, seed=review_seed
+        )
+        model_messages = {
+            model: [{
+                "role": "user",
+                "content": prompt_builder(
+                    user_query,
+                    [(label, label_to_response[label]) for label in assigned]
+                )
+            }]
+            for model, assigned in assignments.items()
+        }
+    else:
+        assignments = {model: all_labels for model in models_to_use}
+        ranking_prompt = prompt_builder(user_query, list(label_to_response.items()))
+        messages = [{"role": "user", "content": ranking_prompt}]
+        model_messages = {model: messages for model in models_to_use}
+
+    return model_messages, assignments, sparse
+
+
+def _format_ranking(
+    model: str,
+    response: Dict[str, Any],
+    assigned_labels: List[str],
+    structured: bool,
+    sparse: bool
+) -> Dict[str, Any]:
+    """Parse one reviewer's Stage 2 reply into a result dict, counting the parse mode."""
+    full_text = response.get('content', '') or ''
+    structured_ranking = None
+    if structured:
+        structured_ranking = validate_structured_ranking(full_text, assigned_labels)
+
+    if structured_ranking is not None:
+        parse_mode = "structured"
+        parsed = structured_ranking["ranking"]
+        result = {
+            "model": model,
+            "ranking": render_structured_ranking(structured_ranking),
+            "parsed_ranking": parsed,
+            "scores": structured_ranking["scores"]
+        }
+    else:
+        parsed = parse_ranking_from_text(full_text)
+        if not parsed:
+            parse_mode = "failed"
+        else:
+            parse_mode = "fallback" if structured else "text"
+        result = {
+            "model": model,
+            "ranking": full_text,
+            "parsed_ranking": parsed
+        }
+
+    record_ranking_parse(model, parse_mode)
+    if structured:
+        result["parse_mode"] = parse_mode
+    if sparse:
+        result["reviewed_labels"] = assigned_labels
+    return result
+
+
+@tracing.traced("council.stage2")
+async def stage2_collect_rankings(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    council_models: Optional[List[str]] = None,
+    review_size: Optional[int] = None,
+    review_seed: Optional[int] = None,
+    structured: bool = False
+) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """
+    Stage 2: Each model ranks the anonymized responses.
+
+    Args:
+        user_query: The original user query
+        stage1_results: Results from Stage 1
+        review_size: If set (and smaller than the number of responses), each
+            reviewer only ranks a balanced subset of this many responses
+        review_seed: Optional seed for the sparse review assignment
+        structured: Ask for a JSON ranking (via response_format) instead of
+            prose; invalid output falls back to parse_ranking_from_text
+
+    Returns:
+        Tuple of (rankings list, label_to_model mapping)
+    """
+    label_to_model, _ = anonymize_responses(stage1_results)
+    model_messages, assignments, sparse = _stage2_requests(
+        user_query, stage1_results, council_models, review_size, review_seed, structured
+    )
+    response_format = RANKING_RESPONSE_FORMAT if structured else None
+
+    # Get rankings from all council models in parallel
+    if sparse:
+        responses = await query_models_with_messages(
+            model_messages, response_format=response_format
+        )
+    else:
+        models_to_use = list(model_messages.keys())
+        messages = model_messages[models_to_use[0]] if models_to_use else []
+        responses = await query_models_parallel(
+            models_to_use, messages, response_format=response_format
+        )
 
     # Format results
-    stage2_results = []
-    for model, response in responses.items():
-        if response is not None:
-            full_text = response.get('content', '')
-            parsed = parse_ranking_from_text(full_text)
-            stage2_results.append({
-                "model": model,
-                "ranking": full_text,
-                "parsed_ranking": parsed
-            })
+    stage2_results = [
+        _format_ranking(model, response, assignments[model], structured, sparse)
+        for model, response in responses.items()
+        if response is not None
+    ]
 
     return stage2_results, label_to_model
 
 
+async def iter_stage2_rankings(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    council_models: Optional[List[str]] = None,
+    review_size: Optional[int] = None,
+    review_seed: Optional[int] = None,
+    structured: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stage 2 as an async iterator: yield each reviewer's ranking as soon as
+    it arrives.
+
+    Takes the same arguments as stage2_collect_rankings and yields the same
+    result dicts, in completion order. The label_to_model mapping comes from
+    anonymize_responses(stage1_results).
+    """
+    model_messages, assignments, sparse = _stage2_requests(
+        user_query, stage1_results, council_models, review_size, review_seed, structured
+    )
+    response_format = RANKING_RESPONSE_FORMAT if structured else None
+
+    with tracing.start_span("council.stage2"):
+        async for model, response in iter_models_with_messages(model_messages, response_format=response_format):
+            if response is not None:
+                yield _format_ranking(model, response, assignments[model], structured, sparse)
+
+
+@tracing.traced("council.stage3")
 async def stage3_synthesize_final(
     user_query: str,
     stage1_results: List[Dict[str, Any]],
     stage2_results: List[Dict[str, Any]],
-    chairman_model: Optional[str] = None
+    chairman_model: Optional[str] = None,
+    history: Optional[List[Dict[str, str]]] = None
 ) -> Dict[str, Any]:
     """
     Stage 3: Chairman synthesizes final response.
@@ -134,6 +529,7 @@ async def stage3_synthesize_final(
         user_query: The original user query
         stage1_results: Individual model responses from Stage 1
         stage2_results: Rankings from Stage 2
+        history: Optional earlier-turn messages to prepend (see backend.history)
 
     Returns:
         Dict with 'model' and 'response' keys
@@ -166,7 +562,7 @@ Your task as Chairman is to synthesize all of this information into a single, co
 
 Provide a clear, well-reasoned final answer that represents the council's collective wisdom:"""
 
-    messages = [{"role": "user", "content": chairman_prompt}]
+    messages = list(history or []) + [{"role": "user", "content": chairman_prompt}]
 
     # Query the chairman model
     chairman_to_use = chairman_model or get_effective_settings().chairman_model or CHAIRMAN_MODEL
@@ -227,6 +623,10 @@ def calculate_aggregate_rankings(
     """
     Calculate aggregate rankings across all models.
 
+    Partial rankings (from sparse review, marked by 'reviewed_labels') only
+    count labels the reviewer was shown, and their positions are rescaled
+    onto the full 1..n range so they average comparably with full rankings.
+
     Args:
         stage2_results: Rankings from each model
         label_to_model: Mapping from anonymous labels to model names
@@ -238,17 +638,34 @@ def calculate_aggregate_rankings(
 
     # Track positions for each model
     model_positions = defaultdict(list)
+    total = len(label_to_model)
 
     for ranking in stage2_results:
-        ranking_text = ranking['ranking']
-
-        # Parse the ranking from the structured format
-        parsed_ranking = parse_ranking_from_text(ranking_text)
-
-        for position, label in enumerate(parsed_ranking, start=1):
-            if label in label_to_model:
-                model_name = label_to_model[label]
-                model_positions[model_name].append(position)
+        parsed_ranking = ranking.get('parsed_ranking')
+        if parsed_ranking is None:
+            # Parse the ranking from the structured format
+            parsed_ranking = parse_ranking_from_text(ranking['ranking'])
+
+        reviewed = ranking.get('reviewed_labels')
+        if reviewed is None:
+            for position, label in enumerate(parsed_ranking, start=1):
+                if label in label_to_model:
+                    model_name = label_to_model[label]
+                    model_positions[model_name].append(position)
+            continue
+
+        # Partial ranking: keep shown labels once each, then rescale to 1..n
+        allowed = set(reviewed)
+        ranked = []
+        for label in parsed_ranking:
+            if label in allowed and label in label_to_model and label not in ranked:
+                ranked.append(label)
+
+        if len(ranked) < 2:
+            continue
+        scale = (total - 1) / (len(ranked) - 1)
+        for index, label in enumerate(ranked):
+            model_positions[label_to_model[label]].append(1 + index * scale)
 
     # Calculate average position for each model
     aggregate = []
@@ -267,16 +684,75 @@ def calculate_aggregate_rankings(
     return aggregate
 
 
-async def generate_conversation_title(user_query: str) -> str:
+# Model-generated titles keyed by normalized first prompt (LRU), in front of
+# the "title" namespace of the shared cache that other workers also fill
+_title_cache: "OrderedDict[str, str]" = OrderedDict()
+
+
+def _title_cache_key(user_query: str) -> str:
+    return " ".join(user_query.lower().split())
+
+
+def _remember_title(cache_key: str, title: str):
+    _title_cache[cache_key] = title
+    while len(_title_cache) > TITLE_CACHE_SIZE:
+        _title_cache.popitem(last=False)
+
+
+def clear_title_cache():
+    """Forget cached titles (mainly for tests)."""
+    _title_cache.clear()
+    shared.get_state().cache_clear("title")
+
+
+def heuristic_title(user_query: str, max_words: int = 5) -> str:
+    """
+    Build a title locally from the first words of the message.
+
+    Used when the title model is slow or unavailable.
+    """
+    words = re.findall(r"[\w'-]+", user_query)[:max_words]
+    if not words:
+        return "New Conversation"
+    title = " ".join(words)
+    title = title[0].upper() + title[1:]
+    if len(title) > 50:
+        title = title[:47] + "..."
+    return title
+
+
+@tracing.traced("council.title")
+async def generate_conversation_title(
+    user_query: str,
+    title_model: Optional[str] = None,
+    deadline: Optional[float] = TITLE_TIMEOUT_SECONDS
+) -> str:
     """
     Generate a short title for a conversation based on the first user message.
 
+    Titles for identical first prompts are served from a small cache. If the
+    title model does not answer within ``deadline`` seconds (or fails), a
+    heuristic title is returned instead so the UI is never left waiting.
+
     Args:
         user_query: The first user message
+        title_model: Model to use (defaults to the configured title model)
+        deadline: Seconds to wait for the model before falling back
 
     Returns:
         A short title (3-5 words)
     """
+    cache_key = _title_cache_key(user_query)
+    cached = _title_cache.get(cache_key)
+    if cached is not None:
+        _title_cache.move_to_end(cache_key)
+        return cached
+    # Another worker may have titled the same prompt
+    cached = await shared.call(shared.get_state().cache_get, "title", cache_key)
+    if cached is not None:
+        _remember_title(cache_key, cached)
+        return cached
+
     title_prompt = f"""Generate a very short title (3-5 words maximum) that summarizes the following question.
 The title should be concise and descriptive. Do not use quotes or punctuation in the title.
 
@@ -286,31 +762,54 @@ Title:"""
 
     messages = [{"role": "user", "content": title_prompt}]
 
-    # Use gemini-2.5-flash for title generation (fast and cheap)
-    response = await query_model("google/gemini-2.5-flash", messages, timeout=30.0)
+    if title_model is None:
+        title_model = get_effective_settings().title_model
 
-    if response is None:
-        # Fallback to a generic title
-        return "New Conversation"
+    try:
+        response = await asyncio.wait_for(
+            query_model(title_model, messages, timeout=30.0),
+            timeout=deadline
+        )
+    except asyncio.TimeoutError:
+        response = None
 
-    title = response.get('content', 'New Conversation').strip()
+    title = ((response or {}).get('content') or '').strip()
 
-    # Clean up the title - remove quotes, limit length
+    # Clean up the title - remove quotes
     title = title.strip('"\'')
 
+    if not title:
+        return heuristic_title(user_query)
+
     # Truncate if too long
     if len(title) > 50:
         title = title[:47] + "..."
 
+    _remember_title(cache_key, title)
+    await shared.call(shared.get_state().cache_set, "title", cache_key, title, TITLE_CACHE_SIZE)
+
     return title
 
 
-async def run_full_council(user_query: str) -> Tuple[List, List, Dict, Dict]:
+async def run_full_council(
+    user_query: str,
+    review_size: Optional[int] = None,
+    structured_rankings: bool = False,
+    history: Optional[List[Dict[str, str]]] = None,
+    recorder: Optional[metrics.TurnRecorder] = None
+) -> Tuple[List, List, Dict, Dict]:
     """
     Run the complete 3-stage council process.
 
     Args:
         user_query: The user's question
+        review_size: Optional sparse review size for Stage 2 (see
+            stage2_collect_rankings)
+        structured_rankings: Request JSON rankings in Stage 2
+        history: Optional earlier-turn messages for Stages 1 and 3
+        recorder: Turn recorder already started by the caller (so calls
+            made alongside the council, like the title, are counted);
+            a new one is started if None
 
     Returns:
         Tuple of (stage1_results, stage2_results, stage3_result, metadata)
@@ -318,9 +817,12 @@ async def run_full_council(user_query: str) -> Tuple[List, List, Dict, Dict]:
     effective_settings = get_effective_settings()
     council_models = effective_settings.council_models or COUNCIL_MODELS
     chairman_model = effective_settings.chairman_model or CHAIRMAN_MODEL
+    if recorder is None:
+        recorder = metrics.start_turn()
 
     # Stage 1: Collect individual responses
-    stage1_results = await stage1_collect_responses(user_query, council_models)
+    with metrics.stage("stage1"):
+        stage1_results = await stage1_collect_responses(user_query, council_models, history=history)
 
     # If no models responded successfully, return error
     if not stage1_results:
@@ -330,23 +832,33 @@ async def run_full_council(user_query: str) -> Tuple[List, List, Dict, Dict]:
         }, {}
 
     # Stage 2: Collect rankings
-    stage2_results, label_to_model = await stage2_collect_rankings(user_query, stage1_results, council_models)
+    with metrics.stage("stage2"):
+        stage2_results, label_to_model = await stage2_collect_rankings(
+            user_query,
+            stage1_results,
+            council_models,
+            review_size=review_size,
+            structured=structured_rankings
+        )
 
     # Calculate aggregate rankings
     aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
 
     # Stage 3: Synthesize final answer
-    stage3_result = await stage3_synthesize_final(
-        user_query,
-        stage1_results,
-        stage2_results,
-        chairman_model
-    )
+    with metrics.stage("stage3"):
+        stage3_result = await stage3_synthesize_final(
+            user_query,
+            stage1_results,
+            stage2_results,
+            chairman_model,
+            history=history
+        )
 
     # Prepare metadata
     metadata = {
         "label_to_model": label_to_model,
-        "aggregate_rankings": aggregate_rankings
+        "aggregate_rankings": aggregate_rankings,
+        "metrics": recorder.summary()
     }
 
     return stage1_results, stage2_results, stage3_result, metadata
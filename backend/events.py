@@ -0,0 +1,166 @@
+"""Encoding of Server-Sent Events for the streaming endpoint.
+
+Events are serialized with ``orjson`` when it is installed (falling back to
+the standard library), optionally in a compact form with short keys, and
+optionally compressed as one continuous gzip or brotli stream that is
+flushed after every event so the client still sees each event immediately.
+
+Clients opt into the compact form with an ``Accept`` parameter, e.g.
+``Accept: text/event-stream; encoding=compact``. Compression follows the
+usual ``Accept-Encoding`` negotiation.
+"""
+
+import json
+import zlib
+from typing import Any, Dict, Iterable, Optional
+
+try:  # Optional fast serializer
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+try:  # Optional brotli support
+    import brotli
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+# Long key -> short key used by the compact encoding. Applied to the event
+# envelope and to the entries of its data payload (stage results).
+COMPACT_KEYS = {
+    "type": "t",
+    "data": "d",
+    "metadata": "m",
+    "message": "e",
+    "model": "o",
+    "response": "r",
+    "ranking": "k",
+    "parsed_ranking": "p",
+    "reviewed_labels": "v",
+    "parse_mode": "pm",
+    "scores": "s",
+    "title": "ti",
+}
+EXPANDED_KEYS = {short: long for long, short in COMPACT_KEYS.items()}
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serialize to JSON text without whitespace, using orjson when available.
+
+    The standard library fallback produces the same text as orjson.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def _rename(item: Any, keys: Dict[str, str]) -> Any:
+    if isinstance(item, dict):
+        return {keys.get(k, k): v for k, v in item.items()}
+    return item
+
+
+def _convert(event: Dict[str, Any], keys: Dict[str, str]) -> Dict[str, Any]:
+    converted = _rename(event, keys)
+    data_key = keys.get("data", "data")
+    data = converted.get(data_key)
+    if isinstance(data, list):
+        converted[data_key] = [_rename(item, keys) for item in data]
+    elif isinstance(data, dict):
+        converted[data_key] = _rename(data, keys)
+    return converted
+
+
+def compact_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Shorten the keys of an event and its stage entries."""
+    return _convert(event, COMPACT_KEYS)
+
+
+def expand_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of :func:`compact_event`."""
+    return _convert(event, EXPANDED_KEYS)
+
+
+def format_event(event: Dict[str, Any], compact: bool = False) -> str:
+    """Render one event as an SSE ``data:`` frame."""
+    if compact:
+        event = compact_event(event)
+    return f"data: {dumps(event)}\n\n"
+
+
+def wants_compact(accept: Optional[str]) -> bool:
+    """True if the Accept header asks for ``text/event-stream; encoding=compact``."""
+    for media_range in (accept or "").split(","):
+        media_type, *params = [part.strip() for part in media_range.split(";")]
+        if media_type not in ("text/event-stream", "*/*"):
+            continue
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "encoding" and value.strip().strip('"').lower() == "compact":
+                return True
+    return False
+
+
+def choose_content_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick ``br`` or ``gzip`` from an Accept-Encoding header (None = identity)."""
+    offered = {}
+    for coding in (accept_encoding or "").split(","):
+        name, *params = [part.strip() for part in coding.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if name:
+            offered[name.lower()] = quality
+    if brotli is not None and offered.get("br", 0) > 0:
+        return "br"
+    if offered.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+class StreamCompressor:
+    """Compress a stream of frames, flushing after each so nothing is held back."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor()
+        elif encoding == "gzip":
+            self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        else:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+async def compress_stream(frames, encoding: str):
+    """Wrap an async iterator of text frames in a compressed byte stream."""
+    compressor = StreamCompressor(encoding)
+    async for frame in frames:
+        if isinstance(frame, str):
+            frame = frame.encode("utf-8")
+        yield compressor.compress(frame)
+    yield compressor.finish()
+
+
+def decode_frames(frames: Iterable[str]) -> list:
+    """Parse ``data:`` frames back into events, expanding compact keys (used by tests/benchmarks)."""
+    events = []
+    for frame in frames:
+        for line in frame.splitlines():
+            if line.startswith("data:"):
+                payload = json.loads(line[len("data:"):].strip())
+                events.append(expand_event(payload) if "t" in payload else payload)
+    return events
@@ -0,0 +1,164 @@
+"""Bounded conversation history for multi-turn council prompts.
+
+Earlier turns are condensed to (user question, Stage 3 answer) pairs and
+windowed by one of a few strategies so each new turn costs roughly the same
+regardless of how long the conversation has grown:
+
+- ``none``: no history (single-turn behaviour)
+- ``last_n``: the last N turns verbatim
+- ``token_budget``: as many recent turns as fit in an estimated token budget
+- ``summary``: a rolling chairman-written summary cached on the conversation,
+  plus any turns it does not cover yet
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from .openrouter import query_model
+from .settings import HISTORY_STRATEGIES
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def conversation_turns(messages: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """
+    Pair each user message with the following assistant's final answer.
+
+    Args:
+        messages: Stored conversation messages
+
+    Returns:
+        List of (user content, Stage 3 response) tuples, oldest first
+    """
+    turns = []
+    pending_user = None
+    for message in messages:
+        if message.get("role") == "user":
+            pending_user = message.get("content", "")
+        elif message.get("role") == "assistant" and pending_user is not None:
+            if (message.get("metadata") or {}).get("cancelled") and not message.get("stage3"):
+                # Abandoned before Stage 3: no answer to carry forward
+                pending_user = None
+                continue
+            stage3 = message.get("stage3") or {}
+            turns.append((pending_user, stage3.get("response", "")))
+            pending_user = None
+    return turns
+
+
+def _turn_messages(turns: List[Tuple[str, str]]) -> List[Dict[str, str]]:
+    messages = []
+    for question, answer in turns:
+        messages.append({"role": "user", "content": question})
+        messages.append({"role": "assistant", "content": answer})
+    return messages
+
+
+def build_history_messages(
+    conversation: Dict[str, Any],
+    strategy: str = "none",
+    max_turns: int = 3,
+    token_budget: int = 2000
+) -> List[Dict[str, str]]:
+    """
+    Build the history messages to prepend to a new turn's prompt.
+
+    Args:
+        conversation: Stored conversation dict (before the new user message)
+        strategy: One of HISTORY_STRATEGIES
+        max_turns: Turn window for 'last_n' (and the uncovered tail for 'summary')
+        token_budget: Estimated token budget for 'token_budget'
+
+    Returns:
+        List of chat messages (possibly empty)
+    """
+    if strategy not in HISTORY_STRATEGIES:
+        raise ValueError(f"Unknown history strategy: {strategy}")
+    if strategy == "none":
+        return []
+
+    turns = conversation_turns(conversation.get("messages", []))
+
+    if strategy == "last_n":
+        return _turn_messages(turns[-max_turns:] if max_turns > 0 else [])
+
+    if strategy == "token_budget":
+        selected = []
+        used = 0
+        for question, answer in reversed(turns):
+            cost = estimate_tokens(question) + estimate_tokens(answer)
+            if used + cost > token_budget:
+                break
+            selected.append((question, answer))
+            used += cost
+        return _turn_messages(list(reversed(selected)))
+
+    # Rolling summary: summary of covered turns + verbatim uncovered tail
+    summary = conversation.get("context_summary") or {}
+    covered = int(summary.get("turns", 0))
+    tail = turns[covered:]
+    if max_turns > 0:
+        tail = tail[-max_turns:]
+    else:
+        tail = []
+
+    messages = []
+    if summary.get("text"):
+        messages.append({
+            "role": "system",
+            "content": f"Summary of the conversation so far:\n{summary['text']}"
+        })
+    return messages + _turn_messages(tail)
+
+
+async def update_rolling_summary(
+    conversation: Dict[str, Any],
+    model: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Fold turns not yet covered by the cached summary into a new summary.
+
+    Only the previous summary and the new turns are sent, so the cost of an
+    update does not grow with the length of the conversation.
+
+    Args:
+        conversation: Stored conversation dict
+        model: Model used to write the summary (normally the chairman)
+
+    Returns:
+        New summary dict with 'text' and 'turns', or None if nothing changed
+        or the model failed
+    """
+    summary = conversation.get("context_summary") or {}
+    covered = int(summary.get("turns", 0))
+    turns = conversation_turns(conversation.get("messages", []))
+    new_turns = turns[covered:]
+    if not new_turns:
+        return None
+
+    exchanges = "\n\n".join(
+        f"User: {question}\nCouncil answer: {answer}"
+        for question, answer in new_turns
+    )
+    previous = summary.get("text") or "(empty)"
+
+    summary_prompt = f"""You maintain a running summary of a conversation between a user and an LLM council.
+
+Current summary:
+{previous}
+
+New exchanges:
+{exchanges}
+
+Rewrite the summary so it also covers the new exchanges. Keep the facts, decisions and open questions a follow-up answer would need. Use at most 200 words and reply with the summary only."""
+
+    response = await query_model(model, [{"role": "user", "content": summary_prompt}], timeout=60.0)
+    if response is None or not response.get("content"):
+        return None
+
+    return {
+        "text": response["content"].strip(),
+        "turns": len(turns)
+    }
@@ -0,0 +1,207 @@
+"""Load generator for the council streaming endpoint.
+
+Simulates N concurrent users, each creating a conversation and sending a
+number of turns through ``POST /api/conversations/{id}/message/stream``, then
+reports per-stage latency percentiles, throughput and error rates. Pair it
+with ``backend.mock_openrouter`` to load-test without spending API credits.
+
+Usage:
+    python -m backend.loadtest --url http://localhost:8001 --users 20 --turns 3
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+# Stage durations derived from SSE event arrival times
+STAGE_BOUNDARIES = {
+    "stage1": ("start", "stage1_complete"),
+    "stage2": ("stage1_complete", "stage2_complete"),
+    "stage3": ("stage2_complete", "stage3_complete"),
+    "total": ("start", "complete"),
+}
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Linear-interpolated percentile (pct in 0..100) of a list of values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+async def run_turn(client: httpx.AsyncClient, base_url: str, conversation_id: str, content: str) -> Dict[str, Any]:
+    """
+    Send one streamed turn and record when each event arrived.
+
+    Returns:
+        Dict with 'marks' (event type -> seconds since start) and 'error'
+    """
+    start = time.perf_counter()
+    marks = {"start": 0.0}
+    error = None
+    try:
+        async with client.stream(
+            "POST",
+            f"{base_url}/api/conversations/{conversation_id}/message/stream",
+            json={"content": content},
+        ) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                event = json.loads(line[len("data:"):])
+                event_type = event.get("type")
+                marks.setdefault(event_type, time.perf_counter() - start)
+                if event_type == "error":
+                    error = event.get("message") or "error event"
+    except Exception as e:
+        error = str(e) or type(e).__name__
+
+    if error is None and "complete" not in marks:
+        error = "stream ended before complete"
+    return {"marks": marks, "error": error}
+
+
+async def simulate_user(
+    client: httpx.AsyncClient,
+    base_url: str,
+    user_index: int,
+    turns: int,
+    samples: List[Dict[str, Any]]
+):
+    """Create a conversation and send `turns` prompts back to back."""
+    try:
+        resp = await client.post(f"{base_url}/api/conversations", json={})
+        resp.raise_for_status()
+        conversation_id = resp.json()["id"]
+    except Exception as e:
+        samples.extend({"marks": {}, "error": f"create failed: {e}"} for _ in range(turns))
+        return
+
+    for turn in range(turns):
+        samples.append(await run_turn(
+            client, base_url, conversation_id, f"Load test user {user_index}, question {turn + 1}"
+        ))
+
+
+def summarize(samples: List[Dict[str, Any]], wall_time: float) -> Dict[str, Any]:
+    """
+    Aggregate turn samples into a report.
+
+    Returns:
+        Dict with request/error counts, throughput and per-stage p50/p95/p99
+        (seconds) over successful turns
+    """
+    ok = [s for s in samples if s["error"] is None]
+    stages = {}
+    for stage, (begin, end) in STAGE_BOUNDARIES.items():
+        durations = [
+            s["marks"][end] - s["marks"][begin]
+            for s in ok
+            if begin in s["marks"] and end in s["marks"]
+        ]
+        stages[stage] = {
+            "count": len(durations),
+            "p50": percentile(durations, 50),
+            "p95": percentile(durations, 95),
+            "p99": percentile(durations, 99),
+        }
+
+    errors: Dict[str, int] = {}
+    for s in samples:
+        if s["error"] is not None:
+            errors[s["error"]] = errors.get(s["error"], 0) + 1
+
+    return {
+        "requests": len(samples),
+        "succeeded": len(ok),
+        "failed": len(samples) - len(ok),
+        "error_rate": round((len(samples) - len(ok)) / len(samples), 4) if samples else 0.0,
+        "throughput_rps": round(len(ok) / wall_time, 3) if wall_time > 0 else 0.0,
+        "wall_time": round(wall_time, 3),
+        "stages": stages,
+        "errors": errors,
+    }
+
+
+async def run_load(
+    base_url: str,
+    users: int = 10,
+    turns: int = 1,
+    client: Optional[httpx.AsyncClient] = None,
+    timeout: float = 600.0
+) -> Dict[str, Any]:
+    """
+    Drive the streaming endpoint with concurrent simulated users.
+
+    Args:
+        base_url: Backend base URL (e.g., http://localhost:8001)
+        users: Number of concurrent users
+        turns: Turns each user sends sequentially
+        client: Optional client to reuse (mainly for tests)
+        timeout: Per-request read timeout in seconds
+
+    Returns:
+        Report dict from summarize()
+    """
+    base_url = base_url.rstrip("/")
+    samples: List[Dict[str, Any]] = []
+    owns_client = client is None
+    if client is None:
+        limits = httpx.Limits(max_connections=users + 4, max_keepalive_connections=users + 4)
+        client = httpx.AsyncClient(timeout=httpx.Timeout(timeout, connect=10.0), limits=limits)
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*[
+            simulate_user(client, base_url, i, turns, samples) for i in range(users)
+        ])
+    finally:
+        if owns_client:
+            await client.aclose()
+
+    return summarize(samples, time.perf_counter() - start)
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render a report as a small text table."""
+    def fmt(value):
+        return "-" if value is None else f"{value:.3f}s"
+
+    lines = [
+        f"requests={report['requests']} ok={report['succeeded']} failed={report['failed']} "
+        f"error_rate={report['error_rate']:.2%} throughput={report['throughput_rps']} turns/s "
+        f"wall={report['wall_time']}s",
+        f"{'stage':<8}{'n':>6}{'p50':>10}{'p95':>10}{'p99':>10}",
+    ]
+    for stage, row in report["stages"].items():
+        lines.append(f"{stage:<8}{row['count']:>6}{fmt(row['p50']):>10}{fmt(row['p95']):>10}{fmt(row['p99']):>10}")
+    for message, count in report["errors"].items():
+        lines.append(f"error x{count}: {message}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Load-test the council streaming endpoint.")
+    parser.add_argument("--url", default="http://localhost:8001", help="backend base URL")
+    parser.add_argument("--users", type=int, default=10, help="concurrent users")
+    parser.add_argument("--turns", type=int, default=1, help="turns per user")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_load(args.url, users=args.users, turns=args.turns))
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
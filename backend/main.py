@@ -1,19 +1,81 @@
 """FastAPI backend for LLM Council."""
 
-from fastapi import FastAPI, HTTPException
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Literal, Optional
+import argparse
+import hashlib
+import importlib
+import os
 import uuid
-import json
 import asyncio
 
 from . import storage
 from . import settings
-from .council import run_full_council, generate_conversation_title, stage1_collect_responses, stage2_collect_rankings, stage3_synthesize_final, calculate_aggregate_rankings
+from . import metrics
+from . import tracing
+from . import openrouter
+from . import config
+from .config import SSE_COMPRESSION
+from .council import run_full_council, generate_conversation_title, iter_stage1_responses, iter_stage2_rankings, anonymize_responses, stage3_synthesize_final, calculate_aggregate_rankings, get_ranking_parse_stats
 
-app = FastAPI(title="LLM Council API")
+# history, batch, events and shared are imported by the handlers that use them
+
+
+async def warm_up():
+    """
+    Initialise what the first council turn needs but ``/`` does not: parsed
+    settings, the HTTP stack and pooled upstream client, the data directory
+    and (for zstd storage) the current dictionary. Runs in the background at
+    startup; ``GET /ready`` reports its progress.
+    """
+    await asyncio.to_thread(settings.get_effective_settings)
+    await asyncio.to_thread(importlib.import_module, "httpx")
+    openrouter.get_shared_client()
+    await asyncio.to_thread(storage.ensure_data_dir)
+    if storage.storage_format() == "zstd":
+        await asyncio.to_thread(storage.current_zstd_dict)
+
+
+def readiness(task: Optional[asyncio.Task]) -> Dict[str, Any]:
+    """Readiness of the lazily initialised components."""
+    if task is None:
+        warm_up_state = "not_started"
+    elif not task.done():
+        warm_up_state = "running"
+    elif task.cancelled() or task.exception() is not None:
+        warm_up_state = "failed"
+    else:
+        warm_up_state = "done"
+    components = {
+        "settings": settings.settings_cached(),
+        "upstream_client": openrouter.shared_client_ready(),
+        "storage": os.path.isdir(storage.DATA_DIR),
+    }
+    return {
+        "ready": warm_up_state == "done" and all(components.values()),
+        "warm_up": warm_up_state,
+        "components": components,
+    }
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.warm_up = asyncio.create_task(warm_up())
+    yield
+    if not app.state.warm_up.done():
+        app.state.warm_up.cancel()
+    # Release pooled upstream connections on shutdown
+    await openrouter.close_shared_client()
+    from . import shared
+    shared.get_state().close()
+
+
+app = FastAPI(title="LLM Council API", lifespan=lifespan)
 
 # Enable CORS for local development
 app.add_middleware(
@@ -24,15 +86,64 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _configure_shared_state():
+    """In-process state for one worker, SQLite-backed with --workers > 1."""
+    from . import shared
+    shared.configure_from_env()
+
+
+_configure_shared_state()
+
+# Root span per request (outermost middleware); exporter chosen via config
+tracing.configure_from_env()
+app.add_middleware(tracing.TracingMiddleware)
+
 
 class CreateConversationRequest(BaseModel):
     """Request to create a new conversation."""
     pass
 
 
+HistoryStrategy = Literal["none", "last_n", "token_budget", "summary"]
+
+
 class SendMessageRequest(BaseModel):
     """Request to send a message in a conversation."""
     content: str
+    # Sparse Stage 2: each reviewer ranks only this many responses
+    review_size: Optional[int] = Field(default=None, ge=2)
+    # Ask Stage 2 reviewers for JSON rankings instead of prose
+    structured_rankings: bool = False
+    # Override the saved history strategy for this turn
+    history_strategy: Optional[HistoryStrategy] = None
+
+
+class CancelRunRequest(BaseModel):
+    """Options for cancelling a streamed turn."""
+    # Store the stages that finished before the cancel (False drops them)
+    keep_partial: bool = True
+
+
+class BatchRequest(BaseModel):
+    """Request to run the council over a JSONL file of prompts."""
+    # Relative to config.BATCH_DIR; paths outside it are rejected
+    input_path: str
+    output_path: str
+    concurrency: int = Field(default=4, ge=1)
+    rate_limit: Optional[float] = Field(default=None, gt=0)
+    resume: bool = True
+    review_size: Optional[int] = Field(default=None, ge=2)
+    structured_rankings: bool = False
+
+
+class BatchStatus(BaseModel):
+    """Progress of a batch run."""
+    id: str
+    status: str
+    input_path: str
+    output_path: str
+    counts: Dict[str, int]
+    error: Optional[str] = None
 
 
 class ConversationMetadata(BaseModel):
@@ -57,6 +168,10 @@ class SettingsResponse(BaseModel):
     openrouter_api_url: str
     council_models: List[str]
     chairman_model: str
+    title_model: str
+    history_strategy: HistoryStrategy
+    history_max_turns: int
+    history_token_budget: int
 
 
 class UpdateSettingsRequest(BaseModel):
@@ -65,6 +180,10 @@ class UpdateSettingsRequest(BaseModel):
     openrouter_api_url: Optional[str] = None
     council_models: Optional[List[str]] = None
     chairman_model: Optional[str] = None
+    title_model: Optional[str] = None
+    history_strategy: Optional[HistoryStrategy] = None
+    history_max_turns: Optional[int] = Field(default=None, ge=0)
+    history_token_budget: Optional[int] = Field(default=None, ge=0)
 
 
 class TestSettingsRequest(BaseModel):
@@ -73,12 +192,55 @@ class TestSettingsRequest(BaseModel):
     openrouter_api_url: Optional[str] = None
 
 
+def _history_for_turn(conversation: Dict[str, Any], request: SendMessageRequest, effective_settings) -> tuple:
+    """Resolve the history strategy for a turn and build its history messages."""
+    from . import history
+    strategy = request.history_strategy or effective_settings.history_strategy
+    messages = history.build_history_messages(
+        conversation,
+        strategy,
+        max_turns=effective_settings.history_max_turns,
+        token_budget=effective_settings.history_token_budget,
+    )
+    return strategy, messages
+
+
+async def _refresh_history_summary(conversation_id: str, model: str):
+    """Fold the latest turn into the conversation's cached rolling summary."""
+    from . import history
+    conversation = storage.get_conversation(conversation_id)
+    if conversation is None:
+        return
+    summary = await history.update_rolling_summary(conversation, model)
+    if summary is not None:
+        storage.update_conversation_summary(conversation_id, summary)
+
+
+async def _timed_title(content: str) -> str:
+    """Generate a title, attributing its upstream call to the 'title' stage."""
+    with metrics.stage("title"):
+        return await generate_conversation_title(content)
+
+
 @app.get("/")
 async def root():
     """Health check endpoint."""
     return {"status": "ok", "service": "LLM Council API"}
 
 
+@app.get("/ready")
+async def ready(request: Request):
+    """Readiness probe: 200 once the startup warm-up has finished, 503 before."""
+    report = readiness(getattr(request.app.state, "warm_up", None))
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint for stage and upstream call metrics."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/api/settings", response_model=SettingsResponse)
 async def get_settings():
     """Return saved settings with API key redacted."""
@@ -102,9 +264,82 @@ async def test_settings(request: TestSettingsRequest):
     return {"ok": True, "model_count": result.get("model_count", 0)}
 
 
+@app.get("/api/stats/rankings")
+async def ranking_parse_stats():
+    """Per-model Stage 2 ranking parse counts and success rates."""
+    return get_ranking_parse_stats()
+
+
+@app.post("/api/batch", response_model=BatchStatus)
+async def start_batch(request: BatchRequest):
+    """
+    Start a batch council run in the background.
+    Results stream to the output JSONL file; no conversations are stored.
+    Both files live in the batch directory (config.BATCH_DIR).
+
+    ``rate_limit`` applies to the worker process that accepts the request;
+    it is not shared with batches running in other workers.
+    """
+    from . import batch
+    try:
+        input_path = batch.resolve_batch_path(request.input_path)
+        output_path = batch.resolve_batch_path(request.output_path)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not os.path.exists(input_path):
+        raise HTTPException(status_code=400, detail="Batch input file not found")
+
+    effective_settings = settings.get_effective_settings()
+    if not effective_settings.openrouter_api_key:
+        raise HTTPException(status_code=400, detail="OpenRouter API key is not configured. Add it in Settings.")
+
+    return await batch.start_batch_job(
+        input_path,
+        output_path,
+        concurrency=request.concurrency,
+        rate_limit=request.rate_limit,
+        resume=request.resume,
+        review_size=request.review_size,
+        structured_rankings=request.structured_rankings,
+    )
+
+
+@app.get("/api/batch/{batch_id}", response_model=BatchStatus)
+async def get_batch(batch_id: str):
+    """Get progress for a batch run."""
+    from . import batch, shared
+    job = await shared.call(batch.get_batch_job, batch_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return job
+
+
+def _etag(*parts: Any) -> str:
+    """Strong ETag for a representation built from a storage version and request variants."""
+    return '"%s"' % hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:32]
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match lists ``etag`` (or ``*``)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
 @app.get("/api/conversations", response_model=List[ConversationMetadata])
-async def list_conversations():
-    """List all conversations (metadata only)."""
+async def list_conversations(request: Request, response: Response):
+    """List all conversations (metadata only). Supports conditional GET via ETag."""
+    etag = _etag("list", storage.list_version())
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
     return storage.list_conversations()
 
 
@@ -116,17 +351,95 @@ async def create_conversation(request: CreateConversationRequest):
     return conversation
 
 
+def _expanded_indexes(messages: List[Dict[str, Any]], expand: Optional[str]) -> set:
+    """Resolve an ``expand`` value ("last", "all" or comma-separated indexes)."""
+    assistant_indexes = [i for i, m in enumerate(messages) if m.get("role") == "assistant"]
+    indexes = set()
+    for part in (expand or "").split(","):
+        part = part.strip()
+        if part == "all":
+            indexes.update(assistant_indexes)
+        elif part == "last":
+            indexes.update(assistant_indexes[-1:])
+        elif part:
+            try:
+                indexes.add(int(part))
+            except ValueError:
+                raise HTTPException(status_code=422, detail=f"Invalid expand value: {part}")
+    return indexes
+
+
+def _summarize_conversation(conversation: Dict[str, Any], expand: Optional[str]) -> Dict[str, Any]:
+    """Drop Stage 1/2 payloads from assistant messages except the expanded ones."""
+    expanded = _expanded_indexes(conversation["messages"], expand)
+    messages = []
+    for index, message in enumerate(conversation["messages"]):
+        if message.get("role") == "assistant" and index not in expanded:
+            message = {
+                "role": "assistant",
+                "stage3": message.get("stage3"),
+                "metadata": message.get("metadata"),
+                "stages_omitted": True,
+            }
+        messages.append(message)
+    return {**conversation, "messages": messages}
+
+
 @app.get("/api/conversations/{conversation_id}", response_model=Conversation)
-async def get_conversation(conversation_id: str):
-    """Get a specific conversation with all its messages."""
+async def get_conversation(
+    conversation_id: str,
+    request: Request,
+    response: Response,
+    fields: Literal["full", "summary"] = "full",
+    expand: Optional[str] = Query(default=None, description='"last", "all" or comma-separated message indexes')
+):
+    """
+    Get a specific conversation with all its messages.
+
+    With ``fields=summary`` assistant messages carry only Stage 3 and metadata
+    (marked ``stages_omitted``), except those listed in ``expand``; fetch the
+    rest on demand from ``/messages/{index}/stages``.
+
+    Responses carry an ETag; ``If-None-Match`` with a current tag gets 304.
+    """
+    version = storage.conversation_version(conversation_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    etag = _etag("conversation", version, fields, expand or "")
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+
     conversation = storage.get_conversation(conversation_id)
     if conversation is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if fields == "summary":
+        return _summarize_conversation(conversation, expand)
     return conversation
 
 
+@app.get("/api/conversations/{conversation_id}/messages/{index}/stages")
+async def get_message_stages(conversation_id: str, index: int):
+    """Get the full stage payloads of one assistant message."""
+    conversation = storage.get_conversation(conversation_id)
+    if conversation is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    messages = conversation["messages"]
+    if not 0 <= index < len(messages) or messages[index].get("role") != "assistant":
+        raise HTTPException(status_code=404, detail="Assistant message not found")
+    message = messages[index]
+    return {
+        "index": index,
+        "stage1": message.get("stage1", []),
+        "stage2": message.get("stage2", []),
+        "stage3": message.get("stage3"),
+        "metadata": message.get("metadata"),
+    }
+
+
 @app.post("/api/conversations/{conversation_id}/message")
-async def send_message(conversation_id: str, request: SendMessageRequest):
+async def send_message(conversation_id: str, request: SendMessageRequest, background_tasks: BackgroundTasks):
     """
     Send a message and run the 3-stage council process.
     Returns the complete response with all stages.
@@ -142,19 +455,40 @@ async def send_message(conversation_id: str, request: SendMessageRequest):
 
     # Check if this is the first message
     is_first_message = len(conversation["messages"]) == 0
+    history_strategy, history_messages = _history_for_turn(conversation, request, effective_settings)
 
     # Add user message
     storage.add_user_message(conversation_id, request.content)
 
-    # If this is the first message, generate a title
-    if is_first_message:
-        title = await generate_conversation_title(request.content)
-        storage.update_conversation_title(conversation_id, title)
+    # Started before the title task, which copies the context, so the
+    # title call is recorded with the turn
+    recorder = metrics.start_turn()
 
-    # Run the 3-stage council process
-    stage1_results, stage2_results, stage3_result, metadata = await run_full_council(
-        request.content
-    )
+    # If this is the first message, generate a title alongside the council run
+    title_task = None
+    if is_first_message:
+        title_task = asyncio.create_task(_timed_title(request.content))
+
+    try:
+        # Run the 3-stage council process
+        stage1_results, stage2_results, stage3_result, metadata = await run_full_council(
+            request.content,
+            review_size=request.review_size,
+            structured_rankings=request.structured_rankings,
+            history=history_messages,
+            recorder=recorder
+        )
+
+        if title_task:
+            title = await title_task
+            storage.update_conversation_title(conversation_id, title)
+            if "metrics" in metadata:
+                metadata["metrics"] = recorder.summary()
+    finally:
+        # The council failed (or the request was cancelled): don't leak the title call
+        if title_task is not None and not title_task.done():
+            title_task.cancel()
+            await asyncio.gather(title_task, return_exceptions=True)
 
     # Add assistant message with all stages
     storage.add_assistant_message(
@@ -165,6 +499,12 @@ async def send_message(conversation_id: str, request: SendMessageRequest):
         metadata
     )
 
+    # Keep the rolling summary current without delaying the response
+    if history_strategy == "summary":
+        background_tasks.add_task(
+            _refresh_history_summary, conversation_id, effective_settings.chairman_model
+        )
+
     # Return the complete response with metadata
     return {
         "stage1": stage1_results,
@@ -174,12 +514,193 @@ async def send_message(conversation_id: str, request: SendMessageRequest):
     }
 
 
+# How often a streaming turn checks whether its client is still connected
+DISCONNECT_POLL_SECONDS = 0.25
+
+# Streamed turns running in this worker, by run id. Cancel requests go through
+# the run's shared event buffer, so a run can be cancelled from any worker.
+_runs: Dict[str, asyncio.Task] = {}
+
+
+def _cancel_request(run_id: str) -> Optional[Dict[str, Any]]:
+    """The ``cancel_requested`` entry of a run's event buffer, if any."""
+    from . import shared
+    for _, event in shared.get_state().read_events(run_id, after=1):
+        if event.get("type") == "cancel_requested":
+            return event
+    return None
+
+
+def _finish_run(run_id: str) -> None:
+    from . import shared
+    _runs.pop(run_id, None)
+    state = shared.get_state()
+    if state.cross_process:
+        asyncio.get_running_loop().run_in_executor(None, state.drop_events, run_id)
+    else:
+        state.drop_events(run_id)
+
+
+class ClientDisconnected(Exception):
+    """The client of a streaming response went away."""
+
+
+async def _unless_disconnected(http_request: Request, awaitable, on_poll=None):
+    """
+    Await ``awaitable``, giving up as soon as the client disconnects.
+
+    Raises ``ClientDisconnected`` in that case. Either way (and when the
+    caller itself is cancelled) the awaitable is cancelled if still pending.
+    ``on_poll`` (a coroutine function) is awaited at every disconnect check.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                raise ClientDisconnected()
+            if on_poll is not None:
+                await on_poll()
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+async def _run_streamed_turn(
+    run_id: str,
+    conversation_id: str,
+    request: SendMessageRequest,
+    is_first_message: bool,
+    history_messages: List[Dict[str, str]],
+    emit
+):
+    """
+    Run one streamed council turn, passing each event to ``emit``.
+
+    Stages 1 and 2 send a ``stage1_model_complete``/``stage2_model_complete``
+    event per council member as its reply arrives (in completion order,
+    which is also the order of the stage's results), then the usual
+    ``stage1_complete``/``stage2_complete`` with the whole list.
+
+    Cancelling the task cancels the in-flight upstream calls (and the title
+    call); the partial turn is then stored with a ``cancelled`` record in
+    its metadata and a ``cancelled`` event is emitted. A Stage 3 answer
+    that was already synthesized (cancel during the title wait) is kept. The reason is
+    ``user_cancelled`` if the run's buffer holds a cancel request (which
+    may also drop the partial stages), else ``client_disconnected``.
+    """
+    recorder = None
+    title_task = None
+    stage = "stage1"
+    stage1_results: List[Dict[str, Any]] = []
+    stage2_results: List[Dict[str, Any]] = []
+    stage2_metadata: Dict[str, Any] = {}
+    stage3_result: Optional[Dict[str, Any]] = None
+    try:
+        # Add user message
+        storage.add_user_message(conversation_id, request.content)
+
+        recorder = metrics.start_turn()
+
+        # Start title generation in parallel (don't await yet)
+        if is_first_message:
+            title_task = asyncio.create_task(_timed_title(request.content))
+
+        # Stage 1: Collect responses, sending each one as it arrives
+        emit({'type': 'stage1_start'})
+        with metrics.stage("stage1"):
+            async for result in iter_stage1_responses(request.content, history=history_messages):
+                stage1_results.append(result)
+                emit({'type': 'stage1_model_complete', 'data': result})
+        emit({'type': 'stage1_complete', 'data': stage1_results})
+
+        # Stage 2: Collect rankings, likewise per reviewer
+        stage = "stage2"
+        emit({'type': 'stage2_start'})
+        label_to_model, _ = anonymize_responses(stage1_results)
+        # Kept with partial rankings if the turn is cancelled mid-stage
+        stage2_metadata = {'label_to_model': label_to_model}
+        with metrics.stage("stage2"):
+            async for result in iter_stage2_rankings(
+                request.content,
+                stage1_results,
+                review_size=request.review_size,
+                structured=request.structured_rankings
+            ):
+                stage2_results.append(result)
+                emit({'type': 'stage2_model_complete', 'data': result})
+        aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
+        stage2_metadata = {'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings}
+        emit({'type': 'stage2_complete', 'data': stage2_results, 'metadata': stage2_metadata})
+
+        # Stage 3: Synthesize final answer
+        stage = "stage3"
+        emit({'type': 'stage3_start'})
+        with metrics.stage("stage3"):
+            stage3_result = await stage3_synthesize_final(
+                request.content, stage1_results, stage2_results, history=history_messages
+            )
+        emit({'type': 'stage3_complete', 'data': stage3_result})
+
+        # Wait for title generation if it was started
+        if title_task:
+            stage = "title"
+            title = await title_task
+            storage.update_conversation_title(conversation_id, title)
+            emit({'type': 'title_complete', 'data': {'title': title}})
+
+        # Save complete assistant message
+        storage.add_assistant_message(
+            conversation_id,
+            stage1_results,
+            stage2_results,
+            stage3_result,
+            {**stage2_metadata, "metrics": recorder.summary()}
+        )
+
+        # Send completion event
+        emit({'type': 'complete', 'metadata': {'metrics': recorder.summary()}})
+
+    except asyncio.CancelledError:
+        if title_task is not None and not title_task.done():
+            title_task.cancel()
+            await asyncio.gather(title_task, return_exceptions=True)
+        if recorder is not None:
+            from . import shared
+            cancel_request = await shared.call(_cancel_request, run_id)
+            reason = "user_cancelled" if cancel_request else "client_disconnected"
+            # Cancelled while waiting for the title, the answer is complete:
+            # keep it (and in history); only the title is lost
+            if stage3_result is None and cancel_request and not cancel_request.get("keep_partial", True):
+                stage1_results, stage2_results, stage2_metadata = [], [], {}
+            cancelled = metrics.record_cancelled_turn(recorder, stage, reason)
+            storage.add_assistant_message(
+                conversation_id,
+                stage1_results,
+                stage2_results,
+                stage3_result,
+                {**stage2_metadata, "metrics": recorder.summary(), "cancelled": cancelled}
+            )
+            emit({'type': 'cancelled', 'data': stage1_results, 'metadata': {'run_id': run_id, **cancelled}})
+        raise
+
+    except Exception as e:
+        # Send error event
+        emit({'type': 'error', 'message': str(e)})
+
+
 @app.post("/api/conversations/{conversation_id}/message/stream")
-async def send_message_stream(conversation_id: str, request: SendMessageRequest):
+async def send_message_stream(conversation_id: str, request: SendMessageRequest, http_request: Request):
     """
     Send a message and stream the 3-stage council process.
     Returns Server-Sent Events as each stage completes.
+
+    Clients may ask for compact events (``Accept: text/event-stream;
+    encoding=compact``) and a gzip/brotli compressed stream (Accept-Encoding).
     """
+    from . import events, shared
     # Check if conversation exists
     conversation = storage.get_conversation(conversation_id)
     if conversation is None:
@@ -191,68 +712,125 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
 
     # Check if this is the first message
     is_first_message = len(conversation["messages"]) == 0
+    history_strategy, history_messages = _history_for_turn(conversation, request, effective_settings)
 
-    async def event_generator():
-        try:
-            # Add user message
-            storage.add_user_message(conversation_id, request.content)
-
-            # Start title generation in parallel (don't await yet)
-            title_task = None
-            if is_first_message:
-                title_task = asyncio.create_task(generate_conversation_title(request.content))
-
-            # Stage 1: Collect responses
-            yield f"data: {json.dumps({'type': 'stage1_start'})}\n\n"
-            stage1_results = await stage1_collect_responses(request.content)
-            yield f"data: {json.dumps({'type': 'stage1_complete', 'data': stage1_results})}\n\n"
-
-            # Stage 2: Collect rankings
-            yield f"data: {json.dumps({'type': 'stage2_start'})}\n\n"
-            stage2_results, label_to_model = await stage2_collect_rankings(request.content, stage1_results)
-            aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
-            yield f"data: {json.dumps({'type': 'stage2_complete', 'data': stage2_results, 'metadata': {'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings}})}\n\n"
-
-            # Stage 3: Synthesize final answer
-            yield f"data: {json.dumps({'type': 'stage3_start'})}\n\n"
-            stage3_result = await stage3_synthesize_final(request.content, stage1_results, stage2_results)
-            yield f"data: {json.dumps({'type': 'stage3_complete', 'data': stage3_result})}\n\n"
-
-            # Wait for title generation if it was started
-            if title_task:
-                title = await title_task
-                storage.update_conversation_title(conversation_id, title)
-                yield f"data: {json.dumps({'type': 'title_complete', 'data': {'title': title}})}\n\n"
-
-            # Save complete assistant message
-            storage.add_assistant_message(
-                conversation_id,
-                stage1_results,
-                stage2_results,
-                stage3_result,
-                {
-                    "label_to_model": label_to_model,
-                    "aggregate_rankings": aggregate_rankings
-                }
-            )
+    compact = events.wants_compact(http_request.headers.get("accept"))
+    content_encoding = (
+        events.choose_content_encoding(http_request.headers.get("accept-encoding"))
+        if SSE_COMPRESSION else None
+    )
 
-            # Send completion event
-            yield f"data: {json.dumps({'type': 'complete'})}\n\n"
+    run_id = uuid.uuid4().hex
+    await shared.call(
+        shared.get_state().append_event, run_id, {"type": "run_started", "conversation_id": conversation_id}
+    )
 
-        except Exception as e:
-            # Send error event
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+    async def event_generator():
+        queue: asyncio.Queue = asyncio.Queue()
+        queue.put_nowait({'type': 'run_started', 'data': {'run_id': run_id}})
+        turn = asyncio.create_task(_run_streamed_turn(
+            run_id, conversation_id, request, is_first_message, history_messages, queue.put_nowait
+        ))
+        turn.add_done_callback(lambda _task: queue.put_nowait(None))
+        _runs[run_id] = turn
+        turn.add_done_callback(lambda _task: _finish_run(run_id))
+
+        async def check_cancel_request():
+            # Requests made to other workers only reach us through the buffer;
+            # with in-process state cancel_run always finds the task in _runs
+            if not turn.done() and await shared.call(_cancel_request, run_id) is not None:
+                turn.cancel()
+
+        on_poll = check_cancel_request if shared.get_state().cross_process else None
+        try:
+            while True:
+                event = await _unless_disconnected(http_request, queue.get(), on_poll)
+                if event is None:
+                    break
+                yield events.format_event(event, compact)
+        except ClientDisconnected:
+            pass
+        finally:
+            # Client gone (or the response cancelled): stop paying for upstream calls
+            if not turn.done():
+                turn.cancel()
+
+    # Runs after the stream finishes, keeping summary updates off the response path
+    summary_task = None
+    if history_strategy == "summary":
+        summary_task = BackgroundTask(
+            _refresh_history_summary, conversation_id, effective_settings.chairman_model
+        )
+
+    headers = {
+        "Cache-Control": "no-cache",
+        "Connection": "keep-alive",
+        "X-Run-Id": run_id,
+    }
+    body = event_generator()
+    if content_encoding:
+        body = events.compress_stream(body, content_encoding)
+        headers["Content-Encoding"] = content_encoding
+        headers["Vary"] = "Accept, Accept-Encoding"
 
     return StreamingResponse(
-        event_generator(),
+        body,
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-        }
+        headers=headers,
+        background=summary_task
     )
 
 
-if __name__ == "__main__":
+@app.post("/api/conversations/{conversation_id}/runs/{run_id}/cancel", status_code=202)
+async def cancel_run(conversation_id: str, run_id: str, request: Optional[CancelRunRequest] = None):
+    """
+    Cancel a streamed council turn.
+
+    The run's upstream calls are cancelled right away (within a poll
+    interval when another worker owns it). Its stream then sends a
+    ``cancelled`` event and ends; the partial turn is stored unless
+    ``keep_partial`` is false. Unknown or finished runs get 404.
+    """
+    from . import shared
+    request = request or CancelRunRequest()
+    buffered = await shared.call(shared.get_state().read_events, run_id)
+    if not buffered or buffered[0][1].get("conversation_id") != conversation_id:
+        raise HTTPException(status_code=404, detail="Run not found")
+    if not any(event.get("type") == "cancel_requested" for _, event in buffered[1:]):
+        await shared.call(
+            shared.get_state().append_event,
+            run_id, {"type": "cancel_requested", "keep_partial": request.keep_partial}
+        )
+    turn = _runs.get(run_id)
+    if turn is not None and not turn.done():
+        turn.cancel()
+    return {"run_id": run_id, "status": "cancelling"}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point: serve the API with one or more workers."""
+    parser = argparse.ArgumentParser(description="Run the LLM Council API server.")
+    parser.add_argument("--host", default="0.0.0.0", help="interface to bind (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=8001, help="port to listen on (default: 8001)")
+    parser.add_argument(
+        "--workers", type=int, default=config.WORKERS,
+        help="worker processes sharing the data dir (default: 1, or LLM_COUNCIL_WORKERS)"
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+
+    if args.workers == 1:
+        uvicorn.run(app, host=args.host, port=args.port)
+    else:
+        # Each worker is a fresh process importing the app by name; the
+        # environment tells its config how many workers share the state
+        os.environ["LLM_COUNCIL_WORKERS"] = str(args.workers)
+        uvicorn.run("backend.main:app", host=args.host, port=args.port, workers=args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,323 @@
+"""Per-call and per-stage instrumentation for council turns.
+
+``query_model`` reports one call record per upstream request (queue wait,
+connect, time to first byte, total, token usage, cost, provider). Records are
+fed into process-wide Prometheus-style histograms/counters, rendered by
+``GET /metrics``, and - when a turn is being recorded - grouped per stage for
+the assistant message ``metadata``.
+
+Turn and stage scoping uses context variables, so tasks spawned by
+``asyncio.gather`` inside a stage are attributed to it without threading a
+recorder through every call.
+"""
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Upstream calls are seconds-scale; stages can run for minutes
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+CALL_PHASES = ("queue_wait", "connect", "ttfb", "total")
+
+
+def _format_labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(tuple(str(labels[name]) for name in self.labelnames))
+        return sum(series[0]) if series else 0
+
+    def mean(self, **labels: str) -> Optional[float]:
+        series = self._series.get(tuple(str(labels[name]) for name in self.labelnames))
+        if not series or not sum(series[0]):
+            return None
+        return series[1] / sum(series[0])
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = _format_labels(self.labelnames, key, 'le="%s"' % le)
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+STAGE_SECONDS = Histogram(
+    "llm_council_stage_duration_seconds",
+    "Wall-clock duration of each council stage.",
+    ["stage"]
+)
+MODEL_CALL_SECONDS = Histogram(
+    "llm_council_model_call_seconds",
+    "Upstream model call latency by phase (queue_wait, connect, ttfb, total).",
+    ["model", "phase"]
+)
+MODEL_CALLS = Counter(
+    "llm_council_model_calls_total",
+    "Upstream model calls by outcome.",
+    ["model", "outcome"]
+)
+MODEL_TOKENS = Counter(
+    "llm_council_model_tokens_total",
+    "Tokens reported by the upstream API.",
+    ["model", "kind"]
+)
+MODEL_COST = Counter(
+    "llm_council_model_cost_usd_total",
+    "Cost reported by the upstream API, in USD.",
+    ["model"]
+)
+UPSTREAM_SECONDS_SAVED = Counter(
+    "llm_council_upstream_seconds_saved_total",
+    "Estimated upstream call seconds avoided by cancelling in-flight calls.",
+    ["model"]
+)
+CANCELLED_TURNS = Counter(
+    "llm_council_cancelled_turns_total",
+    "Council turns cancelled before completion, by the stage in flight and reason.",
+    ["stage", "reason"]
+)
+
+REGISTRY = [
+    STAGE_SECONDS, MODEL_CALL_SECONDS, MODEL_CALLS, MODEL_TOKENS, MODEL_COST,
+    UPSTREAM_SECONDS_SAVED, CANCELLED_TURNS,
+]
+
+
+def render() -> str:
+    """Render every registered metric in Prometheus text format."""
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class TurnRecorder:
+    """Collects call records and stage durations for one council turn."""
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    def _stage_entry(self, stage: str) -> Dict[str, Any]:
+        entry = self.stages.get(stage)
+        if entry is None:
+            entry = self.stages[stage] = {
+                "duration": None,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "cost": 0.0,
+                "calls": []
+            }
+        return entry
+
+    def add_call(self, stage: str, call: Dict[str, Any]):
+        entry = self._stage_entry(stage)
+        entry["calls"].append(call)
+        entry["prompt_tokens"] += call.get("prompt_tokens") or 0
+        entry["completion_tokens"] += call.get("completion_tokens") or 0
+        entry["cost"] += call.get("cost") or 0.0
+
+    def set_duration(self, stage: str, seconds: float):
+        self._stage_entry(stage)["duration"] = round(seconds, 4)
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-stage totals and call records, suitable for message metadata."""
+        return {
+            stage: {**entry, "cost": round(entry["cost"], 6), "calls": list(entry["calls"])}
+            for stage, entry in self.stages.items()
+        }
+
+
+_current_turn: ContextVar[Optional[TurnRecorder]] = ContextVar("llm_council_turn", default=None)
+_current_stage: ContextVar[str] = ContextVar("llm_council_stage", default="other")
+
+
+def start_turn() -> TurnRecorder:
+    """Start recording a turn in the current context and return its recorder."""
+    recorder = TurnRecorder()
+    _current_turn.set(recorder)
+    return recorder
+
+
+def current_turn() -> Optional[TurnRecorder]:
+    """Return the recorder for the turn running in this context, if any."""
+    return _current_turn.get()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Attribute calls made inside the block to `name` and time the block."""
+    token = _current_stage.set(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        _current_stage.reset(token)
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        recorder = _current_turn.get()
+        if recorder is not None:
+            recorder.set_duration(name, elapsed)
+
+
+def record_call(call: Dict[str, Any]):
+    """
+    Record one upstream call.
+
+    Args:
+        call: Dict with 'model', 'ok' and optional phase timings
+            ('queue_wait', 'connect', 'ttfb', 'total' in seconds),
+            'prompt_tokens', 'completion_tokens', 'cost' and 'provider';
+            cancelled calls also carry 'cancelled' and 'saved_seconds'
+    """
+    model = call["model"]
+    if call.get("cancelled"):
+        # Partial timings would drag the latency histograms (and the
+        # saved-time estimate built on them) down, so only count the call
+        MODEL_CALLS.inc(model=model, outcome="cancelled")
+        UPSTREAM_SECONDS_SAVED.inc(call.get("saved_seconds") or 0.0, model=model)
+    else:
+        MODEL_CALLS.inc(model=model, outcome="ok" if call.get("ok") else "error")
+        for phase in CALL_PHASES:
+            value = call.get(phase)
+            if value is not None:
+                MODEL_CALL_SECONDS.observe(value, model=model, phase=phase)
+    if call.get("prompt_tokens"):
+        MODEL_TOKENS.inc(call["prompt_tokens"], model=model, kind="prompt")
+    if call.get("completion_tokens"):
+        MODEL_TOKENS.inc(call["completion_tokens"], model=model, kind="completion")
+    if call.get("cost"):
+        MODEL_COST.inc(call["cost"], model=model)
+
+    recorder = _current_turn.get()
+    if recorder is not None:
+        recorder.add_call(_current_stage.get(), call)
+
+
+def estimate_saved_seconds(model: str, elapsed: Optional[float]) -> float:
+    """
+    Upstream time a call cancelled after ``elapsed`` seconds would still have taken.
+
+    Estimated from this process' mean total latency for the model; 0 until a
+    call to it has completed.
+    """
+    mean = MODEL_CALL_SECONDS.mean(model=model, phase="total")
+    if mean is None:
+        return 0.0
+    return round(max(0.0, mean - (elapsed or 0.0)), 6)
+
+
+def record_cancelled_turn(recorder: Optional[TurnRecorder], stage: str, reason: str) -> Dict[str, Any]:
+    """
+    Count a cancelled turn and return its record for the stored message.
+
+    The record names the stage in flight, the reason, and the summed
+    ``saved_seconds`` of the turn's cancelled upstream calls.
+    """
+    CANCELLED_TURNS.inc(stage=stage, reason=reason)
+    saved = 0.0
+    if recorder is not None:
+        for entry in recorder.stages.values():
+            saved += sum(call.get("saved_seconds") or 0.0 for call in entry["calls"] if call.get("cancelled"))
+    return {"stage": stage, "reason": reason, "upstream_seconds_saved": round(saved, 3)}
+
+
+class CallTimer:
+    """
+    Phase timer for a single HTTP call, fed by httpx's `trace` extension.
+
+    Pass `timer.trace` as `extensions={"trace": timer.trace}`; connect and
+    TTFB are then derived from the transport's own events.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._marks: Dict[str, float] = {}
+
+    async def trace(self, event_name: str, info: Dict[str, Any]):
+        # e.g. "connection.connect_tcp.started", "http11.receive_response_headers.complete"
+        self._marks.setdefault(event_name.split(".", 1)[1] if "." in event_name else event_name, time.perf_counter())
+
+    def phases(self) -> Dict[str, Optional[float]]:
+        marks = self._marks
+        end = time.perf_counter()
+
+        def span(begin: Optional[float], finish: Optional[float]) -> Optional[float]:
+            if begin is None or finish is None:
+                return None
+            return round(max(0.0, finish - begin), 6)
+
+        connect_start = marks.get("connect_tcp.started")
+        connect_end = marks.get("start_tls.complete") or marks.get("connect_tcp.complete")
+        send_start = marks.get("send_request_headers.started")
+        first_network = connect_start or send_start
+        return {
+            "queue_wait": span(self.started, first_network),
+            "connect": span(connect_start, connect_end),
+            "ttfb": span(send_start, marks.get("receive_response_headers.complete")),
+            "total": span(self.started, end),
+        }
@@ -0,0 +1,228 @@
+"""Offline stand-in for the OpenRouter chat completions API.
+
+Serves an OpenAI-compatible ``POST /chat/completions`` (streaming and
+non-streaming) plus ``GET /models``, with per-model latency distributions,
+error and 429 rates, and token generation rates. Replies are synthetic but
+shaped so the council pipeline parses them: ranking prompts get a valid
+``FINAL RANKING:`` block (or JSON in structured mode).
+
+Point the backend at it through Settings (``openrouter_api_url``), e.g.
+``http://localhost:8081/chat/completions``.
+
+Usage:
+    python -m backend.mock_openrouter --port 8081 --config mock.json --seed 1
+
+Config file shape (every field optional):
+    {
+      "default": {"latency": {"distribution": "lognormal", "median": 1.5, "sigma": 0.5},
+                  "error_rate": 0.01, "rate_limit_rate": 0.02,
+                  "tokens_per_second": 60, "completion_tokens": 200},
+      "models": {"x-ai/grok-4": {"latency": {"distribution": "fixed", "mean": 4.0}}}
+    }
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Literal, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+WORDS = (
+    "the council considered several angles and found that careful reasoning "
+    "clear evidence and honest uncertainty matter most when answering"
+).split()
+
+
+class LatencyProfile(BaseModel):
+    """Time to first token, in seconds."""
+    distribution: Literal["fixed", "uniform", "normal", "lognormal"] = "fixed"
+    mean: float = 0.5
+    median: float = 0.5
+    sigma: float = 0.3
+    min: float = 0.1
+    max: float = 1.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "uniform":
+            value = rng.uniform(self.min, self.max)
+        elif self.distribution == "normal":
+            value = rng.gauss(self.mean, self.sigma)
+        elif self.distribution == "lognormal":
+            value = self.median * rng.lognormvariate(0.0, self.sigma)
+        else:
+            value = self.mean
+        return max(0.0, value)
+
+
+class ModelProfile(BaseModel):
+    """Simulated behaviour for one upstream model."""
+    latency: LatencyProfile = Field(default_factory=LatencyProfile)
+    error_rate: float = Field(default=0.0, ge=0, le=1)
+    rate_limit_rate: float = Field(default=0.0, ge=0, le=1)
+    tokens_per_second: Optional[float] = Field(default=50.0, gt=0)
+    completion_tokens: int = Field(default=120, ge=1)
+
+
+class MockConfig(BaseModel):
+    """Default profile plus per-model overrides."""
+    default: ModelProfile = Field(default_factory=ModelProfile)
+    models: Dict[str, ModelProfile] = Field(default_factory=dict)
+
+    def profile_for(self, model: str) -> ModelProfile:
+        return self.models.get(model, self.default)
+
+
+def _estimate_tokens(messages: List[Dict[str, Any]]) -> int:
+    return sum(len(str(m.get("content", ""))) // 4 + 1 for m in messages)
+
+
+def synthesize_reply(messages: List[Dict[str, Any]], completion_tokens: int, rng: random.Random) -> str:
+    """
+    Produce a synthetic reply the council pipeline can parse.
+
+    Ranking prompts get a shuffled ranking of the labels they mention (JSON
+    when the prompt asks for it); everything else gets filler text of about
+    completion_tokens words.
+    """
+    prompt = str(messages[-1].get("content", "")) if messages else ""
+    labels = list(dict.fromkeys(re.findall(r'^(Response [A-Z]):$', prompt, flags=re.MULTILINE)))
+
+    if labels and "Reply with ONLY a JSON object" in prompt:
+        ranked = rng.sample(labels, len(labels))
+        return json.dumps({
+            "ranking": ranked,
+            "scores": {label: max(1, 10 - i) for i, label in enumerate(ranked)}
+        })
+
+    words = [rng.choice(WORDS) for _ in range(completion_tokens)]
+    text = " ".join(words).capitalize() + "."
+    if labels and "FINAL RANKING:" in prompt:
+        ranked = rng.sample(labels, len(labels))
+        text += "\n\nFINAL RANKING:\n" + "\n".join(
+            f"{i}. {label}" for i, label in enumerate(ranked, start=1)
+        )
+    return text
+
+
+def create_app(config: Optional[MockConfig] = None, seed: Optional[int] = None) -> FastAPI:
+    """
+    Build the mock OpenRouter app.
+
+    Args:
+        config: Model profiles (defaults to fast, error-free responses)
+        seed: Optional seed for reproducible latencies, failures and replies
+    """
+    config = config or MockConfig()
+    rng = random.Random(seed)
+    mock = FastAPI(title="Mock OpenRouter")
+
+    @mock.get("/models")
+    async def list_models():
+        return {"data": [{"id": model} for model in config.models]}
+
+    @mock.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "")
+        messages = body.get("messages") or []
+        profile = config.profile_for(model)
+
+        roll = rng.random()
+        if roll < profile.rate_limit_rate:
+            return JSONResponse(
+                status_code=429,
+                content={"error": {"message": "Rate limit exceeded", "code": 429}},
+                headers={"Retry-After": "1"}
+            )
+        if roll < profile.rate_limit_rate + profile.error_rate:
+            return JSONResponse(
+                status_code=500,
+                content={"error": {"message": "Simulated upstream error", "code": 500}}
+            )
+
+        first_token_delay = profile.latency.sample(rng)
+        content = synthesize_reply(messages, profile.completion_tokens, rng)
+        tokens = content.split(" ")
+        per_token = 1.0 / profile.tokens_per_second if profile.tokens_per_second else 0.0
+        usage = {
+            "prompt_tokens": _estimate_tokens(messages),
+            "completion_tokens": len(tokens),
+            "total_tokens": _estimate_tokens(messages) + len(tokens)
+        }
+        completion_id = f"gen-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+
+        if not body.get("stream"):
+            await asyncio.sleep(first_token_delay + per_token * len(tokens))
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "provider": "mock",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop"
+                }],
+                "usage": usage
+            }
+
+        async def chunks():
+            await asyncio.sleep(first_token_delay)
+            for i, token in enumerate(tokens):
+                piece = token if i == 0 else " " + token
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+                if per_token:
+                    await asyncio.sleep(per_token)
+            final = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                "usage": usage
+            }
+            yield f"data: {json.dumps(final)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    return mock
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Run an offline mock of the OpenRouter API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--config", help="JSON file with model profiles")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    config = MockConfig()
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config = MockConfig(**json.load(f))
+
+    import uvicorn
+    uvicorn.run(create_app(config, seed=args.seed), host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,16 +1,87 @@
-"""OpenRouter API client for making LLM requests."""
+"""OpenRouter API client for making LLM requests.
 
-import httpx
-from typing import List, Dict, Any, Optional
+All upstream calls share one pooled ``httpx.AsyncClient`` and one concurrency
+limiter per event loop, so council stages, title generation and history
+summaries compete fairly for connections instead of each opening their own.
+"""
 
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, AsyncIterator, List, Dict, Any, Optional, Tuple
+
+from . import config
+from . import metrics
+from . import shared
+from . import tracing
 from .settings import get_openrouter_credentials
 
+if TYPE_CHECKING:
+    import httpx
+
+
+# Shared client/limiter, recreated if the running event loop changes
+_shared_client: Optional[httpx.AsyncClient] = None
+_shared_limiter: Optional[asyncio.Semaphore] = None
+_shared_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _ensure_shared_for_loop():
+    global _shared_client, _shared_limiter, _shared_loop
+    loop = asyncio.get_running_loop()
+    if _shared_loop is not loop or _shared_client is None or _shared_client.is_closed:
+        # Imported on first upstream call; serving ``/`` does not need httpx
+        import httpx
+
+        # The configured limits are for the whole deployment; each worker gets its share
+        max_connections = shared.worker_share(config.UPSTREAM_MAX_CONNECTIONS)
+        _shared_client = httpx.AsyncClient(
+            timeout=120.0,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            )
+        )
+        _shared_limiter = asyncio.Semaphore(shared.worker_share(config.UPSTREAM_MAX_CONCURRENT_REQUESTS))
+        _shared_loop = loop
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Return the pooled upstream client for the running event loop."""
+    _ensure_shared_for_loop()
+    return _shared_client
+
+
+def shared_client_ready() -> bool:
+    """True if the pooled client exists for the running event loop."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return _shared_loop is loop and _shared_client is not None and not _shared_client.is_closed
+
+
+def get_limiter() -> asyncio.Semaphore:
+    """Return the upstream concurrency limiter for the running event loop."""
+    _ensure_shared_for_loop()
+    return _shared_limiter
+
+
+async def close_shared_client():
+    """Close the pooled upstream client (e.g., on application shutdown)."""
+    global _shared_client, _shared_limiter, _shared_loop
+    client = _shared_client
+    _shared_client = _shared_limiter = _shared_loop = None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
 
 async def query_model(
     model: str,
     messages: List[Dict[str, str]],
     timeout: float = 120.0,
-    client: Optional[httpx.AsyncClient] = None
+    client: Optional[httpx.AsyncClient] = None,
+    response_format: Optional[Dict[str, Any]] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Query a single model via OpenRouter API.
@@ -19,9 +90,12 @@ async def query_model(
         model: OpenRouter model identifier (e.g., "openai/gpt-4o")
         messages: List of message dicts with 'role' and 'content'
         timeout: Request timeout in seconds
+        client: Optional client to use instead of the shared pooled client
+        response_format: Optional OpenAI-style response_format (e.g. a JSON schema)
 
     Returns:
-        Response dict with 'content' and optional 'reasoning_details', or None if failed
+        Response dict with 'content', optional 'reasoning_details', 'usage',
+        'provider' and a per-call 'metrics' record, or None if failed
     """
     creds = get_openrouter_credentials()
     headers = {
@@ -32,40 +106,81 @@ async def query_model(
     payload = {
         "model": model,
         "messages": messages,
+        # Ask OpenRouter to include token counts and cost in `usage`
+        "usage": {"include": True},
     }
+    if response_format is not None:
+        payload["response_format"] = response_format
 
-    try:
-        async def _do_request(client_obj: httpx.AsyncClient):
-            response = await client_obj.post(
-                creds.api_url,
-                headers=headers,
-                json=payload
-            )
-            response.raise_for_status()
+    timer = metrics.CallTimer()
+
+    def _call_record(ok: bool, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        usage = (data or {}).get('usage') or {}
+        return {
+            "model": model,
+            "ok": ok,
+            **timer.phases(),
+            "prompt_tokens": usage.get('prompt_tokens'),
+            "completion_tokens": usage.get('completion_tokens'),
+            "cost": usage.get('cost'),
+            "provider": (data or {}).get('provider'),
+        }
 
-            data = response.json()
-            message = data['choices'][0]['message']
+    with tracing.start_span("openrouter.chat_completion", model=model) as span:
+        try:
+            async def _do_request(client_obj: httpx.AsyncClient):
+                async with get_limiter():
+                    response = await client_obj.post(
+                        creds.api_url,
+                        headers=headers,
+                        json=payload,
+                        timeout=timeout,
+                        extensions={"trace": timer.trace}
+                    )
+                response.raise_for_status()
 
-            return {
-                'content': message.get('content'),
-                'reasoning_details': message.get('reasoning_details')
-            }
+                data = response.json()
+                message = data['choices'][0]['message']
+                call = _call_record(True, data)
+                metrics.record_call(call)
+                span.set_attribute("ok", True)
+                span.set_attribute("provider", call["provider"])
+                span.set_attribute("prompt_tokens", call["prompt_tokens"])
+                span.set_attribute("completion_tokens", call["completion_tokens"])
 
-        if client is not None:
-            return await _do_request(client)
+                return {
+                    'content': message.get('content'),
+                    'reasoning_details': message.get('reasoning_details'),
+                    'usage': data.get('usage'),
+                    'provider': data.get('provider'),
+                    'metrics': call
+                }
 
-        async with httpx.AsyncClient(timeout=timeout) as client_obj:
-            return await _do_request(client_obj)
+            return await _do_request(client if client is not None else get_shared_client())
 
-    except Exception as e:
-        print(f"Error querying model {model}: {e}")
-        return None
+        except asyncio.CancelledError:
+            # The turn was abandoned; closing the request stops the upstream work
+            call = _call_record(False)
+            call["cancelled"] = True
+            call["saved_seconds"] = metrics.estimate_saved_seconds(model, call["total"])
+            metrics.record_call(call)
+            span.set_attribute("ok", False)
+            span.set_attribute("cancelled", True)
+            raise
+
+        except Exception as e:
+            print(f"Error querying model {model}: {e}")
+            metrics.record_call(_call_record(False))
+            span.set_attribute("ok", False)
+            span.set_attribute("error", str(e))
+            return None
 
 
 async def query_models_parallel(
     models: List[str],
     messages: List[Dict[str, str]],
-    timeout: float = 120.0
+    timeout: float = 120.0,
+    response_format: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Optional[Dict[str, Any]]]:
     """
     Query multiple models in parallel.
@@ -73,14 +188,83 @@ async def query_models_parallel(
     Args:
         models: List of OpenRouter model identifiers
         messages: List of message dicts to send to each model
+        response_format: Optional response_format passed to every model
 
     Returns:
         Dict mapping model identifier to response dict (or None if failed)
     """
-    import asyncio
+    return await query_models_with_messages(
+        {model: messages for model in models},
+        timeout=timeout,
+        response_format=response_format
+    )
+
 
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        tasks = [query_model(model, messages, timeout=timeout, client=client) for model in models]
-        responses = await asyncio.gather(*tasks)
+async def query_models_with_messages(
+    model_messages: Dict[str, List[Dict[str, str]]],
+    timeout: float = 120.0,
+    response_format: Optional[Dict[str, Any]] = None
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Query multiple models in parallel, each with its own message list.
+
+    Args:
+        model_messages: Mapping of OpenRouter model identifier to the messages
+            that model should receive
+        response_format: Optional response_format passed to every model
+
+    Returns:
+        Dict mapping model identifier to response dict (or None if failed)
+    """
+    models = list(model_messages.keys())
+    client = get_shared_client()
+    tasks = [
+        query_model(
+            model,
+            model_messages[model],
+            timeout=timeout,
+            client=client,
+            response_format=response_format
+        )
+        for model in models
+    ]
+    responses = await asyncio.gather(*tasks)
 
     return {model: response for model, response in zip(models, responses)}
+
+
+async def iter_models_with_messages(
+    model_messages: Dict[str, List[Dict[str, str]]],
+    timeout: float = 120.0,
+    response_format: Optional[Dict[str, Any]] = None
+) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]]]]:
+    """
+    Query multiple models in parallel, yielding each result as it arrives.
+
+    Like query_models_with_messages, but yields (model, response or None)
+    pairs in completion order instead of waiting for the slowest model.
+    Closing the iterator early (or cancelling its consumer) cancels the
+    calls still in flight and waits for them to record their outcome.
+    """
+    client = get_shared_client()
+
+    async def query(model: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        response = await query_model(
+            model,
+            model_messages[model],
+            timeout=timeout,
+            client=client,
+            response_format=response_format
+        )
+        return model, response
+
+    tasks = [asyncio.create_task(query(model)) for model in model_messages]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
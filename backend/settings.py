@@ -10,12 +10,13 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-import httpx
 from pydantic import BaseModel, Field, ValidationError, field_validator
 
-from . import config
+from . import config, storage
+
+HISTORY_STRATEGIES = ("none", "last_n", "token_budget", "summary")
 
 # Use the parent of the conversation directory (data/) for settings storage
 DATA_ROOT = Path(config.DATA_DIR).parent or Path(".")
@@ -29,6 +30,10 @@ class Settings(BaseModel):
     openrouter_api_url: str = config.OPENROUTER_API_URL
     council_models: List[str] = Field(default_factory=lambda: list(config.COUNCIL_MODELS))
     chairman_model: str = config.CHAIRMAN_MODEL
+    title_model: str = config.TITLE_MODEL
+    history_strategy: str = config.HISTORY_STRATEGY
+    history_max_turns: int = Field(default=config.HISTORY_MAX_TURNS, ge=0)
+    history_token_budget: int = Field(default=config.HISTORY_TOKEN_BUDGET, ge=0)
 
     @field_validator("openrouter_api_url")
     def validate_url(cls, value: str) -> str:
@@ -36,6 +41,12 @@ class Settings(BaseModel):
             raise ValueError("openrouter_api_url must not be empty")
         return value
 
+    @field_validator("history_strategy")
+    def validate_history_strategy(cls, value: str) -> str:
+        if value not in HISTORY_STRATEGIES:
+            raise ValueError(f"history_strategy must be one of {', '.join(HISTORY_STRATEGIES)}")
+        return value
+
 
 class OpenRouterCredentials(BaseModel):
     """Minimal credentials payload used by the OpenRouter client and tests."""
@@ -58,26 +69,52 @@ def redact_api_key(api_key: Optional[str]) -> Optional[str]:
     return api_key[:4] + "*" * (len(api_key) - 8) + api_key[-4:]
 
 
+# Parsed settings keyed by (path, mtime_ns, size); every upstream call reads
+# the credentials, so the file is only parsed again when it changes
+_settings_cache: Optional[Tuple[Tuple[str, int, int], Settings]] = None
+
+
+def _settings_file_token() -> Optional[Tuple[str, int, int]]:
+    try:
+        stat = SETTINGS_FILE.stat()
+    except FileNotFoundError:
+        return None
+    return (str(SETTINGS_FILE), stat.st_mtime_ns, stat.st_size)
+
+
+def settings_cached() -> bool:
+    """True if the settings file has been parsed and has not changed since."""
+    token = _settings_file_token()
+    return token is None or (_settings_cache is not None and _settings_cache[0] == token)
+
+
 def _load_settings_raw() -> Settings:
-    """Load settings from disk or return defaults."""
-    _ensure_data_root()
-    if not SETTINGS_FILE.exists():
+    """Load settings from disk or return defaults (a fresh copy each call)."""
+    global _settings_cache
+    token = _settings_file_token()
+    if token is None:
         return Settings()
+    if _settings_cache is not None and _settings_cache[0] == token:
+        return _settings_cache[1].model_copy(deep=True)
 
     try:
         with SETTINGS_FILE.open("r", encoding="utf-8") as f:
             data = json.load(f)
-        return Settings(**data)
+        loaded = Settings(**data)
     except (json.JSONDecodeError, ValidationError):
         # Invalid file contents – fall back to defaults
-        return Settings()
+        loaded = Settings()
+    _settings_cache = (token, loaded)
+    return loaded.model_copy(deep=True)
 
 
 def save_settings(new_settings: Settings) -> Settings:
     """Persist validated settings to disk."""
+    global _settings_cache
     _ensure_data_root()
-    with SETTINGS_FILE.open("w", encoding="utf-8") as f:
-        json.dump(new_settings.model_dump(), f, indent=2)
+    # Other workers may be reading the file; replace it in one step
+    storage.write_atomic(str(SETTINGS_FILE), json.dumps(new_settings.model_dump(), indent=2).encode("utf-8"))
+    _settings_cache = None
     return new_settings
 
 
@@ -107,6 +144,10 @@ def load_settings(redact: bool = False) -> Settings | Dict[str, Optional[str]]:
         "openrouter_api_url": settings_obj.openrouter_api_url,
         "council_models": settings_obj.council_models,
         "chairman_model": settings_obj.chairman_model,
+        "title_model": settings_obj.title_model,
+        "history_strategy": settings_obj.history_strategy,
+        "history_max_turns": settings_obj.history_max_turns,
+        "history_token_budget": settings_obj.history_token_budget,
     }
 
 
@@ -126,6 +167,8 @@ def get_effective_settings() -> Settings:
         settings_obj.council_models = list(config.COUNCIL_MODELS)
     if not settings_obj.chairman_model:
         settings_obj.chairman_model = config.CHAIRMAN_MODEL
+    if not settings_obj.title_model:
+        settings_obj.title_model = config.TITLE_MODEL
     if not settings_obj.openrouter_api_url:
         settings_obj.openrouter_api_url = config.OPENROUTER_API_URL
 
@@ -160,6 +203,9 @@ async def test_openrouter_connection(creds: OpenRouterCredentials) -> Dict[str,
 
     headers = {"Authorization": f"Bearer {creds.api_key}"}
 
+    # Only needed when validating a key; keeps httpx off the import path
+    import httpx
+
     try:
         async with httpx.AsyncClient(timeout=10.0) as client:
             response = await client.get(models_url, headers=headers)
@@ -0,0 +1,356 @@
+"""State shared between backend workers.
+
+With one worker (the default) everything lives in process. ``python -m
+backend.main --workers N`` runs N uvicorn processes on one data directory,
+so state they have to agree on goes through a ``SharedState`` adapter:
+
+- ``lock(name)``: mutual exclusion for read-modify-write of a conversation
+- ``incr``/``count``/``counters``: counters (conversation write versions for ETags)
+- ``cache_get``/``cache_set``: a bounded LRU cache per namespace (titles, batch job status)
+- ``append_event``/``read_events``: per-run event buffers
+
+``LocalState`` keeps these in memory; ``SQLiteState`` keeps them in a
+SQLite file next to the conversations, with ``flock`` file locks, as a
+local stand-in for an external store. ``configure_from_env`` picks one
+according to ``config.SHARED_STATE``. Its calls block on file I/O, so async
+code goes through ``call`` (a worker thread for cross-process adapters).
+Upstream concurrency limits are split statically between workers with
+``worker_share``; there is no limiter shared at run time.
+"""
+
+import abc
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import config
+
+try:  # POSIX file locks; without them locks only hold within one process
+    import fcntl
+except ImportError:  # pragma: no cover - depends on platform
+    fcntl = None
+
+# Lock names hash onto a fixed set of lock files
+LOCK_STRIPES = 64
+
+
+class SharedState(abc.ABC):
+    """Locks, counters, a bounded cache and run event buffers."""
+
+    # True when other processes see the same state (calls then do blocking I/O)
+    cross_process = False
+
+    @abc.abstractmethod
+    def lock(self, name: str):
+        """Context manager holding the named lock."""
+
+    @abc.abstractmethod
+    def incr(self, key: str, amount: int = 1) -> int:
+        """Add to a counter and return its new value."""
+
+    @abc.abstractmethod
+    def count(self, key: str) -> int:
+        """A counter's value (0 if unset)."""
+
+    @abc.abstractmethod
+    def counters(self, prefix: str = "") -> Dict[str, int]:
+        """Every counter whose key starts with ``prefix``."""
+
+    @abc.abstractmethod
+    def cache_get(self, namespace: str, key: str) -> Optional[str]:
+        """A cached value (marking it recently used), or None."""
+
+    @abc.abstractmethod
+    def cache_set(self, namespace: str, key: str, value: str, max_entries: int):
+        """Cache a value, evicting the least recently used beyond ``max_entries``."""
+
+    @abc.abstractmethod
+    def cache_clear(self, namespace: str):
+        """Drop every entry of a namespace."""
+
+    @abc.abstractmethod
+    def append_event(self, run_id: str, event: Dict[str, Any]) -> int:
+        """Append an event to a run's buffer and return its sequence number (from 1)."""
+
+    @abc.abstractmethod
+    def read_events(self, run_id: str, after: int = 0) -> List[Tuple[int, Dict[str, Any]]]:
+        """(sequence, event) pairs of a run after the given sequence number."""
+
+    @abc.abstractmethod
+    def drop_events(self, run_id: str):
+        """Forget a run's buffer."""
+
+    def close(self):
+        pass
+
+
+class LocalState(SharedState):
+    """In-process state for a single worker."""
+
+    def __init__(self):
+        self._guard = threading.Lock()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._counters: Dict[str, int] = {}
+        self._caches: Dict[str, "OrderedDict[str, str]"] = {}
+        self._events: Dict[str, List[Dict[str, Any]]] = {}
+
+    @contextmanager
+    def lock(self, name: str) -> Iterator[None]:
+        with self._guard:
+            lock = self._locks.setdefault(name, threading.Lock())
+        with lock:
+            yield
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        with self._guard:
+            self._counters[key] = self._counters.get(key, 0) + amount
+            return self._counters[key]
+
+    def count(self, key: str) -> int:
+        with self._guard:
+            return self._counters.get(key, 0)
+
+    def counters(self, prefix: str = "") -> Dict[str, int]:
+        with self._guard:
+            return {key: value for key, value in self._counters.items() if key.startswith(prefix)}
+
+    def cache_get(self, namespace: str, key: str) -> Optional[str]:
+        with self._guard:
+            cache = self._caches.get(namespace)
+            if cache is None or key not in cache:
+                return None
+            cache.move_to_end(key)
+            return cache[key]
+
+    def cache_set(self, namespace: str, key: str, value: str, max_entries: int):
+        with self._guard:
+            cache = self._caches.setdefault(namespace, OrderedDict())
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > max_entries:
+                cache.popitem(last=False)
+
+    def cache_clear(self, namespace: str):
+        with self._guard:
+            self._caches.pop(namespace, None)
+
+    def append_event(self, run_id: str, event: Dict[str, Any]) -> int:
+        with self._guard:
+            buffer = self._events.setdefault(run_id, [])
+            buffer.append(event)
+            return len(buffer)
+
+    def read_events(self, run_id: str, after: int = 0) -> List[Tuple[int, Dict[str, Any]]]:
+        with self._guard:
+            buffer = self._events.get(run_id, [])
+            return [(seq, event) for seq, event in enumerate(buffer, start=1) if seq > after]
+
+    def drop_events(self, run_id: str):
+        with self._guard:
+            self._events.pop(run_id, None)
+
+
+class SQLiteState(SharedState):
+    """
+    State in a SQLite database shared by every worker on this machine.
+
+    Each process opens its own connection (WAL mode, so readers do not block
+    the writer); read-modify-write sequences run in ``BEGIN IMMEDIATE``
+    transactions. Locks are ``flock``s on striped files in ``lock_dir``.
+    """
+
+    cross_process = True
+
+    def __init__(self, path: str, lock_dir: Optional[str] = None):
+        self.path = path
+        self.lock_dir = lock_dir or os.path.join(os.path.dirname(path) or ".", "locks")
+        self._conn = None
+        self._conn_pid: Optional[int] = None
+        self._conn_lock = threading.Lock()
+        self._thread_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    def _connect(self):
+        # A connection must not cross a fork; reopen in the child
+        if self._conn is None or self._conn_pid != os.getpid():
+            import sqlite3
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS counters (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+                CREATE TABLE IF NOT EXISTS cache (
+                    namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, used_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                );
+                CREATE TABLE IF NOT EXISTS run_events (
+                    run_id TEXT NOT NULL, seq INTEGER NOT NULL, event TEXT NOT NULL,
+                    PRIMARY KEY (run_id, seq)
+                );
+                """
+            )
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    @contextmanager
+    def _transaction(self):
+        with self._conn_lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self._conn_lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    @contextmanager
+    def lock(self, name: str) -> Iterator[None]:
+        stripe = int(hashlib.sha1(name.encode("utf-8")).hexdigest(), 16) % LOCK_STRIPES
+        # flock excludes other processes; the thread lock covers threads of this one
+        with self._thread_locks[stripe]:
+            if fcntl is None:  # pragma: no cover - depends on platform
+                yield
+                return
+            os.makedirs(self.lock_dir, exist_ok=True)
+            with open(os.path.join(self.lock_dir, f"{stripe}.lock"), "a+b") as f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO counters (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+                (key, amount),
+            )
+            return conn.execute("SELECT value FROM counters WHERE key = ?", (key,)).fetchone()[0]
+
+    def count(self, key: str) -> int:
+        rows = self._query("SELECT value FROM counters WHERE key = ?", (key,))
+        return rows[0][0] if rows else 0
+
+    def counters(self, prefix: str = "") -> Dict[str, int]:
+        rows = self._query(
+            "SELECT key, value FROM counters WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+        )
+        return dict(rows)
+
+    def cache_get(self, namespace: str, key: str) -> Optional[str]:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT value FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE cache SET used_at = ? WHERE namespace = ? AND key = ?", (time.time(), namespace, key)
+            )
+            return row[0]
+
+    def cache_set(self, namespace: str, key: str, value: str, max_entries: int):
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, used_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, value, time.time()),
+            )
+            conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key NOT IN ("
+                "SELECT key FROM cache WHERE namespace = ? ORDER BY used_at DESC LIMIT ?)",
+                (namespace, namespace, max_entries),
+            )
+
+    def cache_clear(self, namespace: str):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM cache WHERE namespace = ?", (namespace,))
+
+    def append_event(self, run_id: str, event: Dict[str, Any]) -> int:
+        with self._transaction() as conn:
+            seq = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM run_events WHERE run_id = ?", (run_id,)
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO run_events (run_id, seq, event) VALUES (?, ?, ?)",
+                (run_id, seq, json.dumps(event, separators=(",", ":"))),
+            )
+            return seq
+
+    def read_events(self, run_id: str, after: int = 0) -> List[Tuple[int, Dict[str, Any]]]:
+        rows = self._query(
+            "SELECT seq, event FROM run_events WHERE run_id = ? AND seq > ? ORDER BY seq", (run_id, after)
+        )
+        return [(seq, json.loads(event)) for seq, event in rows]
+
+    def drop_events(self, run_id: str):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM run_events WHERE run_id = ?", (run_id,))
+
+    def close(self):
+        with self._conn_lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+
+_state: SharedState = LocalState()
+
+
+def set_state(state: SharedState):
+    """Install the shared-state adapter (closing the previous one)."""
+    global _state
+    if _state is not state:
+        _state.close()
+    _state = state
+
+
+def get_state() -> SharedState:
+    return _state
+
+
+def configure_from_env():
+    """Install an adapter according to config.SHARED_STATE ("local" or "sqlite")."""
+    kind = (config.SHARED_STATE or "local").lower()
+    if kind == "sqlite":
+        if not isinstance(_state, SQLiteState) or _state.path != config.SHARED_STATE_FILE:
+            set_state(SQLiteState(config.SHARED_STATE_FILE))
+    elif not isinstance(_state, LocalState):
+        set_state(LocalState())
+
+
+async def call(method, *args):
+    """
+    Call a method of the installed adapter from async code.
+
+    Cross-process adapters block on SQLite and file locks, so their calls
+    run in a worker thread instead of on the event loop.
+    """
+    if _state.cross_process:
+        return await asyncio.to_thread(method, *args)
+    return method(*args)
+
+
+def worker_share(total: int) -> int:
+    """
+    This worker's part of a limit meant for the whole deployment (at least 1).
+
+    The split is static: a worker does not borrow unused capacity from the others.
+    """
+    return max(1, total // max(1, config.WORKERS))
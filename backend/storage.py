@@ -1,11 +1,46 @@
-"""JSON-based storage for conversations."""
+"""JSON-based storage for conversations.
 
+Conversations are written in the configured ``STORAGE_FORMAT``: plain JSON
+(``.json``), gzip-compressed JSON (``.json.gz``) or zstd-compressed JSON
+(``.json.zst``, optionally with a dictionary trained on our own
+conversations). Reads accept every format, so existing files keep working
+and can be rewritten later with ``python -m backend.compaction``.
+"""
+
+import gzip
+import hashlib
 import json
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import Iterator, List, Dict, Any, Optional
 from pathlib import Path
-from .config import DATA_DIR
+from . import shared
+from .config import DATA_DIR, STORAGE_FORMAT
+from .tracing import traced
+
+try:  # Optional zstd support
+    import zstandard
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+
+# File suffix per storage format
+FORMAT_SUFFIXES = {
+    "json": ".json",
+    "gzip": ".json.gz",
+    "zstd": ".json.zst",
+}
+
+# Trained zstd dictionaries live next to the conversations, one file per dict id
+ZSTD_DICT_DIRNAME = ".zstd-dicts"
+
+_zstd_dicts: Dict[int, Any] = {}
+
+# Per-conversation write counters (in the shared state, so every worker sees
+# them). Combined with file stats in the version strings below, so two writes
+# within one filesystem timestamp tick still produce different versions.
+WRITE_VERSION_PREFIX = "write_version:"
 
 
 def ensure_data_dir():
@@ -13,11 +48,194 @@ def ensure_data_dir():
     Path(DATA_DIR).mkdir(parents=True, exist_ok=True)
 
 
-def get_conversation_path(conversation_id: str) -> str:
-    """Get the file path for a conversation."""
-    return os.path.join(DATA_DIR, f"{conversation_id}.json")
+def storage_format() -> str:
+    """The format new writes use (zstd falls back to gzip if unavailable)."""
+    if STORAGE_FORMAT not in FORMAT_SUFFIXES:
+        raise ValueError(f"Unknown storage format: {STORAGE_FORMAT}")
+    if STORAGE_FORMAT == "zstd" and zstandard is None:
+        return "gzip"
+    return STORAGE_FORMAT
+
+
+def get_conversation_path(conversation_id: str, fmt: Optional[str] = None) -> str:
+    """Get the file path for a conversation in the given (or configured) format."""
+    suffix = FORMAT_SUFFIXES[fmt or storage_format()]
+    return os.path.join(DATA_DIR, f"{conversation_id}{suffix}")
+
+
+def find_conversation_path(conversation_id: str) -> Optional[str]:
+    """Locate an existing conversation file in any format, preferring the configured one."""
+    preferred = storage_format()
+    formats = [preferred] + [fmt for fmt in FORMAT_SUFFIXES if fmt != preferred]
+    for fmt in formats:
+        path = get_conversation_path(conversation_id, fmt)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def format_for_path(path: str) -> Optional[str]:
+    """Storage format implied by a file name, or None if it is not a conversation file."""
+    for fmt, suffix in sorted(FORMAT_SUFFIXES.items(), key=lambda item: -len(item[1])):
+        if path.endswith(suffix):
+            return fmt
+    return None
+
+
+def write_atomic(path: str, data: bytes):
+    """
+    Replace ``path`` with ``data`` in one step.
+
+    Writes a temporary file in the same directory and renames it over the
+    target, so concurrent readers (possibly in other workers) see either the
+    old or the new contents, never a partial file.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@contextmanager
+def conversation_lock(conversation_id: str) -> Iterator[None]:
+    """Serialize read-modify-write of one conversation across threads and workers."""
+    with shared.get_state().lock(f"conversation:{conversation_id}"):
+        yield
+
+
+def _dict_dir() -> str:
+    return os.path.join(DATA_DIR, ZSTD_DICT_DIRNAME)
+
+
+def _load_zstd_dict(dict_id: int):
+    if dict_id not in _zstd_dicts:
+        path = os.path.join(_dict_dir(), f"{dict_id}.dict")
+        with open(path, 'rb') as f:
+            _zstd_dicts[dict_id] = zstandard.ZstdCompressionDict(f.read())
+    return _zstd_dicts[dict_id]
+
+
+def current_zstd_dict():
+    """The dictionary new zstd writes use (the most recently trained one), if any."""
+    latest = os.path.join(_dict_dir(), "latest")
+    if zstandard is None or not os.path.exists(latest):
+        return None
+    with open(latest, 'r') as f:
+        return _load_zstd_dict(int(f.read().strip()))
+
+
+def train_zstd_dict(samples: List[bytes], dict_size: int = 64 * 1024):
+    """
+    Train a zstd dictionary on serialized conversations and make it current.
+
+    Dictionaries are stored by id and never overwritten, so files written
+    with an older dictionary stay readable.
+    """
+    if zstandard is None:
+        raise RuntimeError("zstd storage requires the 'zstandard' package")
+    trained = zstandard.train_dictionary(dict_size, samples)
+    dict_id = trained.dict_id()
+    os.makedirs(_dict_dir(), exist_ok=True)
+    write_atomic(os.path.join(_dict_dir(), f"{dict_id}.dict"), trained.as_bytes())
+    write_atomic(os.path.join(_dict_dir(), "latest"), str(dict_id).encode('utf-8'))
+    _zstd_dicts[dict_id] = trained
+    return trained
+
+
+def encode_conversation(conversation: Dict[str, Any], fmt: str) -> bytes:
+    """Serialize a conversation for the given storage format."""
+    if fmt == "json":
+        return json.dumps(conversation, indent=2).encode('utf-8')
+    raw = json.dumps(conversation, separators=(',', ':')).encode('utf-8')
+    if fmt == "gzip":
+        return gzip.compress(raw, mtime=0)
+    if fmt == "zstd":
+        zstd_dict = current_zstd_dict()
+        if zstd_dict is not None:
+            return zstandard.ZstdCompressor(level=10, dict_data=zstd_dict).compress(raw)
+        return zstandard.ZstdCompressor(level=10).compress(raw)
+    raise ValueError(f"Unknown storage format: {fmt}")
+
+
+def decode_conversation(data: bytes, fmt: str) -> Dict[str, Any]:
+    """Inverse of :func:`encode_conversation`."""
+    if fmt == "gzip":
+        data = gzip.decompress(data)
+    elif fmt == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Reading .json.zst files requires the 'zstandard' package")
+        dict_id = zstandard.get_frame_parameters(data).dict_id
+        if dict_id:
+            data = zstandard.ZstdDecompressor(dict_data=_load_zstd_dict(dict_id)).decompress(data)
+        else:
+            data = zstandard.ZstdDecompressor().decompress(data)
+    return json.loads(data)
+
+
+def read_conversation_file(path: str) -> Dict[str, Any]:
+    """Load a conversation file in any supported format."""
+    with open(path, 'rb') as f:
+        return decode_conversation(f.read(), format_for_path(path))
+
+
+def write_conversation_file(conversation: Dict[str, Any], fmt: Optional[str] = None) -> str:
+    """
+    Write a conversation in the given (or configured) format.
+
+    Copies of the same conversation in other formats are removed, so there is
+    only ever one file per conversation. Returns the written path.
+    """
+    fmt = fmt or storage_format()
+    path = get_conversation_path(conversation['id'], fmt)
+    write_atomic(path, encode_conversation(conversation, fmt))
+    for other in FORMAT_SUFFIXES:
+        if other != fmt:
+            stale = get_conversation_path(conversation['id'], other)
+            if os.path.exists(stale):
+                os.remove(stale)
+    shared.get_state().incr(WRITE_VERSION_PREFIX + conversation['id'])
+    return path
+
+
+def _stat_token(path: str) -> str:
+    stat = os.stat(path)
+    return f"{os.path.basename(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def conversation_version(conversation_id: str) -> Optional[str]:
+    """
+    Opaque version of a stored conversation, or None if it does not exist.
+
+    Derived from file metadata, so it is cheap to compute without reading
+    the file; used for HTTP ETags.
+    """
+    path = find_conversation_path(conversation_id)
+    if path is None:
+        return None
+    token = f"{_stat_token(path)}:{shared.get_state().count(WRITE_VERSION_PREFIX + conversation_id)}"
+    return hashlib.sha1(token.encode('utf-8')).hexdigest()
 
 
+def list_version() -> str:
+    """Opaque version of the conversation list (changes whenever any conversation does)."""
+    ensure_data_dir()
+    digest = hashlib.sha1()
+    for filename in sorted(os.listdir(DATA_DIR)):
+        if format_for_path(filename):
+            try:
+                digest.update(_stat_token(os.path.join(DATA_DIR, filename)).encode('utf-8'))
+            except FileNotFoundError:
+                continue
+    digest.update(str(sum(shared.get_state().counters(WRITE_VERSION_PREFIX).values())).encode('utf-8'))
+    return digest.hexdigest()
+
+
+@traced("storage.create_conversation")
 def create_conversation(conversation_id: str) -> Dict[str, Any]:
     """
     Create a new conversation.
@@ -38,9 +256,8 @@ def create_conversation(conversation_id: str) -> Dict[str, Any]:
     }
 
     # Save to file
-    path = get_conversation_path(conversation_id)
-    with open(path, 'w') as f:
-        json.dump(conversation, f, indent=2)
+    with conversation_lock(conversation_id):
+        write_conversation_file(conversation)
 
     return conversation
 
@@ -55,13 +272,12 @@ def get_conversation(conversation_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Conversation dict or None if not found
     """
-    path = get_conversation_path(conversation_id)
+    path = find_conversation_path(conversation_id)
 
-    if not os.path.exists(path):
+    if path is None:
         return None
 
-    with open(path, 'r') as f:
-        return json.load(f)
+    return read_conversation_file(path)
 
 
 def save_conversation(conversation: Dict[str, Any]):
@@ -72,10 +288,7 @@ def save_conversation(conversation: Dict[str, Any]):
         conversation: Conversation dict to save
     """
     ensure_data_dir()
-
-    path = get_conversation_path(conversation['id'])
-    with open(path, 'w') as f:
-        json.dump(conversation, f, indent=2)
+    write_conversation_file(conversation)
 
 
 def list_conversations() -> List[Dict[str, Any]]:
@@ -89,11 +302,10 @@ def list_conversations() -> List[Dict[str, Any]]:
 
     conversations = []
     for filename in os.listdir(DATA_DIR):
-        if filename.endswith('.json'):
+        if format_for_path(filename):
             path = os.path.join(DATA_DIR, filename)
             try:
-                with open(path, 'r') as f:
-                    data = json.load(f)
+                data = read_conversation_file(path)
             except Exception:
                 # Skip unreadable or corrupted files
                 continue
@@ -112,6 +324,7 @@ def list_conversations() -> List[Dict[str, Any]]:
     return conversations
 
 
+@traced("storage.add_user_message")
 def add_user_message(conversation_id: str, content: str):
     """
     Add a user message to a conversation.
@@ -120,18 +333,20 @@ def add_user_message(conversation_id: str, content: str):
         conversation_id: Conversation identifier
         content: User message content
     """
-    conversation = get_conversation(conversation_id)
-    if conversation is None:
-        raise ValueError(f"Conversation {conversation_id} not found")
+    with conversation_lock(conversation_id):
+        conversation = get_conversation(conversation_id)
+        if conversation is None:
+            raise ValueError(f"Conversation {conversation_id} not found")
 
-    conversation["messages"].append({
-        "role": "user",
-        "content": content
-    })
+        conversation["messages"].append({
+            "role": "user",
+            "content": content
+        })
 
-    save_conversation(conversation)
+        save_conversation(conversation)
 
 
+@traced("storage.add_assistant_message")
 def add_assistant_message(
     conversation_id: str,
     stage1: List[Dict[str, Any]],
@@ -149,21 +364,23 @@ def add_assistant_message(
         stage3: Final synthesized response
         metadata: Additional context (e.g., label_to_model, aggregate_rankings)
     """
-    conversation = get_conversation(conversation_id)
-    if conversation is None:
-        raise ValueError(f"Conversation {conversation_id} not found")
+    with conversation_lock(conversation_id):
+        conversation = get_conversation(conversation_id)
+        if conversation is None:
+            raise ValueError(f"Conversation {conversation_id} not found")
 
-    conversation["messages"].append({
-        "role": "assistant",
-        "stage1": stage1,
-        "stage2": stage2,
-        "stage3": stage3,
-        "metadata": metadata
-    })
+        conversation["messages"].append({
+            "role": "assistant",
+            "stage1": stage1,
+            "stage2": stage2,
+            "stage3": stage3,
+            "metadata": metadata
+        })
 
-    save_conversation(conversation)
+        save_conversation(conversation)
 
 
+@traced("storage.update_conversation_title")
 def update_conversation_title(conversation_id: str, title: str):
     """
     Update the title of a conversation.
@@ -172,9 +389,28 @@ def update_conversation_title(conversation_id: str, title: str):
         conversation_id: Conversation identifier
         title: New title for the conversation
     """
-    conversation = get_conversation(conversation_id)
-    if conversation is None:
-        raise ValueError(f"Conversation {conversation_id} not found")
+    with conversation_lock(conversation_id):
+        conversation = get_conversation(conversation_id)
+        if conversation is None:
+            raise ValueError(f"Conversation {conversation_id} not found")
+
+        conversation["title"] = title
+        save_conversation(conversation)
+
+
+@traced("storage.update_conversation_summary")
+def update_conversation_summary(conversation_id: str, summary: Dict[str, Any]):
+    """
+    Cache the rolling history summary on a conversation.
+
+    Args:
+        conversation_id: Conversation identifier
+        summary: Dict with 'text' and the number of 'turns' it covers
+    """
+    with conversation_lock(conversation_id):
+        conversation = get_conversation(conversation_id)
+        if conversation is None:
+            raise ValueError(f"Conversation {conversation_id} not found")
 
-    conversation["title"] = title
-    save_conversation(conversation)
+        conversation["context_summary"] = summary
+        save_conversation(conversation)
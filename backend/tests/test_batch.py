@@ -0,0 +1,149 @@
+import json
+
+import pytest
+
+from backend import batch, shared
+
+
+def _write_prompts(path, prompts):
+    path.write_text("\n".join(json.dumps(p) for p in prompts) + "\n")
+
+
+@pytest.fixture
+def fake_council(monkeypatch):
+    calls = []
+
+    async def fake_run_full_council(user_query, **kwargs):
+        calls.append(user_query)
+        if user_query == "explode":
+            raise RuntimeError("upstream down")
+        if user_query == "silence":
+            return [], [], {"model": "error", "response": "All models failed to respond. Please try again."}, {}
+        return [{"model": "m1", "response": "r"}], [], {"model": "chair", "response": f"answer to {user_query}"}, {}
+
+    monkeypatch.setattr(batch, "run_full_council", fake_run_full_council)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_run_batch_writes_results_and_records_errors(tmp_path, fake_council):
+    input_path = tmp_path / "prompts.jsonl"
+    output_path = tmp_path / "out" / "results.jsonl"
+    _write_prompts(input_path, [{"id": "a", "prompt": "one"}, {"prompt": "explode"}, {"content": "three"}])
+
+    counts = await batch.run_batch(str(input_path), str(output_path), concurrency=2)
+
+    assert counts == {"total": 3, "skipped": 0, "completed": 2, "failed": 1}
+    records = {r["id"]: r for r in map(json.loads, output_path.read_text().splitlines())}
+    assert records["a"]["stage3"]["response"] == "answer to one"
+    assert records["2"]["error"] == "upstream down"
+    assert records["3"]["error"] is None
+
+
+@pytest.mark.asyncio
+async def test_run_batch_resumes_from_existing_output(tmp_path, fake_council):
+    input_path = tmp_path / "prompts.jsonl"
+    output_path = tmp_path / "results.jsonl"
+    _write_prompts(input_path, [{"id": "a", "prompt": "one"}, {"id": "b", "prompt": "two"}])
+    output_path.write_text(json.dumps({"id": "a", "error": None}) + "\n" + '{"id": "b", "err')
+
+    counts = await batch.run_batch(str(input_path), str(output_path))
+
+    assert fake_council == ["two"]
+    assert counts["skipped"] == 1 and counts["completed"] == 1
+    # The torn line is dropped rather than merged with the new record
+    ids = [json.loads(line)["id"] for line in output_path.read_text().splitlines()]
+    assert sorted(ids) == ["a", "b"]
+
+    # A second resume has nothing left to run
+    counts = await batch.run_batch(str(input_path), str(output_path))
+    assert fake_council == ["two"]
+    assert counts["skipped"] == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_starts(monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(batch.asyncio, "sleep", fake_sleep)
+    limiter = batch.RateLimiter(rate=10)
+    await limiter.acquire()
+    await limiter.acquire()
+
+    assert len(sleeps) == 1
+    assert 0 < sleeps[0] <= 0.1
+
+
+def test_cli_main_reports_failures(tmp_path, fake_council):
+    input_path = tmp_path / "prompts.jsonl"
+    output_path = tmp_path / "results.jsonl"
+    _write_prompts(input_path, [{"prompt": "explode"}])
+
+    assert batch.main([str(input_path), str(output_path), "--concurrency", "1"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_run_batch_retries_prompts_where_every_model_failed(tmp_path, fake_council):
+    input_path = tmp_path / "prompts.jsonl"
+    output_path = tmp_path / "results.jsonl"
+    _write_prompts(input_path, [{"id": "a", "prompt": "silence"}])
+
+    counts = await batch.run_batch(str(input_path), str(output_path))
+    assert counts["failed"] == 1 and counts["completed"] == 0
+    assert json.loads(output_path.read_text())["error"].startswith("All models failed")
+
+    counts = await batch.run_batch(str(input_path), str(output_path))
+    assert counts["skipped"] == 0
+    assert fake_council == ["silence", "silence"]
+
+
+@pytest.mark.asyncio
+async def test_batch_job_status_is_visible_to_other_workers(tmp_path, fake_council):
+    import asyncio
+
+    input_path = tmp_path / "prompts.jsonl"
+    _write_prompts(input_path, [{"id": "a", "prompt": "one"}])
+    original = shared.get_state()
+    shared.set_state(shared.SQLiteState(str(tmp_path / "shared.sqlite3")))
+    # A second connection to the same file stands in for another worker
+    other_worker = shared.SQLiteState(str(tmp_path / "shared.sqlite3"))
+    try:
+        job = await batch.start_batch_job(str(input_path), str(tmp_path / "results.jsonl"))
+        assert job["status"] == "running"
+        await asyncio.gather(*batch._batch_tasks.values())
+
+        status = json.loads(other_worker.cache_get(batch.BATCH_JOB_NAMESPACE, job["id"]))
+        assert status["status"] == "complete"
+        assert status["counts"]["completed"] == 1
+        assert batch.get_batch_job(job["id"]) == status
+        assert batch.get_batch_job("unknown") is None
+    finally:
+        other_worker.close()
+        shared.set_state(original)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batch_job_is_recorded_as_cancelled(tmp_path, monkeypatch):
+    import asyncio
+
+    started = asyncio.Event()
+
+    async def hanging_council(user_query, **kwargs):
+        started.set()
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(batch, "run_full_council", hanging_council)
+    input_path = tmp_path / "prompts.jsonl"
+    _write_prompts(input_path, [{"id": "a", "prompt": "one"}])
+
+    job = await batch.start_batch_job(str(input_path), str(tmp_path / "results.jsonl"))
+    await started.wait()
+    task = batch._batch_tasks[job["id"]]
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert batch.get_batch_job(job["id"])["status"] == "cancelled"
@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+from backend import bench_imports
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      4000 |      30000 |   fastapi
+import time:      2500 |      45000 | backend.main
+"""
+
+
+def test_parse_importtime_reads_self_and_cumulative():
+    modules = bench_imports.parse_importtime(SAMPLE)
+    assert set(modules) == {"_io", "fastapi", "backend.main"}
+    assert modules["backend.main"] == {"self_us": 2500, "cumulative_us": 45000}
+
+
+def test_check_budget_flags_slow_and_forbidden_modules():
+    modules = bench_imports.parse_importtime(SAMPLE)
+    assert bench_imports.check_budget(modules, {"max_cumulative_ms": {"backend.main": 50}}) == []
+
+    violations = bench_imports.check_budget(
+        modules, {"max_cumulative_ms": {"backend.main": 40, "missing": 1}, "forbidden": ["fastapi", "httpx"]}
+    )
+    assert len(violations) == 2
+    assert violations[0].startswith("backend.main: 45.0 ms")
+    assert "fastapi" in violations[1]
+    assert "within budget" not in bench_imports.format_report(modules, {"max_cumulative_ms": {"backend.main": 40}})
+
+
+def test_importing_backend_main_leaves_lazy_modules_unloaded():
+    budget = bench_imports.load_budget()
+    code = "import sys, backend.main; print(','.join(m for m in %r if m in sys.modules))" % (budget["forbidden"],)
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=bench_imports.REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
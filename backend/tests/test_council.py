@@ -15,7 +15,7 @@ async def test_stage1_collect_responses_filters_none(monkeypatch):
 
 @pytest.mark.asyncio
 async def test_stage2_collect_rankings_parses(monkeypatch):
-    async def fake_query(models, messages, timeout=120.0):
+    async def fake_query(models, messages, timeout=120.0, response_format=None):
         # Ranking prompt includes "FINAL RANKING:" so we can ignore messages content
         return {models[0]: {"content": "Analysis\nFINAL RANKING:\n1. Response A\n2. Response B"}}
 
@@ -45,7 +45,7 @@ async def test_stage3_synthesize_final_fallback(monkeypatch):
 
 @pytest.mark.asyncio
 async def test_run_full_council_happy_path(monkeypatch):
-    async def fake_query_models(models, messages, timeout=120.0):
+    async def fake_query_models(models, messages, timeout=120.0, response_format=None):
         if "FINAL RANKING:" in messages[0]["content"]:
             return {models[0]: {"content": "Rank\nFINAL RANKING:\n1. Response A\n2. Response B"}}
         return {model: {"content": f"resp-{model}"} for model in models}
@@ -66,7 +66,7 @@ async def test_run_full_council_happy_path(monkeypatch):
 
 @pytest.mark.asyncio
 async def test_run_full_council_handles_no_stage1(monkeypatch):
-    async def empty_stage1(user_query, council_models=None):
+    async def empty_stage1(user_query, council_models=None, history=None):
         return []
 
     monkeypatch.setattr(council, "stage1_collect_responses", empty_stage1)
@@ -76,3 +76,185 @@ async def test_run_full_council_handles_no_stage1(monkeypatch):
     assert stage1 == []
     assert stage2 == []
     assert stage3["model"] == "error"
+
+
+def test_build_review_assignments_is_balanced():
+    reviewers = ["r1", "r2", "r3", "r4", "r5"]
+    labels = [f"Response {c}" for c in "ABCDE"]
+
+    assignments = council.build_review_assignments(reviewers, labels, 3, seed=7)
+
+    counts = {label: 0 for label in labels}
+    for assigned in assignments.values():
+        assert len(assigned) == 3
+        assert len(set(assigned)) == 3
+        for label in assigned:
+            counts[label] += 1
+    assert set(counts.values()) == {3}
+
+
+@pytest.mark.asyncio
+async def test_stage2_sparse_review_sends_subsets(monkeypatch):
+    sent = {}
+
+    async def fake_query(model_messages, timeout=120.0, response_format=None):
+        sent.update(model_messages)
+        return {
+            model: {"content": "FINAL RANKING:\n1. Response D\n2. Response B\n3. Response A"}
+            for model in model_messages
+        }
+
+    monkeypatch.setattr(council, "query_models_with_messages", fake_query)
+
+    stage1_results = [{"model": f"m{i}", "response": f"answer-{i}"} for i in range(4)]
+    rankings, label_map = await council.stage2_collect_rankings(
+        "q", stage1_results, ["j1", "j2", "j3", "j4"], review_size=2, review_seed=1
+    )
+
+    assert list(label_map) == ["Response A", "Response B", "Response C", "Response D"]
+    for result in rankings:
+        reviewed = result["reviewed_labels"]
+        assert len(reviewed) == 2
+        prompt = sent[result["model"]][0]["content"]
+        for label in label_map:
+            assert (f"{label}:\n" in prompt) == (label in reviewed)
+
+
+def test_calculate_aggregate_rankings_rescales_partial_rankings():
+    label_to_model = {f"Response {c}": f"m{c}" for c in "ABCD"}
+    stage2 = [
+        {"model": "j1", "ranking": "", "parsed_ranking": ["Response A", "Response B"],
+         "reviewed_labels": ["Response A", "Response B"]},
+        # Labels outside the reviewed subset are ignored
+        {"model": "j2", "ranking": "", "parsed_ranking": ["Response C", "Response A", "Response D"],
+         "reviewed_labels": ["Response C", "Response D"]},
+    ]
+
+    aggregate = council.calculate_aggregate_rankings(stage2, label_to_model)
+    by_model = {row["model"]: row["average_rank"] for row in aggregate}
+
+    assert by_model == {"mA": 1.0, "mB": 4.0, "mC": 1.0, "mD": 4.0}
+
+
+@pytest.mark.asyncio
+async def test_stage2_structured_rankings_validate_and_fall_back(monkeypatch):
+    seen_formats = []
+
+    async def fake_query(models, messages, timeout=120.0, response_format=None):
+        seen_formats.append(response_format)
+        return {
+            "good": {"content": '{"ranking": ["Response B", "Response A"], "scores": {"Response A": 4, "Response B": 9}}'},
+            "bad": {"content": 'Sorry, prose.\nFINAL RANKING:\n1. Response A\n2. Response B'},
+        }
+
+    monkeypatch.setattr(council, "query_models_parallel", fake_query)
+    monkeypatch.setattr(council, "_ranking_parse_stats", {})
+
+    stage1_results = [
+        {"model": "alpha", "response": "A"},
+        {"model": "beta", "response": "B"},
+    ]
+    rankings, _ = await council.stage2_collect_rankings(
+        "hi", stage1_results, ["good", "bad"], structured=True
+    )
+    by_model = {r["model"]: r for r in rankings}
+
+    assert seen_formats == [council.RANKING_RESPONSE_FORMAT]
+    assert by_model["good"]["parse_mode"] == "structured"
+    assert by_model["good"]["parsed_ranking"] == ["Response B", "Response A"]
+    assert by_model["good"]["scores"]["Response B"] == 9
+    assert council.parse_ranking_from_text(by_model["good"]["ranking"]) == ["Response B", "Response A"]
+    assert by_model["bad"]["parse_mode"] == "fallback"
+    assert by_model["bad"]["parsed_ranking"] == ["Response A", "Response B"]
+
+    stats = council.get_ranking_parse_stats()
+    assert stats["good"]["structured_rate"] == 1.0
+    assert stats["bad"]["structured_rate"] == 0.0
+    assert stats["bad"]["success_rate"] == 1.0
+
+
+def test_validate_structured_ranking_rejects_invalid_output():
+    labels = ["Response A", "Response B"]
+
+    assert council.validate_structured_ranking('```json\n{"ranking": ["Response A", "Response B"], "scores": {}}\n```', labels)
+    assert council.validate_structured_ranking('{"ranking": ["Response A"], "scores": {}}', labels) is None
+    assert council.validate_structured_ranking('{"ranking": ["Response A", "Response A"], "scores": {}}', labels) is None
+    assert council.validate_structured_ranking('{"ranking": ["Response A", "Response B"], "scores": {"Response A": 11}}', labels) is None
+    assert council.validate_structured_ranking('{"ranking": ["Response A", "Response B"], "scores": {"Response A": 0}}', labels) is None
+    assert council.validate_structured_ranking('{"ranking": ["Response A", "Response B"], "scores": {"Response A": 1}}', labels)
+    assert council.validate_structured_ranking('not json', labels) is None
+
+
+def test_render_structured_ranking_uses_the_score_bound(monkeypatch):
+    ranking = {"ranking": ["Response B", "Response A"], "scores": {"Response B": 7}}
+    assert council.render_structured_ranking(ranking) == (
+        "Response B: 7/10\n\nFINAL RANKING:\n1. Response B\n2. Response A"
+    )
+    monkeypatch.setattr(council, "MAX_SCORE", 5)
+    assert council.render_structured_ranking({"ranking": ["Response A"], "scores": {"Response A": 4}}).startswith(
+        "Response A: 4/5\n"
+    )
+    # Without scores the text starts with the ranking itself
+    assert council.render_structured_ranking({"ranking": ["Response A"], "scores": {}}) == (
+        "FINAL RANKING:\n1. Response A"
+    )
+
+
+@pytest.mark.asyncio
+async def test_generate_conversation_title_caches_and_uses_title_model(monkeypatch):
+    calls = []
+
+    async def fake_query_model(model, messages, timeout=120.0):
+        calls.append(model)
+        return {"content": '"Rust Borrow Checker"'}
+
+    monkeypatch.setattr(council, "query_model", fake_query_model)
+    council.clear_title_cache()
+
+    first = await council.generate_conversation_title("Explain the  Rust borrow checker", title_model="cheap/model")
+    second = await council.generate_conversation_title("explain the rust borrow checker", title_model="cheap/model")
+
+    assert first == second == "Rust Borrow Checker"
+    assert calls == ["cheap/model"]
+    council.clear_title_cache()
+
+
+@pytest.mark.asyncio
+async def test_generate_conversation_title_falls_back_to_heuristic(monkeypatch):
+    import asyncio
+
+    async def slow_query_model(model, messages, timeout=120.0):
+        await asyncio.sleep(1)
+        return {"content": "Too Late"}
+
+    monkeypatch.setattr(council, "query_model", slow_query_model)
+    council.clear_title_cache()
+
+    title = await council.generate_conversation_title(
+        "how do I tune postgres autovacuum for large tables?", title_model="slow/model", deadline=0.01
+    )
+    assert title == "How do I tune postgres"
+    # Heuristic titles are not cached, so the model gets another chance next time
+    assert council._title_cache == {}
+
+
+@pytest.mark.asyncio
+async def test_stage_iterators_yield_members_as_they_complete(monkeypatch):
+    async def fake_iter(model_messages, timeout=120.0, response_format=None):
+        for model in reversed(list(model_messages)):
+            if "FINAL RANKING:" in model_messages[model][0]["content"]:
+                yield model, {"content": "FINAL RANKING:\n1. Response B\n2. Response A"}
+            else:
+                yield model, None if model == "broken" else {"content": f"resp-{model}"}
+
+    monkeypatch.setattr(council, "iter_models_with_messages", fake_iter)
+    monkeypatch.setattr(council, "_ranking_parse_stats", {})
+
+    stage1 = [r async for r in council.iter_stage1_responses("q", ["alpha", "broken", "beta"])]
+    assert stage1 == [{"model": "beta", "response": "resp-beta"}, {"model": "alpha", "response": "resp-alpha"}]
+
+    stage2 = [r async for r in council.iter_stage2_rankings("q", stage1, ["alpha", "beta"])]
+    assert [r["model"] for r in stage2] == ["beta", "alpha"]
+    assert stage2[0]["parsed_ranking"] == ["Response B", "Response A"]
+    label_to_model, _ = council.anonymize_responses(stage1)
+    assert label_to_model == {"Response A": "beta", "Response B": "alpha"}
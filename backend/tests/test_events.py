@@ -0,0 +1,74 @@
+import gzip
+import zlib
+
+import pytest
+
+from backend import events
+
+
+def test_compact_event_round_trip():
+    event = {
+        "type": "stage2_complete",
+        "data": [{"model": "m1", "ranking": "text", "parsed_ranking": ["Response A"]}],
+        "metadata": {"label_to_model": {"Response A": "m1"}},
+    }
+    compact = events.compact_event(event)
+    assert compact["t"] == "stage2_complete"
+    assert compact["d"][0] == {"o": "m1", "k": "text", "p": ["Response A"]}
+    # Nested metadata keeps its own keys
+    assert compact["m"] == {"label_to_model": {"Response A": "m1"}}
+    assert events.expand_event(compact) == event
+
+    frame = events.format_event(event, compact=True)
+    assert frame.startswith("data: ") and frame.endswith("\n\n")
+    assert events.decode_frames([frame]) == [event]
+
+
+def test_dumps_emits_the_same_text_with_or_without_orjson(monkeypatch):
+    obj = {"type": "stage1_complete", "data": [{"model": "m1", "response": "héllo"}]}
+    expected = '{"type":"stage1_complete","data":[{"model":"m1","response":"héllo"}]}'
+    assert events.dumps(obj) == expected
+    monkeypatch.setattr(events, "orjson", None)
+    assert events.dumps(obj) == expected
+
+
+def test_accept_negotiation():
+    assert events.wants_compact("text/event-stream; encoding=compact")
+    assert events.wants_compact("application/json, text/event-stream;encoding=\"compact\"")
+    assert not events.wants_compact("text/event-stream")
+    assert not events.wants_compact(None)
+
+    assert events.choose_content_encoding("gzip, deflate") == "gzip"
+    assert events.choose_content_encoding("gzip;q=0, deflate") is None
+    assert events.choose_content_encoding(None) is None
+
+
+def test_gzip_stream_flushes_each_event():
+    compressor = events.StreamCompressor("gzip")
+    decompressor = zlib.decompressobj(31)
+    for i in range(3):
+        frame = events.format_event({"type": "stage1_complete", "data": [{"response": "x" * 100, "n": i}]})
+        chunk = compressor.compress(frame.encode("utf-8"))
+        # Every chunk is decodable on its own arrival, nothing is buffered
+        assert decompressor.decompress(chunk).decode("utf-8") == frame
+    tail = compressor.finish()
+    assert decompressor.decompress(tail) == b""
+
+
+@pytest.mark.asyncio
+async def test_compress_stream_produces_valid_gzip():
+    async def frames():
+        yield events.format_event({"type": "stage1_start"})
+        yield events.format_event({"type": "complete"})
+
+    body = b"".join([chunk async for chunk in events.compress_stream(frames(), "gzip")])
+    assert gzip.decompress(body).decode("utf-8").count("data: ") == 2
+
+
+def test_bench_payload_reports_each_encoding():
+    from backend import bench_events
+
+    rows = bench_events.bench_payload(200, models=2, repeat=1)
+    assert [row["encoding"] for row in rows] == ["plain", "compact"]
+    assert all(row["gzip_bytes"] < row["bytes"] for row in rows)
+    assert "serializer" in bench_events.format_report(rows)
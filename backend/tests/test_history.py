@@ -0,0 +1,77 @@
+import pytest
+
+from backend import history
+
+
+def _conversation(turns, summary=None):
+    messages = []
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"q{i}"})
+        messages.append({"role": "assistant", "stage1": [], "stage2": [], "stage3": {"model": "c", "response": f"a{i}"}})
+    convo = {"id": "c1", "messages": messages}
+    if summary:
+        convo["context_summary"] = summary
+    return convo
+
+
+def test_last_n_keeps_most_recent_turns():
+    messages = history.build_history_messages(_conversation(5), "last_n", max_turns=2)
+    assert [m["content"] for m in messages] == ["q3", "a3", "q4", "a4"]
+    assert history.build_history_messages(_conversation(5), "none") == []
+
+
+def test_token_budget_drops_oldest_turns_first():
+    convo = _conversation(3)
+    convo["messages"][4]["content"] = "x" * 400  # q2 is ~100 tokens
+
+    messages = history.build_history_messages(convo, "token_budget", token_budget=103)
+    assert [m["content"] for m in messages] == ["x" * 400, "a2"]
+
+
+def test_summary_strategy_uses_cached_summary_and_uncovered_tail():
+    convo = _conversation(4, summary={"text": "earlier stuff", "turns": 3})
+
+    messages = history.build_history_messages(convo, "summary", max_turns=3)
+
+    assert messages[0]["role"] == "system"
+    assert "earlier stuff" in messages[0]["content"]
+    assert [m["content"] for m in messages[1:]] == ["q3", "a3"]
+
+
+def test_unknown_strategy_raises():
+    with pytest.raises(ValueError):
+        history.build_history_messages(_conversation(1), "everything")
+
+
+@pytest.mark.asyncio
+async def test_update_rolling_summary_only_sends_new_turns(monkeypatch):
+    prompts = []
+
+    async def fake_query_model(model, messages, timeout=120.0, client=None):
+        prompts.append(messages[0]["content"])
+        return {"content": " new summary "}
+
+    monkeypatch.setattr(history, "query_model", fake_query_model)
+
+    convo = _conversation(3, summary={"text": "old summary", "turns": 2})
+    summary = await history.update_rolling_summary(convo, "chair")
+
+    assert summary == {"text": "new summary", "turns": 3}
+    assert "old summary" in prompts[0]
+    assert "q2" in prompts[0] and "q1" not in prompts[0]
+
+    convo["context_summary"] = summary
+    assert await history.update_rolling_summary(convo, "chair") is None
+
+
+def test_cancelled_turns_are_left_out_of_history():
+    messages = [
+        {"role": "user", "content": "q1"},
+        {"role": "assistant", "stage3": {"response": "a1"}},
+        {"role": "user", "content": "q2"},
+        {"role": "assistant", "stage3": None, "metadata": {"cancelled": {"stage": "stage1"}}},
+        {"role": "user", "content": "q3"},
+        # Cancelled while the title was pending: the answer still counts
+        {"role": "assistant", "stage3": {"response": "a3"}, "metadata": {"cancelled": {"stage": "title"}}},
+    ]
+    assert history.conversation_turns(messages) == [("q1", "a1"), ("q3", "a3")]
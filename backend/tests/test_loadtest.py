@@ -0,0 +1,44 @@
+import httpx
+import pytest
+
+from backend import loadtest
+
+
+def _transport(fail_every: int = 0):
+    counter = {"streams": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/conversations":
+            return httpx.Response(200, json={"id": "c1"})
+        counter["streams"] += 1
+        if fail_every and counter["streams"] % fail_every == 0:
+            body = 'data: {"type": "stage1_start"}\n\ndata: {"type": "error", "message": "boom"}\n\n'
+        else:
+            body = "".join(
+                f'data: {{"type": "{t}"}}\n\n'
+                for t in ("stage1_start", "stage1_complete", "stage2_complete", "stage3_complete", "complete")
+            )
+        return httpx.Response(200, text=body)
+
+    return httpx.MockTransport(handler)
+
+
+def test_percentile_interpolates():
+    values = [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert loadtest.percentile(values, 50) == 3.0
+    assert loadtest.percentile(values, 95) == pytest.approx(4.8)
+    assert loadtest.percentile([], 50) is None
+
+
+@pytest.mark.asyncio
+async def test_run_load_reports_stage_percentiles_and_errors():
+    async with httpx.AsyncClient(transport=_transport(fail_every=4)) as client:
+        report = await loadtest.run_load("http://test", users=4, turns=2, client=client)
+
+    assert report["requests"] == 8
+    assert report["failed"] == 2
+    assert report["error_rate"] == 0.25
+    assert report["errors"] == {"boom": 2}
+    assert report["stages"]["stage1"]["count"] == 6
+    assert report["stages"]["total"]["p99"] is not None
+    assert "stage2" in loadtest.format_report(report)
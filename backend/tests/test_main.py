@@ -1,12 +1,13 @@
 import json
 import tempfile
+import time
 from importlib import reload
 from types import SimpleNamespace
 
 import pytest
 from fastapi.testclient import TestClient
 
-from backend import config, main, settings, storage
+from backend import batch, config, history, main, settings, shared, storage
 
 
 @pytest.fixture
@@ -35,7 +36,7 @@ def client(tmp_path, monkeypatch):
 
 @pytest.fixture(autouse=True)
 def stub_council(monkeypatch):
-    async def fake_run_full_council(user_query: str):
+    async def fake_run_full_council(user_query: str, **kwargs):
         return (
             [{"model": "m1", "response": "r1"}],
             [{"model": "m1", "ranking": "FINAL RANKING:\n1. Response A", "parsed_ranking": ["Response A"]}],
@@ -46,19 +47,19 @@ def stub_council(monkeypatch):
     async def fake_title(content: str):
         return "Test Title"
 
-    async def fake_stage1(content: str, council_models=None):
-        return [{"model": "m1", "response": "r1"}]
+    async def fake_stage1(content: str, council_models=None, **kwargs):
+        yield {"model": "m1", "response": "r1"}
 
-    async def fake_stage2(content: str, stage1_results, council_models=None):
-        return [{"model": "m1", "ranking": "FINAL RANKING:\n1. Response A", "parsed_ranking": ["Response A"]}], {"Response A": "m1"}
+    async def fake_stage2(content: str, stage1_results, council_models=None, **kwargs):
+        yield {"model": "m1", "ranking": "FINAL RANKING:\n1. Response A", "parsed_ranking": ["Response A"]}
 
-    async def fake_stage3(content: str, stage1_results, stage2_results, chairman_model=None):
+    async def fake_stage3(content: str, stage1_results, stage2_results, chairman_model=None, **kwargs):
         return {"model": chairman_model or "chair", "response": "final"}
 
     monkeypatch.setattr(main, "run_full_council", fake_run_full_council)
     monkeypatch.setattr(main, "generate_conversation_title", fake_title)
-    monkeypatch.setattr(main, "stage1_collect_responses", fake_stage1)
-    monkeypatch.setattr(main, "stage2_collect_rankings", fake_stage2)
+    monkeypatch.setattr(main, "iter_stage1_responses", fake_stage1)
+    monkeypatch.setattr(main, "iter_stage2_rankings", fake_stage2)
     monkeypatch.setattr(main, "stage3_synthesize_final", fake_stage3)
     return
 
@@ -101,12 +102,60 @@ def test_send_message_flow(client):
     assert body["stage3"]["response"] == "final"
 
 
+@pytest.mark.asyncio
+async def test_send_message_records_title_with_the_turn_and_cancels_it_on_failure(client, monkeypatch):
+    import asyncio
+
+    seen = {}
+    title_cancelled = []
+
+    async def recording_title(content: str):
+        seen["title_turn"] = main.metrics.current_turn()
+        return "Title"
+
+    async def council_with_recorder(user_query, recorder=None, **kwargs):
+        await asyncio.sleep(0)
+        seen["council_turn"] = recorder
+        return [], [], {"model": "chair", "response": "final"}, {"metrics": recorder.summary()}
+
+    monkeypatch.setattr(main, "generate_conversation_title", recording_title)
+    monkeypatch.setattr(main, "run_full_council", council_with_recorder)
+    conv_id = storage.create_conversation("title-turn")["id"]
+    await main.send_message(conv_id, main.SendMessageRequest(content="Hi"), main.BackgroundTasks())
+    assert seen["title_turn"] is seen["council_turn"] is not None
+
+    async def slow_title(content: str):
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            title_cancelled.append(True)
+            raise
+
+    async def failing_council(user_query, **kwargs):
+        await asyncio.sleep(0)  # let the title call start
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(main, "generate_conversation_title", slow_title)
+    monkeypatch.setattr(main, "run_full_council", failing_council)
+    conv_id = storage.create_conversation("title-leak")["id"]
+    with pytest.raises(RuntimeError):
+        await main.send_message(conv_id, main.SendMessageRequest(content="Hi"), main.BackgroundTasks())
+    assert title_cancelled == [True]
+
+
 def test_send_message_stream_emits_events(client):
     conv = client.post("/api/conversations", json={}).json()
     conv_id = conv["id"]
 
-    with client.stream("POST", f"/api/conversations/{conv_id}/message/stream", json={"content": "Hi"}) as resp:
+    with client.stream(
+        "POST",
+        f"/api/conversations/{conv_id}/message/stream",
+        json={"content": "Hi"},
+        headers={"Accept-Encoding": "gzip"},
+    ) as resp:
         assert resp.status_code == 200
+        # Compression is opt-in (LLM_COUNCIL_SSE_COMPRESSION=1)
+        assert "content-encoding" not in resp.headers
         content = resp.iter_lines()
         events = [line for line in content if line]
 
@@ -114,6 +163,26 @@ def test_send_message_stream_emits_events(client):
     assert any("stage3_complete" in e for e in events)
 
 
+def test_send_message_stream_compact_and_gzip(client, monkeypatch):
+    monkeypatch.setattr(main, "SSE_COMPRESSION", True)
+    conv_id = client.post("/api/conversations", json={}).json()["id"]
+
+    with client.stream(
+        "POST",
+        f"/api/conversations/{conv_id}/message/stream",
+        json={"content": "Hi"},
+        headers={"Accept": "text/event-stream; encoding=compact", "Accept-Encoding": "gzip"},
+    ) as resp:
+        assert resp.headers["content-encoding"] == "gzip"
+        lines = [line for line in resp.iter_lines() if line]
+
+    payloads = [json.loads(line[len("data:"):]) for line in lines]
+    assert payloads[0]["t"] == "run_started"
+    assert payloads[1] == {"t": "stage1_start"}
+    stage1 = next(p for p in payloads if p["t"] == "stage1_complete")
+    assert stage1["d"][0]["r"] == "r1"
+
+
 def test_send_message_requires_api_key(client, monkeypatch):
     class NoKey(SimpleNamespace):
         openrouter_api_key = None
@@ -126,3 +195,373 @@ def test_send_message_requires_api_key(client, monkeypatch):
     resp = client.post(f"/api/conversations/{conv_id}/message", json={"content": "Hello"})
     assert resp.status_code == 400
     assert "API key" in resp.json()["detail"]
+
+
+def test_send_message_passes_history_and_refreshes_summary(client, monkeypatch):
+    captured = {}
+
+    async def capture_council(user_query, **kwargs):
+        captured["history"] = kwargs.get("history")
+        return [], [], {"model": "chair", "response": "answer"}, {}
+
+    async def fake_summary(conversation, model):
+        return {"text": "summary", "turns": 1}
+
+    monkeypatch.setattr(main, "run_full_council", capture_council)
+    monkeypatch.setattr(history, "update_rolling_summary", fake_summary)
+
+    conv_id = client.post("/api/conversations", json={}).json()["id"]
+    client.post(f"/api/conversations/{conv_id}/message", json={"content": "first", "history_strategy": "summary"})
+    assert captured["history"] == []
+
+    client.post(f"/api/conversations/{conv_id}/message", json={"content": "second", "history_strategy": "last_n"})
+    assert captured["history"] == [
+        {"role": "user", "content": "first"},
+        {"role": "assistant", "content": "answer"},
+    ]
+    assert storage.get_conversation(conv_id)["context_summary"] == {"text": "summary", "turns": 1}
+
+
+def test_batch_endpoint_runs_without_storing_conversations(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(batch, "run_full_council", main.run_full_council)
+    batch_dir = tmp_path / "batches"
+    batch_dir.mkdir()
+    monkeypatch.setattr(config, "BATCH_DIR", str(batch_dir))
+    input_path = batch_dir / "prompts.jsonl"
+    output_path = batch_dir / "results.jsonl"
+    input_path.write_text(json.dumps({"id": "p1", "prompt": "Hello"}) + "\n")
+
+    resp = client.post("/api/batch", json={"input_path": "prompts.jsonl", "output_path": str(output_path)})
+    assert resp.status_code == 200
+    batch_id = resp.json()["id"]
+
+    status = client.get(f"/api/batch/{batch_id}").json()
+    for _ in range(50):
+        if status["status"] != "running":
+            break
+        time.sleep(0.01)
+        status = client.get(f"/api/batch/{batch_id}").json()
+
+    assert status["status"] == "complete"
+    assert status["counts"]["completed"] == 1
+    assert json.loads(output_path.read_text())["stage3"]["response"] == "final"
+    assert client.get("/api/conversations").json() == []
+
+    missing = client.post("/api/batch", json={"input_path": "nope.jsonl", "output_path": "results.jsonl"})
+    assert missing.status_code == 400
+
+    # Files outside the batch directory are off limits
+    outside = tmp_path / "secret.jsonl"
+    outside.write_text(json.dumps({"id": "s", "prompt": "x"}) + "\n")
+    for paths in (
+        {"input_path": str(outside), "output_path": "results.jsonl"},
+        {"input_path": "prompts.jsonl", "output_path": "../secret.jsonl"},
+    ):
+        resp = client.post("/api/batch", json=paths)
+        assert resp.status_code == 400
+        assert "inside" in resp.json()["detail"]
+
+
+def test_metrics_endpoint_and_stream_metadata(client):
+    conv_id = client.post("/api/conversations", json={}).json()["id"]
+    with client.stream("POST", f"/api/conversations/{conv_id}/message/stream", json={"content": "Hi"}) as resp:
+        list(resp.iter_lines())
+
+    stored = storage.get_conversation(conv_id)["messages"][-1]["metadata"]
+    assert set(stored["metrics"]) >= {"stage1", "stage2", "stage3", "title"}
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert 'llm_council_stage_duration_seconds_count{stage="stage1"}' in resp.text
+
+
+def test_get_conversation_summary_fields_and_stage_endpoint(client):
+    conv_id = client.post("/api/conversations", json={}).json()["id"]
+    for text in ("first", "second"):
+        storage.add_user_message(conv_id, text)
+        storage.add_assistant_message(
+            conv_id,
+            [{"model": "m1", "response": f"{text} stage1"}],
+            [{"model": "m1", "ranking": "FINAL RANKING:\n1. Response A"}],
+            {"model": "chair", "response": f"{text} final"},
+            {"label_to_model": {"Response A": "m1"}},
+        )
+
+    full = client.get(f"/api/conversations/{conv_id}").json()
+    assert full["messages"][1]["stage1"][0]["response"] == "first stage1"
+
+    sparse = client.get(f"/api/conversations/{conv_id}", params={"fields": "summary", "expand": "last"}).json()
+    first, last = sparse["messages"][1], sparse["messages"][3]
+    assert first["stages_omitted"] is True
+    assert "stage1" not in first and first["stage3"]["response"] == "first final"
+    assert last["stage1"][0]["response"] == "second stage1"
+    assert sparse["messages"][0] == {"role": "user", "content": "first"}
+
+    stages = client.get(f"/api/conversations/{conv_id}/messages/1/stages").json()
+    assert stages["stage1"][0]["response"] == "first stage1"
+    assert stages["metadata"]["label_to_model"] == {"Response A": "m1"}
+
+    assert client.get(f"/api/conversations/{conv_id}/messages/0/stages").status_code == 404
+    assert client.get(f"/api/conversations/{conv_id}/messages/9/stages").status_code == 404
+    assert client.get(f"/api/conversations/{conv_id}", params={"fields": "summary", "expand": "x"}).status_code == 422
+
+
+def test_conversation_etags_and_conditional_get(client):
+    conv_id = client.post("/api/conversations", json={}).json()["id"]
+
+    listing = client.get("/api/conversations")
+    list_etag = listing.headers["etag"]
+    assert client.get("/api/conversations", headers={"If-None-Match": list_etag}).status_code == 304
+
+    first = client.get(f"/api/conversations/{conv_id}")
+    etag = first.headers["etag"]
+    not_modified = client.get(f"/api/conversations/{conv_id}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    assert not_modified.content == b""
+
+    # Different representation, different tag
+    summary = client.get(f"/api/conversations/{conv_id}", params={"fields": "summary"})
+    assert summary.headers["etag"] != etag
+
+    storage.update_conversation_title(conv_id, "Renamed")
+    changed = client.get(f"/api/conversations/{conv_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["title"] == "Renamed"
+    assert client.get("/api/conversations", headers={"If-None-Match": list_etag}).status_code == 200
+
+
+def test_ready_is_503_until_warm_up_has_run(client):
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["warm_up"] == "not_started"
+
+
+def test_ready_after_startup_warm_up(client):
+    with client:  # runs the lifespan, which starts the warm-up
+        for _ in range(100):
+            response = client.get("/ready")
+            if response.status_code == 200:
+                break
+            time.sleep(0.02)
+        body = response.json()
+    assert response.status_code == 200
+    assert body["warm_up"] == "done"
+    assert body["components"] == {"settings": True, "upstream_client": True, "storage": True}
+
+
+def test_cli_runs_workers_by_import_string(monkeypatch):
+    import uvicorn
+
+    calls = []
+    monkeypatch.setattr(uvicorn, "run", lambda app, **kwargs: calls.append((app, kwargs)))
+    # Restored on teardown, whatever main() sets
+    monkeypatch.setenv("LLM_COUNCIL_WORKERS", "1")
+
+    assert main.main(["--port", "9000"]) == 0
+    assert calls[-1] == (main.app, {"host": "0.0.0.0", "port": 9000})
+
+    assert main.main(["--workers", "4"]) == 0
+    assert calls[-1] == ("backend.main:app", {"host": "0.0.0.0", "port": 8001, "workers": 4})
+    # Worker processes read this to pick the SQLite shared state
+    assert main.os.environ["LLM_COUNCIL_WORKERS"] == "4"
+
+
+@pytest.mark.asyncio
+async def test_stream_disconnect_cancels_turn_and_records_it(client, monkeypatch):
+    import asyncio
+
+    stage2_started = asyncio.Event()
+    stage2_cancelled = []
+
+    async def slow_stage2(content, stage1_results, **kwargs):
+        stage2_started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            stage2_cancelled.append(True)
+            raise
+        yield
+
+    monkeypatch.setattr(main, "iter_stage2_rankings", slow_stage2)
+    monkeypatch.setattr(main, "DISCONNECT_POLL_SECONDS", 0.01)
+    lookups = []
+    cancel_request = main._cancel_request
+    monkeypatch.setattr(main, "_cancel_request", lambda run_id: lookups.append(run_id) or cancel_request(run_id))
+    conv_id = storage.create_conversation("disconnect-conv")["id"]
+    state = {"disconnected": False}
+
+    async def is_disconnected():
+        return state["disconnected"]
+
+    http_request = SimpleNamespace(headers={}, is_disconnected=is_disconnected)
+    response = await main.send_message_stream(conv_id, main.SendMessageRequest(content="Hi"), http_request)
+    received = []
+    async for frame in response.body_iterator:
+        received.append(frame)
+        if "stage2_start" in frame:
+            await stage2_started.wait()
+            state["disconnected"] = True
+    # The stream ended without stage 2 results; the turn task winds down
+    assert "stage2_complete" not in "".join(received)
+    while main._runs:
+        await asyncio.sleep(0.01)
+
+    assert stage2_cancelled == [True]
+    # In-process state is not polled for cancel requests, only read once for the reason
+    assert len(lookups) == 1
+    assistant = storage.get_conversation(conv_id)["messages"][-1]
+    assert assistant["stage1"] == [{"model": "m1", "response": "r1"}]
+    assert assistant["stage3"] is None
+    assert assistant["metadata"]["cancelled"]["stage"] == "stage2"
+    assert assistant["metadata"]["cancelled"]["reason"] == "client_disconnected"
+
+
+@pytest.mark.asyncio
+async def test_cancel_during_title_wait_keeps_the_stage3_answer(client, monkeypatch):
+    import asyncio
+
+    title_cancelled = []
+
+    async def slow_title(content: str):
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            title_cancelled.append(True)
+            raise
+
+    monkeypatch.setattr(main, "generate_conversation_title", slow_title)
+    monkeypatch.setattr(main, "DISCONNECT_POLL_SECONDS", 0.01)
+    conv_id = storage.create_conversation("title-conv")["id"]
+    state = {"disconnected": False}
+
+    async def is_disconnected():
+        return state["disconnected"]
+
+    http_request = SimpleNamespace(headers={}, is_disconnected=is_disconnected)
+    response = await main.send_message_stream(conv_id, main.SendMessageRequest(content="Hi"), http_request)
+    async for frame in response.body_iterator:
+        if "stage3_complete" in frame:
+            state["disconnected"] = True
+    while main._runs:
+        await asyncio.sleep(0.01)
+
+    assert title_cancelled == [True]
+    assistant = storage.get_conversation(conv_id)["messages"][-1]
+    assert assistant["stage3"] == {"model": "chair", "response": "final"}
+    assert assistant["metadata"]["cancelled"]["stage"] == "title"
+    assert history.conversation_turns(storage.get_conversation(conv_id)["messages"]) == [("Hi", "final")]
+
+
+@pytest.mark.asyncio
+async def test_cancel_endpoint_stops_run_and_emits_cancelled_event(client, monkeypatch):
+    import asyncio
+
+    stage2_cancelled = []
+
+    async def slow_stage2(content, stage1_results, **kwargs):
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            stage2_cancelled.append(True)
+            raise
+        yield
+
+    monkeypatch.setattr(main, "iter_stage2_rankings", slow_stage2)
+    conv_id = storage.create_conversation("cancel-conv")["id"]
+
+    async def is_disconnected():
+        return False
+
+    http_request = SimpleNamespace(headers={}, is_disconnected=is_disconnected)
+    response = await main.send_message_stream(conv_id, main.SendMessageRequest(content="Hi"), http_request)
+    run_id = response.headers["x-run-id"]
+    frames = []
+    async for frame in response.body_iterator:
+        frames.append(json.loads(frame[len("data:"):]))
+        if frames[-1]["type"] == "stage2_start":
+            with pytest.raises(main.HTTPException):
+                await main.cancel_run("other-conv", run_id)
+            accepted = await main.cancel_run(conv_id, run_id, main.CancelRunRequest(keep_partial=True))
+            assert accepted == {"run_id": run_id, "status": "cancelling"}
+
+    assert frames[0] == {"type": "run_started", "data": {"run_id": run_id}}
+    cancelled = frames[-1]
+    assert cancelled["type"] == "cancelled"
+    assert cancelled["data"] == [{"model": "m1", "response": "r1"}]
+    assert cancelled["metadata"]["run_id"] == run_id
+    assert cancelled["metadata"]["reason"] == "user_cancelled"
+    assert cancelled["metadata"]["stage"] == "stage2"
+    assert stage2_cancelled == [True]
+    while main._runs:
+        await asyncio.sleep(0.01)
+    stored = storage.get_conversation(conv_id)["messages"][-1]
+    assert stored["metadata"]["cancelled"]["reason"] == "user_cancelled"
+    assert stored["stage1"] == [{"model": "m1", "response": "r1"}]
+    # Finished runs are forgotten
+    with pytest.raises(main.HTTPException):
+        await main.cancel_run(conv_id, run_id)
+
+
+def test_cancel_run_can_drop_partial_stages_and_rejects_unknown_runs(client, monkeypatch):
+    assert client.post("/api/conversations/c/runs/nope/cancel").status_code == 404
+
+    conv_id = storage.create_conversation("drop-conv")["id"]
+    state = shared.get_state()
+    state.append_event("run-x", {"type": "run_started", "conversation_id": conv_id})
+    try:
+        resp = client.post(f"/api/conversations/{conv_id}/runs/run-x/cancel", json={"keep_partial": False})
+        assert resp.status_code == 202
+        # A run owned by another worker sees the request in the shared buffer
+        assert main._cancel_request("run-x") == {"type": "cancel_requested", "keep_partial": False}
+    finally:
+        state.drop_events("run-x")
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_members_as_they_finish_and_keeps_them_on_cancel(client, monkeypatch):
+    import asyncio
+
+    async def staggered_stage1(content, **kwargs):
+        yield {"model": "fast", "response": "r-fast"}
+        yield {"model": "medium", "response": "r-medium"}
+        await asyncio.sleep(60)
+        yield {"model": "slow", "response": "r-slow"}
+
+    monkeypatch.setattr(main, "iter_stage1_responses", staggered_stage1)
+    conv_id = storage.create_conversation("partial-conv")["id"]
+
+    async def is_disconnected():
+        return False
+
+    http_request = SimpleNamespace(headers={}, is_disconnected=is_disconnected)
+    response = await main.send_message_stream(conv_id, main.SendMessageRequest(content="Hi"), http_request)
+    run_id = response.headers["x-run-id"]
+    frames = []
+    async for frame in response.body_iterator:
+        frames.append(json.loads(frame[len("data:"):]))
+        if frames[-1]["type"] == "stage1_model_complete" and frames[-1]["data"]["model"] == "medium":
+            await main.cancel_run(conv_id, run_id)
+
+    assert [f["type"] for f in frames] == [
+        "run_started", "stage1_start", "stage1_model_complete", "stage1_model_complete", "cancelled"
+    ]
+    assert frames[2]["data"] == {"model": "fast", "response": "r-fast"}
+    assert frames[-1]["metadata"]["stage"] == "stage1"
+    while main._runs:
+        await asyncio.sleep(0.01)
+    stored = storage.get_conversation(conv_id)["messages"][-1]
+    assert [r["model"] for r in stored["stage1"]] == ["fast", "medium"]
+
+
+def test_stream_emits_stage2_member_events_before_stage2_complete(client):
+    conv_id = client.post("/api/conversations", json={}).json()["id"]
+
+    with client.stream("POST", f"/api/conversations/{conv_id}/message/stream", json={"content": "Hi"}) as resp:
+        payloads = [json.loads(line[len("data:"):]) for line in resp.iter_lines() if line]
+
+    types = [p["type"] for p in payloads]
+    assert types.index("stage1_model_complete") < types.index("stage1_complete")
+    assert types.index("stage2_model_complete") < types.index("stage2_complete")
+    stage2_member = payloads[types.index("stage2_model_complete")]
+    assert stage2_member["data"]["parsed_ranking"] == ["Response A"]
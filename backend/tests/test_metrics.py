@@ -0,0 +1,110 @@
+import asyncio
+
+import httpx
+import pytest
+
+from backend import metrics, openrouter
+
+
+def test_histogram_renders_cumulative_buckets():
+    hist = metrics.Histogram("test_seconds", "Test.", ["stage"], buckets=(1.0, 5.0))
+    hist.observe(0.5, stage="a")
+    hist.observe(3.0, stage="a")
+    hist.observe(9.0, stage="a")
+
+    lines = hist.render()
+    assert 'test_seconds_bucket{stage="a",le="1.0"} 1' in lines
+    assert 'test_seconds_bucket{stage="a",le="5.0"} 2' in lines
+    assert 'test_seconds_bucket{stage="a",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{stage="a"} 3' in lines
+    assert hist.count(stage="a") == 3
+
+
+@pytest.mark.asyncio
+async def test_turn_recorder_attributes_parallel_calls_to_stage():
+    recorder = metrics.start_turn()
+
+    async def fake_call(model):
+        await asyncio.sleep(0)
+        metrics.record_call({"model": model, "ok": True, "total": 0.2, "prompt_tokens": 10, "completion_tokens": 5, "cost": 0.001})
+
+    with metrics.stage("stage1"):
+        await asyncio.gather(fake_call("m1"), fake_call("m2"))
+    metrics.record_call({"model": "m3", "ok": False})
+
+    summary = recorder.summary()
+    assert len(summary["stage1"]["calls"]) == 2
+    assert summary["stage1"]["prompt_tokens"] == 20
+    assert summary["stage1"]["cost"] == pytest.approx(0.002)
+    assert summary["stage1"]["duration"] is not None
+    assert summary["other"]["calls"][0]["model"] == "m3"
+
+
+@pytest.mark.asyncio
+async def test_query_model_returns_usage_and_call_metrics(monkeypatch):
+    def handler(request):
+        return httpx.Response(200, json={
+            "provider": "Acme",
+            "choices": [{"message": {"content": "hi"}}],
+            "usage": {"prompt_tokens": 7, "completion_tokens": 3, "cost": 0.0004},
+        })
+
+    before = metrics.MODEL_CALLS.value(model="m-usage", outcome="ok")
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        result = await openrouter.query_model("m-usage", [{"role": "user", "content": "x"}], client=client)
+
+    assert result["usage"]["completion_tokens"] == 3
+    assert result["provider"] == "Acme"
+    call = result["metrics"]
+    assert call["ok"] is True and call["prompt_tokens"] == 7 and call["cost"] == 0.0004
+    assert call["total"] is not None
+    assert metrics.MODEL_CALLS.value(model="m-usage", outcome="ok") == before + 1
+    assert "llm_council_model_cost_usd_total" in metrics.render()
+
+
+@pytest.mark.asyncio
+async def test_call_timer_derives_phases_from_trace_events():
+    timer = metrics.CallTimer()
+    for event in (
+        "connection.connect_tcp.started",
+        "connection.connect_tcp.complete",
+        "http11.send_request_headers.started",
+        "http11.receive_response_headers.complete",
+    ):
+        await timer.trace(event, {})
+
+    phases = timer.phases()
+    assert all(phases[name] is not None for name in metrics.CALL_PHASES)
+    assert phases["total"] >= phases["ttfb"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_query_model_records_saved_seconds():
+    metrics.MODEL_CALL_SECONDS.observe(30.0, model="m-cancel", phase="total")
+    started = asyncio.Event()
+
+    async def handler(request):
+        started.set()
+        await asyncio.sleep(60)
+
+    recorder = metrics.start_turn()
+    saved_before = metrics.UPSTREAM_SECONDS_SAVED.value(model="m-cancel")
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        with metrics.stage("stage1"):
+            task = asyncio.create_task(openrouter.query_model("m-cancel", [{"role": "user", "content": "x"}], client=client))
+            await started.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+    call = recorder.summary()["stage1"]["calls"][0]
+    assert call["cancelled"] is True and call["ok"] is False
+    assert 29.0 < call["saved_seconds"] <= 30.0
+    assert metrics.MODEL_CALLS.value(model="m-cancel", outcome="cancelled") == 1
+    assert metrics.UPSTREAM_SECONDS_SAVED.value(model="m-cancel") == pytest.approx(saved_before + call["saved_seconds"])
+    # The partial call does not skew the latency histogram
+    assert metrics.MODEL_CALL_SECONDS.count(model="m-cancel", phase="total") == 1
+
+    record = metrics.record_cancelled_turn(recorder, "stage1", "client_disconnected")
+    assert record == {"stage": "stage1", "reason": "client_disconnected", "upstream_seconds_saved": round(call["saved_seconds"], 3)}
+    assert metrics.CANCELLED_TURNS.value(stage="stage1", reason="client_disconnected") >= 1
@@ -0,0 +1,67 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from backend import council, mock_openrouter
+from backend.mock_openrouter import LatencyProfile, MockConfig, ModelProfile
+
+
+def _client(**profile):
+    config = MockConfig(default=ModelProfile(tokens_per_second=None, **profile))
+    return TestClient(mock_openrouter.create_app(config, seed=3))
+
+
+def _ranking_prompt():
+    return council.build_ranking_prompt("q", [("Response A", "a"), ("Response B", "b"), ("Response C", "c")])
+
+
+def test_non_streaming_completion_is_openai_shaped_and_parseable():
+    client = _client(completion_tokens=5)
+
+    resp = client.post("/chat/completions", json={"model": "m1", "messages": [{"role": "user", "content": _ranking_prompt()}]})
+
+    assert resp.status_code == 200
+    body = resp.json()
+    content = body["choices"][0]["message"]["content"]
+    assert sorted(council.parse_ranking_from_text(content)) == ["Response A", "Response B", "Response C"]
+    assert body["usage"]["completion_tokens"] > 0
+
+
+def test_structured_prompt_gets_valid_json_ranking():
+    client = _client()
+    prompt = council.build_structured_ranking_prompt("q", [("Response A", "a"), ("Response B", "b")])
+
+    resp = client.post("/chat/completions", json={"model": "m1", "messages": [{"role": "user", "content": prompt}]})
+
+    content = resp.json()["choices"][0]["message"]["content"]
+    assert council.validate_structured_ranking(content, ["Response A", "Response B"]) is not None
+
+
+def test_streaming_completion_emits_deltas_and_done():
+    client = _client(completion_tokens=4)
+
+    with client.stream("POST", "/chat/completions", json={"model": "m1", "stream": True, "messages": [{"role": "user", "content": "hi"}]}) as resp:
+        lines = [line for line in resp.iter_lines() if line]
+
+    assert lines[-1] == "data: [DONE]"
+    pieces = [json.loads(line[len("data: "):])["choices"][0]["delta"].get("content", "") for line in lines[:-1]]
+    assert len("".join(pieces).split(" ")) == 4
+
+
+def test_rate_limit_and_error_rates():
+    limited = _client(rate_limit_rate=1.0)
+    resp = limited.post("/chat/completions", json={"model": "m1", "messages": []})
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"] == "1"
+
+    failing = _client(error_rate=1.0)
+    assert failing.post("/chat/completions", json={"model": "m1", "messages": []}).status_code == 500
+
+
+def test_latency_profiles_sample_non_negative_values():
+    import random
+
+    rng = random.Random(0)
+    for distribution in ("fixed", "uniform", "normal", "lognormal"):
+        profile = LatencyProfile(distribution=distribution, mean=0.1, median=0.1, sigma=0.5, min=0.0, max=0.2)
+        assert all(profile.sample(rng) >= 0 for _ in range(20))
@@ -17,30 +17,33 @@ class FakeResponse:
 class FakeClient:
     instances = []
 
-    def __init__(self, timeout=None):
+    def __init__(self, timeout=None, limits=None):
         self.timeout = timeout
         self.calls = []
+        self.is_closed = False
         FakeClient.instances.append(self)
 
+    async def aclose(self):
+        self.is_closed = True
+
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
         return False
 
-    async def post(self, url, headers=None, json=None):
+    async def post(self, url, headers=None, json=None, timeout=None, extensions=None):
         self.calls.append((url, headers, json))
         return FakeResponse()
 
 
 class FakeClientFail(FakeClient):
-    async def post(self, url, headers=None, json=None):
+    async def post(self, url, headers=None, json=None, timeout=None, extensions=None):
         raise RuntimeError("boom")
 
 
-def test_query_models_parallel_reuses_single_client():
-    original_client = openrouter.httpx.AsyncClient
-    openrouter.httpx.AsyncClient = FakeClient
+def test_query_models_parallel_reuses_single_client(monkeypatch):
+    monkeypatch.setattr("httpx.AsyncClient", FakeClient)
     try:
         results = asyncio.run(
             openrouter.query_models_parallel(
@@ -54,7 +57,6 @@ def test_query_models_parallel_reuses_single_client():
         # Each post should be recorded
         assert len(FakeClient.instances[0].calls) == 2
     finally:
-        openrouter.httpx.AsyncClient = original_client
         FakeClient.instances.clear()
 
 
@@ -74,28 +76,97 @@ def test_query_model_uses_provided_client():
     assert len(client.calls) == 1
 
 
-def test_query_model_uses_internal_client_and_handles_errors():
-    original_client = openrouter.httpx.AsyncClient
-    try:
-        openrouter.httpx.AsyncClient = FakeClient
-        result = asyncio.run(
-            openrouter.query_model(
-                "model-int",
-                [{"role": "user", "content": "test"}],
-                timeout=5.0,
-            )
+def test_query_model_uses_internal_client_and_handles_errors(monkeypatch):
+    monkeypatch.setattr("httpx.AsyncClient", FakeClient)
+    result = asyncio.run(
+        openrouter.query_model(
+            "model-int",
+            [{"role": "user", "content": "test"}],
+            timeout=5.0,
         )
-        assert result["content"] == "ok"
-
-        # Now force an error path
-        openrouter.httpx.AsyncClient = FakeClientFail
-        result_fail = asyncio.run(
-            openrouter.query_model(
-                "model-int",
-                [{"role": "user", "content": "test"}],
-                timeout=5.0,
+    )
+    assert result["content"] == "ok"
+
+    # Now force an error path
+    monkeypatch.setattr("httpx.AsyncClient", FakeClientFail)
+    result_fail = asyncio.run(
+        openrouter.query_model(
+            "model-int",
+            [{"role": "user", "content": "test"}],
+            timeout=5.0,
+        )
+    )
+    assert result_fail is None
+
+
+def test_shared_client_and_limiter_are_reused_within_a_loop(monkeypatch):
+    original_limit = openrouter.config.UPSTREAM_MAX_CONCURRENT_REQUESTS
+    monkeypatch.setattr("httpx.AsyncClient", FakeClient)
+    openrouter.config.UPSTREAM_MAX_CONCURRENT_REQUESTS = 2
+    in_flight = {"now": 0, "peak": 0}
+    FakeClient.instances.clear()
+
+    class SlowClient(FakeClient):
+        async def post(self, url, headers=None, json=None, timeout=None, extensions=None):
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            return FakeResponse()
+
+    async def run():
+        first = openrouter.get_shared_client()
+        await openrouter.query_model("title-model", [{"role": "user", "content": "t"}])
+        results = await openrouter.query_models_parallel(
+            ["a", "b", "c", "d", "e"], [{"role": "user", "content": "hi"}]
+        )
+        assert openrouter.get_shared_client() is first
+        await openrouter.close_shared_client()
+        assert first.is_closed
+        return results
+
+    try:
+        asyncio.run(run())
+        assert len(FakeClient.instances) == 1
+        assert len(FakeClient.instances[0].calls) == 6
+
+        monkeypatch.setattr("httpx.AsyncClient", SlowClient)
+        asyncio.run(
+            openrouter.query_models_parallel(
+                ["a", "b", "c", "d", "e"], [{"role": "user", "content": "hi"}]
             )
         )
-        assert result_fail is None
+        assert in_flight["peak"] == 2
     finally:
-        openrouter.httpx.AsyncClient = original_client
+        openrouter.config.UPSTREAM_MAX_CONCURRENT_REQUESTS = original_limit
+        FakeClient.instances.clear()
+
+
+def test_iter_models_with_messages_yields_in_completion_order_and_cancels_the_rest(monkeypatch):
+    delays = {"slow": 0.2, "fast": 0.0, "never": 60.0}
+    cancelled = []
+
+    async def fake_query_model(model, messages, timeout=120.0, client=None, response_format=None):
+        try:
+            await asyncio.sleep(delays[model])
+        except asyncio.CancelledError:
+            cancelled.append(model)
+            raise
+        return None if model == "slow" else {"content": model}
+
+    monkeypatch.setattr(openrouter, "query_model", fake_query_model)
+    monkeypatch.setattr(openrouter, "get_shared_client", lambda: None)
+
+    async def run():
+        seen = []
+        results = openrouter.iter_models_with_messages({model: [] for model in delays})
+        async for model, response in results:
+            seen.append((model, response))
+            if len(seen) == 2:
+                break
+        await results.aclose()
+        return seen
+
+    assert asyncio.run(run()) == [("fast", {"content": "fast"}), ("slow", None)]
+    # Closing early cancels (and waits for) the call still in flight
+    assert cancelled == ["never"]
@@ -88,7 +88,7 @@ async def test_test_connection_success_with_fake_client(monkeypatch):
             self.calls.append((url, headers))
             return FakeResponse()
 
-    monkeypatch.setattr(settings.httpx, "AsyncClient", FakeClient)
+    monkeypatch.setattr("httpx.AsyncClient", FakeClient)
 
     creds = settings.OpenRouterCredentials(api_key="key-123", api_url="https://example.com/chat/completions")
     result = await settings.test_openrouter_connection(creds)
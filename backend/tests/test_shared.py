@@ -0,0 +1,137 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from backend import config, shared, storage
+
+
+@pytest.fixture(params=["local", "sqlite"])
+def state(request, tmp_path):
+    if request.param == "local":
+        state = shared.LocalState()
+    else:
+        state = shared.SQLiteState(str(tmp_path / "shared.sqlite3"))
+    yield state
+    state.close()
+
+
+def test_adapters_must_implement_the_whole_contract():
+    class Partial(shared.SharedState):
+        def incr(self, key, amount=1):
+            return amount
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+@pytest.mark.asyncio
+async def test_call_runs_cross_process_adapters_off_the_event_loop(state):
+    import threading
+
+    original = shared.get_state()
+    shared.set_state(state)
+    try:
+        thread = await shared.call(threading.get_ident)
+    finally:
+        shared.set_state(original)
+    assert (thread != threading.get_ident()) == state.cross_process
+
+
+def test_counters(state):
+    assert state.incr("write_version:a") == 1
+    assert state.incr("write_version:a", 2) == 3
+    state.incr("write_version:ab")
+    state.incr("other")
+    assert state.count("write_version:a") == 3
+    assert state.count("missing") == 0
+    assert state.counters("write_version:") == {"write_version:a": 3, "write_version:ab": 1}
+
+
+def test_cache_is_bounded_lru(state):
+    state.cache_set("title", "a", "A", max_entries=2)
+    state.cache_set("title", "b", "B", max_entries=2)
+    assert state.cache_get("title", "a") == "A"  # a is now the most recent
+    state.cache_set("title", "c", "C", max_entries=2)
+    assert state.cache_get("title", "b") is None
+    assert state.cache_get("title", "c") == "C"
+    assert state.cache_get("other", "a") is None
+    state.cache_clear("title")
+    assert state.cache_get("title", "a") is None
+
+
+def test_run_event_buffer(state):
+    assert state.append_event("run-1", {"type": "stage1_start"}) == 1
+    assert state.append_event("run-1", {"type": "stage1_complete", "data": [1]}) == 2
+    state.append_event("run-2", {"type": "stage1_start"})
+    assert state.read_events("run-1") == [(1, {"type": "stage1_start"}), (2, {"type": "stage1_complete", "data": [1]})]
+    assert state.read_events("run-1", after=1) == [(2, {"type": "stage1_complete", "data": [1]})]
+    state.drop_events("run-1")
+    assert state.read_events("run-1") == []
+    assert len(state.read_events("run-2")) == 1
+
+
+def test_lock_is_exclusive_within_a_process(state):
+    import threading
+
+    counter = {"value": 0}
+
+    def work():
+        for _ in range(200):
+            with state.lock("conversation:x"):
+                value = counter["value"]
+                counter["value"] = value + 1
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter["value"] == 800
+
+
+def test_worker_share(monkeypatch):
+    monkeypatch.setattr(config, "WORKERS", 4)
+    assert shared.worker_share(16) == 4
+    assert shared.worker_share(2) == 1
+    monkeypatch.setattr(config, "WORKERS", 1)
+    assert shared.worker_share(16) == 16
+
+
+def test_write_atomic_replaces_without_leftovers(tmp_path):
+    path = str(tmp_path / "conv.json")
+    storage.write_atomic(path, b"old")
+    storage.write_atomic(path, b"new")
+    with open(path, "rb") as f:
+        assert f.read() == b"new"
+    assert os.listdir(tmp_path) == ["conv.json"]
+
+
+@pytest.mark.skipif(shared.fcntl is None, reason="needs POSIX file locks")
+def test_workers_do_not_lose_concurrent_appends(tmp_path):
+    data_dir = tmp_path / "conversations"
+    script = textwrap.dedent(
+        f"""
+        from backend import shared, storage
+        storage.DATA_DIR = {str(data_dir)!r}
+        shared.set_state(shared.SQLiteState({str(tmp_path / "shared.sqlite3")!r}))
+        for i in range(25):
+            storage.add_user_message("conv", "hello")
+        """
+    )
+    storage_dir, original = storage.DATA_DIR, shared.get_state()
+    storage.DATA_DIR = str(data_dir)
+    shared.set_state(shared.SQLiteState(str(tmp_path / "shared.sqlite3")))
+    try:
+        storage.create_conversation("conv")
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        workers = [subprocess.Popen([sys.executable, "-c", script], cwd=root) for _ in range(3)]
+        assert [worker.wait(timeout=60) for worker in workers] == [0, 0, 0]
+        assert len(storage.get_conversation("conv")["messages"]) == 75
+        # Every write bumped the shared version counter
+        assert shared.get_state().count(storage.WRITE_VERSION_PREFIX + "conv") == 76
+    finally:
+        shared.set_state(original)
+        storage.DATA_DIR = storage_dir
@@ -1,6 +1,9 @@
+import os
 import tempfile
 from importlib import reload
 
+import pytest
+
 from backend import storage, config
 
 
@@ -90,3 +93,51 @@ def test_update_title_and_assistant_require_existing_conversation():
             pass
     finally:
         restore_data_dir(temp_dir, orig_config, orig_storage)
+
+
+def test_compressed_formats_round_trip_and_read_old_files(monkeypatch):
+    temp_dir, orig_config, orig_storage = with_temp_data_dir()
+    try:
+        storage.create_conversation("old")
+        storage.add_user_message("old", "plain json file")
+
+        monkeypatch.setattr(storage, "STORAGE_FORMAT", "gzip")
+        # Old plain-JSON file is still readable, and the next write converts it
+        assert storage.get_conversation("old")["messages"][0]["content"] == "plain json file"
+        storage.update_conversation_title("old", "Converted")
+        assert storage.find_conversation_path("old").endswith(".json.gz")
+        assert not os.path.exists(storage.get_conversation_path("old", "json"))
+
+        storage.create_conversation("new")
+        titles = {c["id"]: c["title"] for c in storage.list_conversations()}
+        assert titles == {"old": "Converted", "new": "New Conversation"}
+    finally:
+        restore_data_dir(temp_dir, orig_config, orig_storage)
+
+
+def test_compaction_rewrites_files_with_trained_zstd_dict():
+    pytest.importorskip("zstandard")
+    from backend import compaction
+
+    temp_dir, orig_config, orig_storage = with_temp_data_dir()
+    try:
+        for i in range(30):
+            storage.create_conversation(f"c{i}")
+            storage.add_assistant_message(
+                f"c{i}",
+                stage1=[{"model": f"m{j}", "response": f"Answer {i} from model {j}. " * 20} for j in range(4)],
+                stage2=[{"model": "m1", "ranking": "FINAL RANKING:\n1. Response A\n2. Response B"}],
+                stage3={"model": "chair", "response": f"Final answer {i}"},
+            )
+
+        report = compaction.compact("zstd", train_dict=True, dict_size=4096)
+        assert report["after"]["files"] == 30
+        assert report["after"]["bytes"] < report["before"]["bytes"]
+        assert all(path.endswith(".json.zst") for path in compaction.conversation_files())
+
+        # Files are readable with a cold dictionary cache
+        storage._zstd_dicts.clear()
+        assert storage.get_conversation("c7")["messages"][0]["stage3"]["response"] == "Final answer 7"
+        assert "bytes" in compaction.format_report(report)
+    finally:
+        restore_data_dir(temp_dir, orig_config, orig_storage)
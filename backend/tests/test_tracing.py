@@ -0,0 +1,96 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend import tracing
+
+
+@pytest.fixture
+def exporter():
+    exporter = tracing.InMemoryExporter()
+    tracing.set_exporter(exporter)
+    yield exporter
+    tracing.set_exporter(None)
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_across_gathered_tasks(exporter):
+    @tracing.traced("child")
+    async def child():
+        await asyncio.sleep(0)
+
+    with tracing.start_span("root") as root:
+        await asyncio.gather(child(), child())
+
+    children = exporter.find("child")
+    assert len(children) == 2
+    assert all(span.parent_id == root.span_id for span in children)
+    assert all(span.trace_id == root.trace_id for span in children)
+    assert exporter.find("root")[0].parent_id is None
+
+
+def test_traced_sync_function_records_errors(exporter):
+    @tracing.traced("boom")
+    def boom():
+        raise ValueError("bad")
+
+    with pytest.raises(ValueError):
+        boom()
+
+    span = exporter.find("boom")[0]
+    assert span.status == "error"
+    assert "bad" in span.error
+    assert span.duration_ms is not None
+
+
+def test_disabled_tracing_yields_noop_span():
+    tracing.set_exporter(None)
+    with tracing.start_span("ignored", model="m") as span:
+        span.set_attribute("ok", True)
+    assert span is tracing.NOOP_SPAN
+
+
+def test_json_file_exporter_writes_lines(tmp_path):
+    path = tmp_path / "traces" / "spans.jsonl"
+    tracing.set_exporter(tracing.JsonFileExporter(str(path)))
+    try:
+        with tracing.start_span("outer", model="m1"):
+            with tracing.start_span("inner"):
+                pass
+    finally:
+        tracing.set_exporter(None)
+
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [s["name"] for s in spans] == ["inner", "outer"]
+    assert spans[0]["parent_id"] == spans[1]["span_id"]
+    assert spans[1]["attributes"]["model"] == "m1"
+
+
+def test_middleware_creates_root_span_and_honours_traceparent(exporter):
+    app = FastAPI()
+    app.add_middleware(tracing.TracingMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        with tracing.start_span("work"):
+            return {"id": item_id}
+
+    client = TestClient(app)
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    resp = client.get("/items/42", headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"})
+    assert resp.status_code == 200
+
+    root = exporter.find("HTTP GET /items/{item_id}")[0]
+    assert root.trace_id == trace_id
+    assert root.parent_id == "00f067aa0ba902b7"
+    assert root.attributes["http.status_code"] == 200
+    assert exporter.find("work")[0].parent_id == root.span_id
+
+
+def test_parse_traceparent_rejects_malformed_headers():
+    assert tracing.parse_traceparent("garbage") is None
+    assert tracing.parse_traceparent(None) is None
+    assert tracing.parse_traceparent("00-" + "0" * 32 + "-00f067aa0ba902b7-01") is None
@@ -0,0 +1,260 @@
+"""Lightweight OpenTelemetry-style tracing for council turns.
+
+Each HTTP request becomes a root span (via ``TracingMiddleware``); title
+generation, council stages, upstream model calls and storage writes open
+child spans. The active span is tracked in a context variable, so spans made
+inside ``asyncio.gather``/``create_task`` children nest under the span that
+spawned them.
+
+Finished spans go to a pluggable exporter. Built-ins: ``InMemoryExporter``
+(tests, local inspection) and ``JsonFileExporter`` (one JSON object per line).
+Tracing is off unless an exporter is configured, in which case
+``start_span`` is a near no-op. Configure with ``LLM_COUNCIL_TRACE_EXPORTER``
+(``none``, ``memory`` or ``jsonl``) and ``LLM_COUNCIL_TRACE_FILE``, or call
+``set_exporter``. Incoming W3C ``traceparent`` headers are honoured.
+"""
+
+import functools
+import inspect
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import config
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "status", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """Stand-in yielded when tracing is disabled."""
+
+    trace_id = None
+    span_id = None
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class SpanExporter:
+    """Receives finished spans."""
+
+    def export(self, span: Span):
+        raise NotImplementedError
+
+    def shutdown(self):
+        pass
+
+
+class InMemoryExporter(SpanExporter):
+    """Keeps finished spans in a list (bounded to the most recent max_spans)."""
+
+    def __init__(self, max_spans: int = 10000):
+        self.max_spans = max_spans
+        self.spans: List[Span] = []
+
+    def export(self, span: Span):
+        self.spans.append(span)
+        if len(self.spans) > self.max_spans:
+            del self.spans[: len(self.spans) - self.max_spans]
+
+    def clear(self):
+        self.spans.clear()
+
+    def find(self, name: str) -> List[Span]:
+        return [span for span in self.spans if span.name == name]
+
+
+class JsonFileExporter(SpanExporter):
+    """Appends each finished span to a JSON Lines file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+
+
+_exporter: Optional[SpanExporter] = None
+_current_span: ContextVar[Optional[Span]] = ContextVar("llm_council_span", default=None)
+
+
+def set_exporter(exporter: Optional[SpanExporter]):
+    """Install the exporter for finished spans (None disables tracing)."""
+    global _exporter
+    if _exporter is not None and _exporter is not exporter:
+        _exporter.shutdown()
+    _exporter = exporter
+
+
+def get_exporter() -> Optional[SpanExporter]:
+    return _exporter
+
+
+def configure_from_env():
+    """Install an exporter according to config.TRACE_EXPORTER."""
+    kind = (config.TRACE_EXPORTER or "none").lower()
+    if kind == "memory":
+        set_exporter(InMemoryExporter())
+    elif kind == "jsonl":
+        set_exporter(JsonFileExporter(config.TRACE_FILE))
+    else:
+        set_exporter(None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Parse a W3C traceparent header into (trace_id, parent span_id)."""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return parts[1], parts[2]
+
+
+@contextmanager
+def start_span(name: str, parent: Optional[Tuple[str, str]] = None, **attributes: Any) -> Iterator[Any]:
+    """
+    Open a span as a child of the current one (or of `parent`, a
+    (trace_id, span_id) pair from an incoming request).
+
+    Exceptions propagate and mark the span as errored.
+    """
+    exporter = _exporter
+    if exporter is None:
+        yield NOOP_SPAN
+        return
+
+    if parent is not None:
+        trace_id, parent_id = parent
+    else:
+        active = _current_span.get()
+        trace_id = active.trace_id if active else secrets.token_hex(16)
+        parent_id = active.span_id if active else None
+
+    span = Span(name, trace_id, parent_id, attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.status = "error"
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        span.end_ns = time.time_ns()
+        _current_span.reset(token)
+        exporter.export(span)
+
+
+def traced(name: str):
+    """Decorator wrapping a sync or async function in a span."""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with start_span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with start_span(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+class TracingMiddleware:
+    """ASGI middleware opening the root span for each HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _exporter is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        traceparent = headers.get(b"traceparent")
+        parent = parse_traceparent(traceparent.decode("latin-1") if traceparent else None)
+        status = {}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        with start_span(
+            f"HTTP {scope['method']}",
+            parent=parent,
+            **{"http.method": scope["method"], "http.target": scope.get("path", "")}
+        ) as span:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = scope.get("route")
+                route_path = getattr(route, "path", None)
+                if route_path:
+                    span.name = f"HTTP {scope['method']} {route_path}"
+                    span.set_attribute("http.route", route_path)
+                span.set_attribute("http.status_code", status.get("code"))
@@ -133,6 +133,24 @@ function App() {
             );
             break;
 
+          case 'stage1_model_complete':
+            setCurrentConversation((prev) =>
+              updateLatestAssistant(prev, streamConversationId, (msg) => ({
+                ...msg,
+                stage1: [...(msg.stage1 || []), event.data],
+              }))
+            );
+            break;
+
+          case 'stage2_model_complete':
+            setCurrentConversation((prev) =>
+              updateLatestAssistant(prev, streamConversationId, (msg) => ({
+                ...msg,
+                stage2: [...(msg.stage2 || []), event.data],
+              }))
+            );
+            break;
+
           case 'stage2_start':
             setCurrentConversation((prev) =>
               updateLatestAssistant(prev, streamConversationId, (msg) => ({
@@ -186,6 +204,21 @@ function App() {
             setIsLoading(false);
             break;
 
+          case 'run_started':
+            // Run id for POST /api/conversations/{id}/runs/{run_id}/cancel
+            break;
+
+          case 'cancelled':
+            setCurrentConversation((prev) =>
+              updateLatestAssistant(prev, streamConversationId, (msg) => ({
+                ...msg,
+                loading: { stage1: false, stage2: false, stage3: false },
+              }))
+            );
+            loadConversations();
+            setIsLoading(false);
+            break;
+
           default:
             console.log('Unknown event type:', eventType);
         }
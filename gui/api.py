@@ -4,16 +4,87 @@ from __future__ import annotations
 
 import json
 import asyncio
-from typing import AsyncGenerator, Dict, List, Optional
+import importlib.util
+from collections import OrderedDict
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
 import httpx
 
+try:  # Optional fast JSON parser
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+# HTTP/2 needs the optional h2 package; httpx imports it when a client is built
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 from .config import DEFAULT_BACKEND_URL
 from .models import (
+    AssistantMessage,
     Conversation,
     ConversationMetadata,
     SSEEvent,
 )
+from .sse import SSEDecoder
+
+
+# Short keys of the backend's compact SSE encoding (see backend/events.py)
+COMPACT_KEYS = {
+    "t": "type",
+    "d": "data",
+    "m": "metadata",
+    "e": "message",
+    "o": "model",
+    "r": "response",
+    "k": "ranking",
+    "p": "parsed_ranking",
+    "v": "reviewed_labels",
+    "pm": "parse_mode",
+    "s": "scores",
+    "ti": "title",
+}
+
+STREAM_ACCEPT = "text/event-stream; encoding=compact"
+
+# Number of (URL, params) responses kept for conditional GETs
+VALIDATOR_CACHE_SIZE = 32
+
+# Connection pool: one stream plus a handful of concurrent REST calls
+POOL_MAX_CONNECTIONS = 10
+POOL_MAX_KEEPALIVE = 5
+KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+# Stopping a run should not leave the UI waiting on a slow backend
+CANCEL_TIMEOUT_SECONDS = 5.0
+
+
+_json_decode = json.JSONDecoder().decode
+
+
+def _loads(raw: str | bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    # SSE payloads are UTF-8; skip json.loads' encoding detection
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8")
+    return _json_decode(raw)
+
+
+def _expand_keys(item):
+    if isinstance(item, dict):
+        return {COMPACT_KEYS.get(k, k): v for k, v in item.items()}
+    return item
+
+
+def expand_compact_event(payload: Dict) -> Dict:
+    """Restore long keys on a compact event and its stage entries."""
+    payload = _expand_keys(payload)
+    data = payload.get("data")
+    if isinstance(data, list):
+        payload["data"] = [_expand_keys(item) for item in data]
+    elif isinstance(data, dict):
+        payload["data"] = _expand_keys(data)
+    return payload
 
 
 class CouncilAPI:
@@ -28,21 +99,69 @@ class CouncilAPI:
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self._owns_client = client is None
-        timeout = httpx.Timeout(connect=10.0, read=320.0, write=30.0, pool=10.0)
-        self._client = client or httpx.AsyncClient(timeout=timeout)
-        self._timeout = timeout
+        self._timeout = httpx.Timeout(connect=10.0, read=320.0, write=30.0, pool=10.0)
+        self._limits = httpx.Limits(
+            max_connections=POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=POOL_MAX_KEEPALIVE,
+            keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+        )
+        # HTTP/2 is negotiated over TLS only; plain http:// stays on HTTP/1.1
+        self.http2 = HTTP2_AVAILABLE
+        # Built on first use: creating the SSL context is not free at startup
+        self._client_instance: Optional[httpx.AsyncClient] = client
+        # Close tasks of clients replaced by update_config (awaited in aclose)
+        self._retired: List[asyncio.Task] = []
+        # (url, params) -> (ETag, parsed body) for If-None-Match revalidation
+        self._validators: "OrderedDict[Tuple[str, Tuple], Tuple[str, Any]]" = OrderedDict()
+
+    def _make_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(timeout=self._timeout, limits=self._limits, http2=self.http2)
+
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        if self._client_instance is None:
+            self._client_instance = self._make_client()
+        return self._client_instance
 
     def update_config(self, *, base_url: str | None = None, api_key: str | None = None) -> None:
-        """Update base URL/API key without recreating the client."""
+        """
+        Update base URL/API key.
+
+        A new base URL also gets a fresh connection pool (when the client is
+        ours), so no keep-alive connections to the old backend are reused.
+        """
         if base_url:
-            self.base_url = base_url.rstrip("/")
+            base_url = base_url.rstrip("/")
+            if base_url != self.base_url and self._owns_client:
+                self._recycle_client()
+            self.base_url = base_url
         if api_key is not None:
             self.api_key = api_key
+        self._validators.clear()
+
+    def _recycle_client(self) -> None:
+        old, self._client_instance = self._client_instance, None
+        if old is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop (e.g. during setup): nothing can be in flight yet
+            asyncio.run(old.aclose())
+            return
+        self._retired.append(loop.create_task(old.aclose()))
 
     # Lifecycle ----------------------------------------------------------
+    async def warm_up(self) -> Dict:
+        """Open a pooled connection to the backend ahead of the first real request."""
+        return await self.health()
+
     async def aclose(self) -> None:
-        if self._owns_client:
-            await self._client.aclose()
+        if self._retired:
+            await asyncio.gather(*self._retired, return_exceptions=True)
+            self._retired = []
+        if self._owns_client and self._client_instance is not None:
+            await self._client_instance.aclose()
 
     async def __aenter__(self) -> "CouncilAPI":
         return self
@@ -57,6 +176,42 @@ class CouncilAPI:
             headers["Authorization"] = f"Bearer {self.api_key}"
         return headers
 
+    @staticmethod
+    def _validator_key(url: str, params: Dict[str, str] | None) -> Tuple[str, Tuple]:
+        return url, tuple(sorted((params or {}).items()))
+
+    async def _get_json(self, url: str, params: Dict[str, str] | None = None, etag: str | None = None) -> Any:
+        """
+        GET with ETag revalidation: a 304 reuses the cached body.
+
+        ``etag`` is a validator kept elsewhere (e.g. the disk cache), sent
+        when this client holds none for the request; a 304 for it returns None.
+        """
+        key = self._validator_key(url, params)
+        headers = self._headers()
+        cached = self._validators.get(key)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        elif etag:
+            headers["If-None-Match"] = etag
+        resp = await self._client.get(url, params=params or None, headers=headers)
+        if resp.status_code == 304 and cached:
+            self._validators.move_to_end(key)
+            return cached[1]
+        if resp.status_code == 304 and etag:
+            return None
+        resp.raise_for_status()
+        body = resp.json()
+        etag = resp.headers.get("etag")
+        if etag:
+            self._validators[key] = (etag, body)
+            self._validators.move_to_end(key)
+            while len(self._validators) > VALIDATOR_CACHE_SIZE:
+                self._validators.popitem(last=False)
+        else:
+            self._validators.pop(key, None)
+        return body
+
     # REST calls ---------------------------------------------------------
     async def health(self) -> Dict:
         resp = await self._client.get(f"{self.base_url}/", headers=self._headers())
@@ -64,22 +219,72 @@ class CouncilAPI:
         return resp.json()
 
     async def list_conversations(self) -> List[ConversationMetadata]:
-        resp = await self._client.get(f"{self.base_url}/api/conversations", headers=self._headers())
-        resp.raise_for_status()
-        return [ConversationMetadata.from_dict(item) for item in resp.json()]
+        items = await self._get_json(f"{self.base_url}/api/conversations")
+        return [ConversationMetadata.from_dict(item) for item in items]
 
     async def create_conversation(self) -> Conversation:
         resp = await self._client.post(f"{self.base_url}/api/conversations", json={}, headers=self._headers())
         resp.raise_for_status()
         return Conversation.from_dict(resp.json())
 
-    async def get_conversation(self, conversation_id: str) -> Conversation:
+    async def get_conversation(
+        self,
+        conversation_id: str,
+        *,
+        fields: str | None = None,
+        expand: str | None = None,
+    ) -> Conversation:
+        """Fetch a conversation; ``fields="summary"`` omits Stage 1/2 except for ``expand``."""
+        url, params = self._conversation_request(conversation_id, fields, expand)
+        convo = Conversation.from_dict(await self._get_json(url, params))
+        convo.etag = self._current_etag(url, params)
+        return convo
+
+    async def revalidate_conversation(
+        self,
+        conversation_id: str,
+        etag: str | None,
+        *,
+        fields: str | None = None,
+        expand: str | None = None,
+    ) -> Optional[Conversation]:
+        """
+        Fetch a conversation unless it still has ``etag`` (its cached copy's).
+
+        Returns None when the server confirms the copy is current (304), else
+        the new version with its ``etag`` set.
+        """
+        url, params = self._conversation_request(conversation_id, fields, expand)
+        data = await self._get_json(url, params, etag=etag)
+        current = self._current_etag(url, params)
+        if data is None or (etag is not None and current == etag):
+            return None
+        convo = Conversation.from_dict(data)
+        convo.etag = current
+        return convo
+
+    def _conversation_request(
+        self, conversation_id: str, fields: str | None, expand: str | None
+    ) -> Tuple[str, Dict[str, str]]:
+        params = {}
+        if fields:
+            params["fields"] = fields
+        if expand:
+            params["expand"] = expand
+        return f"{self.base_url}/api/conversations/{conversation_id}", params
+
+    def _current_etag(self, url: str, params: Dict[str, str]) -> Optional[str]:
+        validator = self._validators.get(self._validator_key(url, params))
+        return validator[0] if validator else None
+
+    async def get_message_stages(self, conversation_id: str, index: int) -> AssistantMessage:
+        """Fetch the full stages of one assistant message."""
         resp = await self._client.get(
-            f"{self.base_url}/api/conversations/{conversation_id}",
+            f"{self.base_url}/api/conversations/{conversation_id}/messages/{index}/stages",
             headers=self._headers(),
         )
         resp.raise_for_status()
-        return Conversation.from_dict(resp.json())
+        return AssistantMessage.from_dict(resp.json())
 
     async def send_message(self, conversation_id: str, content: str) -> Dict:
         resp = await self._client.post(
@@ -90,6 +295,23 @@ class CouncilAPI:
         resp.raise_for_status()
         return resp.json()
 
+    async def cancel_run(self, conversation_id: str, run_id: str, *, keep_partial: bool = True) -> bool:
+        """
+        Ask the backend to stop a streamed run (and its upstream calls).
+
+        Returns False if the run is unknown or already finished.
+        """
+        resp = await self._client.post(
+            f"{self.base_url}/api/conversations/{conversation_id}/runs/{run_id}/cancel",
+            json={"keep_partial": keep_partial},
+            headers=self._headers(),
+            timeout=CANCEL_TIMEOUT_SECONDS,
+        )
+        if resp.status_code == 404:
+            return False
+        resp.raise_for_status()
+        return True
+
     # Streaming ----------------------------------------------------------
     async def stream_message(
         self,
@@ -108,41 +330,41 @@ class CouncilAPI:
             "POST",
             url,
             json={"content": content},
-            headers={"Accept": "text/event-stream", **self._headers()},
+            headers={"Accept": STREAM_ACCEPT, **self._headers()},
         ) as resp:
             resp.raise_for_status()
-            buffer = ""
-            async for line in resp.aiter_lines():
+            decoder = SSEDecoder()
+            async for chunk in resp.aiter_bytes():
+                for message in decoder.feed(chunk):
+                    if cancel_event and cancel_event.is_set():
+                        return
+                    event = self._parse_event(message.data, message.event, message.id)
+                    if event:
+                        yield event
                 if cancel_event and cancel_event.is_set():
-                    break
-                if line is None:
-                    continue
-                if line.startswith("data:"):
-                    buffer += line[len("data:") :].strip()
-                elif line == "":
-                    if buffer:
-                        event = self._parse_event(buffer)
-                        if event:
-                            yield event
-                        buffer = ""
-                else:
-                    continue
-            if buffer and not (cancel_event and cancel_event.is_set()):
-                event = self._parse_event(buffer)
-                if event:
-                    yield event
+                    return
 
     @staticmethod
-    def _parse_event(raw_payload: str) -> Optional[SSEEvent]:
+    def _parse_event(
+        raw_payload: str | bytes,
+        event_name: str = "message",
+        event_id: str | None = None,
+    ) -> Optional[SSEEvent]:
         """Parse a single SSE data block into an SSEEvent."""
         try:
-            payload = json.loads(raw_payload)
-        except json.JSONDecodeError:
-            return SSEEvent(type="raw", raw=raw_payload)
+            payload = _loads(raw_payload)
+        except ValueError:
+            payload = None
+        if not isinstance(payload, dict):
+            if isinstance(raw_payload, bytes):
+                raw_payload = raw_payload.decode("utf-8", "replace")
+            return SSEEvent(type="raw", raw=raw_payload, id=event_id)
+        if "type" not in payload and "t" in payload:
+            payload = expand_compact_event(payload)
 
         return SSEEvent(
-            type=payload.get("type", "message"),
+            type=payload.get("type", event_name),
             data=payload.get("data"),
             metadata=payload.get("metadata"),
-            raw=raw_payload,
+            id=event_id,
         )
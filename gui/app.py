@@ -1,22 +1,16 @@
 """Entrypoint for the LLM Council desktop GUI."""
 
-import asyncio
+import argparse
 import logging
 import sys
 from pathlib import Path
+from typing import List, Optional
 
-from PySide6.QtGui import QGuiApplication
-from PySide6.QtQml import QQmlApplicationEngine
-from PySide6.QtCore import QUrl
-from qasync import QEventLoop
-
-from .api import CouncilAPI
-from .bridge import QmlBridge
-from .config import APP_NAME, LOG_FILE, ensure_dirs
-from .controller import GUIController
+# Qt, qasync and httpx are imported inside main() so startup phases can be
+# timed and the conversation prefetch can start before they load
+from .config import APP_NAME, CACHE_DIR, LOG_FILE, ensure_dirs
 from .persistence import load_settings
-from .state import AppState
-from .stream import StreamRunner
+from .startup import StartupProfile, prefetch_conversations
 
 
 def setup_logging() -> None:
@@ -29,22 +23,62 @@ def setup_logging() -> None:
     )
 
 
-def main() -> int:
+def parse_args(argv: List[str]) -> tuple[argparse.Namespace, List[str]]:
+    """Split our options from the ones Qt understands."""
+    parser = argparse.ArgumentParser(prog="gui.app", description=APP_NAME)
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print startup phase timings once the UI is interactive, then exit",
+    )
+    return parser.parse_known_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
     """Start the Qt/QML application."""
+    profile = StartupProfile()
+    args, qt_args = parse_args(sys.argv[1:] if argv is None else argv)
     setup_logging()
-    app = QGuiApplication(sys.argv)
-    app.setApplicationName(APP_NAME)
+    settings = load_settings()
+    # Runs on its own thread while Qt, the app modules and QML load
+    prefetch = prefetch_conversations(settings.backend_url, settings.api_key)
+    profile.mark("settings + prefetch start")
+
+    import asyncio
+
+    from PySide6.QtCore import QUrl
+    from PySide6.QtGui import QGuiApplication
+    from PySide6.QtQml import QQmlApplicationEngine
+    from qasync import QEventLoop
+    profile.mark("import Qt")
 
+    app = QGuiApplication([sys.argv[0], *qt_args])
+    app.setApplicationName(APP_NAME)
     loop = QEventLoop(app)
     asyncio.set_event_loop(loop)
     app.aboutToQuit.connect(loop.stop)
+    profile.mark("Qt application")
+
+    from .api import CouncilAPI
+    from .bridge import QmlBridge
+    from .cache import ConversationCache
+    from .controller import GUIController
+    from .state import AppState
+    from .stream import StreamRunner
+    profile.mark("import app modules")
 
-    settings = load_settings()
     state = AppState(settings.backend_url, settings.api_key)
     api = CouncilAPI(base_url=state.backend_url, api_key=settings.api_key)
-    controller = GUIController(api, state)
+    cache = ConversationCache(disk_dir=CACHE_DIR if settings.disk_cache else None)
+    controller = GUIController(api, state, cache)
+    # Show last session's conversation list while the backend is contacted
+    controller.restore_cached()
     stream_runner = StreamRunner(api, state)
     bridge = QmlBridge(controller, stream_runner, state)
+    # Adopt the prefetched list and open the main client's connection as soon
+    # as the loop starts; the UI's first loadConversations() joins this
+    warm_up = loop.create_task(controller.warm_up(prefetch))
+    profile.mark("state + controllers")
 
     engine = QQmlApplicationEngine()
     engine.rootContext().setContextProperty("bridge", bridge)
@@ -54,12 +88,38 @@ def main() -> int:
     if not engine.rootObjects():
         logging.error("Failed to load QML UI from %s", qml_path)
         return 1
+    profile.mark("QML load")
+
+    def finish_profile() -> None:
+        if args.profile_startup and profile.has("first frame") and profile.has("backend warm-up"):
+            print(profile.report())
+            app.quit()
+
+    def on_first_frame() -> None:
+        if not profile.has("first frame"):
+            profile.mark("first frame")
+            finish_profile()
+
+    def on_warm_up(_task) -> None:
+        profile.mark("backend warm-up")
+        finish_profile()
+
+    window = engine.rootObjects()[0]
+    if hasattr(window, "frameSwapped"):
+        window.frameSwapped.connect(on_first_frame)
+    else:  # pragma: no cover - root is always a window in Main.qml
+        profile.mark("first frame")
+    warm_up.add_done_callback(on_warm_up)
+    # The prefetch thread resolves its future; record it on the loop thread
+    prefetch.add_done_callback(lambda _f: loop.call_soon_threadsafe(profile.mark, "conversations prefetched"))
 
-    logging.info("GUI started; backend expected at http://localhost:8001 by default")
+    logging.info("GUI started; backend expected at %s", state.backend_url)
 
     with loop:
         loop.run_forever()
 
+    if not warm_up.done():
+        warm_up.cancel()
     # Ensure HTTP client closes cleanly even after loop teardown
     asyncio.run(api.aclose())
     return 0
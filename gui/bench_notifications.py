@@ -0,0 +1,147 @@
+"""Benchmark Qt signal and serialization counts per streamed turn.
+
+Replays the SSE events of one council turn into an ``AppState`` wired to a
+``QmlBridge`` while a stand-in for QML re-reads each property whenever its
+notify signal fires (as bindings do; ``--reads-per-signal`` models several
+bindings on one property). Reports signals emitted, property reads, snapshot
+rebuilds and serialized characters, for topic-aware notifications and for
+the old notify-everything behaviour.
+
+Usage:
+    python -m gui.bench_notifications --history 10 --response-chars 2000 --reads-per-signal 12
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QCoreApplication  # noqa: E402
+
+from .bridge import QmlBridge  # noqa: E402
+from .models import Conversation, SSEEvent  # noqa: E402
+from .state import AppState  # noqa: E402
+
+# notify signal -> property QML re-reads
+BINDINGS = {
+    "conversationsChanged": "conversations",
+    "currentConversationChanged": "currentConversation",
+    "streamStatusChanged": "streamStatus",
+    "stageDataChanged": "stageData",
+    "backendUrlChanged": "backendUrl",
+    "apiKeyChanged": "apiKey",
+}
+
+
+class NotifyEverythingBridge(QmlBridge):
+    """Baseline: emit every signal on every state change."""
+
+    def _on_state_change(self, changed=None) -> None:
+        self._invalidate(self._versions)
+        for signal in BINDINGS:
+            getattr(self, signal).emit()
+
+
+class _Null:
+    """Controller/stream runner placeholder; the benchmark drives AppState directly."""
+
+
+def make_conversation(history: int, response_chars: int, models: int = 4) -> Conversation:
+    text = "x" * response_chars
+    messages: List[Dict[str, Any]] = []
+    for turn in range(history):
+        messages.append({"role": "user", "content": f"question {turn}"})
+        messages.append({
+            "role": "assistant",
+            "stage1": [{"model": f"m{i}", "response": text} for i in range(models)],
+            "stage2": [{"model": f"m{i}", "ranking": text} for i in range(models)],
+            "stage3": {"model": "chair", "response": text},
+        })
+    return Conversation.from_dict({"id": "bench", "created_at": "", "title": "Bench", "messages": messages})
+
+
+def turn_events(response_chars: int, models: int = 4) -> List[SSEEvent]:
+    text = "y" * response_chars
+    return [
+        SSEEvent(type="stage1_start"),
+        SSEEvent(type="stage1_complete", data=[{"model": f"m{i}", "response": text} for i in range(models)]),
+        SSEEvent(type="stage2_start"),
+        SSEEvent(
+            type="stage2_complete",
+            data=[{"model": f"m{i}", "ranking": text} for i in range(models)],
+            metadata={"label_to_model": {}, "aggregate_rankings": []},
+        ),
+        SSEEvent(type="stage3_start"),
+        SSEEvent(type="stage3_complete", data={"model": "chair", "response": text}),
+        SSEEvent(type="title_complete", data={"title": "Bench turn"}),
+        SSEEvent(type="complete"),
+    ]
+
+
+def run_turn(bridge_cls, history: int, response_chars: int, reads_per_signal: int = 1) -> Dict[str, Any]:
+    """Replay one turn and count what a QML front end would observe."""
+    state = AppState()
+    bridge = bridge_cls(_Null(), _Null(), state)
+    state.set_current_conversation(make_conversation(history, response_chars))
+
+    counts = {"signals": 0, "serializations": 0, "serialized_chars": 0, "by_signal": {}}
+
+    def reader(signal_name: str, prop: str):
+        def _read():
+            counts["signals"] += 1
+            counts["by_signal"][signal_name] = counts["by_signal"].get(signal_name, 0) + 1
+            for _ in range(reads_per_signal):
+                value = getattr(bridge, prop)
+                counts["serializations"] += 1
+                counts["serialized_chars"] += len(json.dumps(value, default=str))
+        return _read
+
+    for signal_name, prop in BINDINGS.items():
+        getattr(bridge, signal_name).connect(reader(signal_name, prop))
+
+    state.start_stream()
+    for event in turn_events(response_chars):
+        state.apply_event(event)
+    state.end_stream()
+    counts["snapshot_builds"] = sum(c["builds"] for c in bridge.snapshot_counters.values())
+    return counts
+
+
+def run(history: int = 10, response_chars: int = 2000, reads_per_signal: int = 1) -> Dict[str, Dict[str, Any]]:
+    app = QCoreApplication.instance() or QCoreApplication([])  # noqa: F841 - keep alive
+    return {
+        "topics": run_turn(QmlBridge, history, response_chars, reads_per_signal),
+        "notify_everything": run_turn(NotifyEverythingBridge, history, response_chars, reads_per_signal),
+    }
+
+
+def format_report(report: Dict[str, Dict[str, Any]]) -> str:
+    lines = [f"{'mode':>18} {'signals':>8} {'reads':>8} {'builds':>8} {'chars':>12}"]
+    for mode, counts in report.items():
+        lines.append(
+            f"{mode:>18} {counts['signals']:>8} {counts['serializations']:>8} "
+            f"{counts['snapshot_builds']:>8} {counts['serialized_chars']:>12}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Count Qt signals/serializations per streamed turn.")
+    parser.add_argument("--history", type=int, default=10, help="earlier turns in the open conversation")
+    parser.add_argument("--response-chars", type=int, default=2000, help="characters per stage response")
+    parser.add_argument("--reads-per-signal", type=int, default=1, help="bindings reading each property")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run(args.history, args.response_chars, args.reads_per_signal)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
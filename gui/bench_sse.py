@@ -0,0 +1,150 @@
+"""Benchmark SSE parsing on a synthetic event stream.
+
+Builds a stream of N compact-encoded council events, splits it into fixed
+size chunks and replays them through async iterators standing in for
+``aiter_bytes``/``aiter_lines``. Times the incremental ``SSEDecoder`` path
+used by ``CouncilAPI.stream_message`` against the previous parser (httpx's
+own line decoding, one async step per line, string concatenation per data
+line).
+
+Usage:
+    python -m gui.bench_sse --events 10000 --chunk-size 4096
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Callable, Coroutine, Dict, List, Optional
+
+from httpx._decoders import LineDecoder, TextDecoder
+
+from . import api
+from .api import CouncilAPI
+from .models import SSEEvent
+from .sse import SSEDecoder
+
+
+def make_stream(events: int, response_chars: int = 200, ids: bool = False) -> bytes:
+    """Frames shaped like the backend's (``data:`` only), optionally with ``id:`` lines."""
+    text = ("token " * (response_chars // 6 + 1))[:response_chars]
+    frames = []
+    for i in range(events):
+        payload = {"t": "stage1_complete", "d": [{"o": f"m{i % 4}", "r": text}]}
+        prefix = f"id: {i}\n" if ids else ""
+        frames.append(f"{prefix}data: {json.dumps(payload, separators=(',', ':'))}\n\n")
+    return "".join(frames).encode("utf-8")
+
+
+def chunked(stream: bytes, size: int) -> List[bytes]:
+    return [stream[i:i + size] for i in range(0, len(stream), size)]
+
+
+async def aiter_bytes(chunks: List[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def aiter_lines(chunks: List[bytes]) -> AsyncIterator[str]:
+    """What ``httpx.Response.aiter_lines`` does on top of ``aiter_bytes``."""
+    text_decoder = TextDecoder("utf-8")
+    line_decoder = LineDecoder()
+    async for chunk in aiter_bytes(chunks):
+        for line in line_decoder.decode(text_decoder.decode(chunk)):
+            yield line
+    for line in line_decoder.decode(text_decoder.flush()) + line_decoder.flush():
+        yield line
+
+
+async def parse_with_decoder(chunks: List[bytes], cancel_event: asyncio.Event) -> int:
+    decoder = SSEDecoder()
+    count = 0
+    async for chunk in aiter_bytes(chunks):
+        for message in decoder.feed(chunk):
+            if cancel_event.is_set():
+                return count
+            if CouncilAPI._parse_event(message.data, message.event, message.id):
+                count += 1
+    return count
+
+
+def _legacy_parse(raw_payload: str) -> SSEEvent:
+    try:
+        payload = json.loads(raw_payload)
+    except ValueError:
+        return SSEEvent(type="raw", raw=raw_payload)
+    if "type" not in payload and "t" in payload:
+        payload = api.expand_compact_event(payload)
+    return SSEEvent(type=payload.get("type", "message"), data=payload.get("data"),
+                    metadata=payload.get("metadata"), raw=raw_payload)
+
+
+async def parse_line_concat(chunks: List[bytes], cancel_event: asyncio.Event) -> int:
+    """The previous parser loop from ``CouncilAPI.stream_message``."""
+    buffer = ""
+    count = 0
+    async for line in aiter_lines(chunks):
+        if cancel_event.is_set():
+            break
+        if line is None:
+            continue
+        if line.startswith("data:"):
+            buffer += line[len("data:"):].strip()
+        elif line == "":
+            if buffer:
+                if _legacy_parse(buffer):
+                    count += 1
+                buffer = ""
+    return count
+
+
+def _time(parse: Callable[[List[bytes], asyncio.Event], Coroutine[Any, Any, int]],
+          chunks: List[bytes], repeat: int) -> Dict[str, Any]:
+    best = None
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = asyncio.run(parse(chunks, asyncio.Event()))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {"events": count, "seconds": best or 0.0}
+
+
+def run(events: int = 10000, chunk_size: int = 4096, response_chars: int = 200,
+        repeat: int = 5, ids: bool = False) -> Dict[str, Dict[str, Any]]:
+    chunks = chunked(make_stream(events, response_chars, ids), chunk_size)
+    return {
+        "decoder": _time(parse_with_decoder, chunks, repeat),
+        "line_concat": _time(parse_line_concat, chunks, repeat),
+    }
+
+
+def format_report(report: Dict[str, Dict[str, Any]]) -> str:
+    parser = "orjson" if api.orjson is not None else "json"
+    lines = [f"json parser: {parser}", f"{'parser':>12} {'events':>8} {'ms':>10} {'us/event':>10}"]
+    for name, row in report.items():
+        per_event = row["seconds"] / row["events"] * 1e6 if row["events"] else 0.0
+        lines.append(f"{name:>12} {row['events']:>8} {row['seconds'] * 1000:>10.1f} {per_event:>10.2f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark SSE stream parsing.")
+    parser.add_argument("--events", type=int, default=10000, help="events in the synthetic stream")
+    parser.add_argument("--chunk-size", type=int, default=4096, help="bytes per network chunk")
+    parser.add_argument("--response-chars", type=int, default=200, help="characters per event payload")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per parser (best is reported)")
+    parser.add_argument("--ids", action="store_true", help="add an id: line to every event")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run(args.events, args.chunk_size, args.response_chars, args.repeat, args.ids)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,17 +5,30 @@ from __future__ import annotations
 import asyncio
 import logging
 from dataclasses import asdict
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List
 
-from PySide6.QtCore import QObject, Property, Signal
+from PySide6.QtCore import QObject, Property, Signal, Slot
 from qasync import asyncSlot
 
-from .controller import GUIController
+from .list_models import ConversationListModel, MessageListModel, Stage1ListModel, Stage2ListModel
 from .persistence import Settings, save_settings
-from .state import AppState, StagePayloads, StreamStatus
-from .stream import StreamRunner
+from .state import (
+    ALL_TOPICS,
+    CONVERSATIONS,
+    CURRENT_CONVERSATION,
+    SETTINGS,
+    STAGE_PAYLOADS,
+    STREAM_STATUS,
+    AppState,
+    StagePayloads,
+    StreamStatus,
+)
 from .models import AssistantMessage, Conversation, ConversationMetadata, UserMessage
 
+if TYPE_CHECKING:  # the HTTP stack is imported by whoever builds these
+    from .controller import GUIController
+    from .stream import StreamRunner
+
 logger = logging.getLogger(__name__)
 
 
@@ -86,21 +99,77 @@ class QmlBridge(QObject):
         self.state = state
         self._busy = False
         self._last_error_sent: str | None = None
-        self.state.subscribe(self._on_state_change)
+        self._last_in_flight = self.state.stream_status.in_flight
+        # Property snapshots are rebuilt at most once per state version
+        self._versions: Dict[str, int] = {topic: 0 for topic in ALL_TOPICS}
+        self._snapshots: Dict[str, tuple] = {}
+        self.snapshot_counters: Dict[str, Dict[str, int]] = {}
+        self._conversation_model = ConversationListModel(self)
+        self._message_model = MessageListModel(self)
+        self._stage1_model = Stage1ListModel(self)
+        self._stage2_model = Stage2ListModel(self)
+        self._sync_models(ALL_TOPICS)
+        self.state.subscribe(self._on_state_change, topics=ALL_TOPICS)
 
     # Property helpers --------------------------------------------------
-    def _on_state_change(self) -> None:
-        self.conversationsChanged.emit()
-        self.currentConversationChanged.emit()
-        self.streamStatusChanged.emit()
-        self.stageDataChanged.emit()
-        self.backendUrlChanged.emit()
-        self.apiKeyChanged.emit()
+    def _invalidate(self, topics) -> None:
+        for topic in topics:
+            self._versions[topic] += 1
+
+    def _snapshot(self, name: str, topic: str, build):
+        """Return the cached value for ``name`` unless ``topic`` changed since it was built."""
+        counters = self.snapshot_counters.setdefault(name, {"reads": 0, "builds": 0})
+        counters["reads"] += 1
+        version = self._versions[topic]
+        cached = self._snapshots.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        counters["builds"] += 1
+        value = build()
+        self._snapshots[name] = (version, value)
+        return value
+
+    @Slot(result="QVariant")
+    def snapshotCounters(self) -> Dict[str, Dict[str, int]]:
+        """Reads vs rebuilds per property, to check for read amplification."""
+        return {name: dict(counts) for name, counts in self.snapshot_counters.items()}
+
+    def _sync_models(self, changed, sidebar_changed: bool = True) -> None:
+        """Push state changes into the list models (row-level signals)."""
+        convo = self.state.current_conversation
+        if sidebar_changed:
+            streaming_id = convo.id if convo and self.state.stream_status.in_flight else None
+            self._conversation_model.set_conversations(self.state.conversations, streaming_id)
+        if CURRENT_CONVERSATION in changed:
+            self._message_model.set_messages(convo.id if convo else None, convo.messages if convo else [])
+        if STAGE_PAYLOADS in changed:
+            self._stage1_model.set_items(self.state.stage_payloads.stage1)
+            self._stage2_model.set_items(self.state.stage_payloads.stage2)
+
+    def _on_state_change(self, changed=ALL_TOPICS) -> None:
+        """Emit only the signals whose backing state changed."""
+        in_flight = self.state.stream_status.in_flight
+        # The sidebar's per-item "streaming" flag follows the stream status
+        sidebar_changed = CONVERSATIONS in changed or in_flight != self._last_in_flight
+        self._last_in_flight = in_flight
+        self._invalidate(set(changed) | ({CONVERSATIONS} if sidebar_changed else set()))
+        self._sync_models(changed, sidebar_changed)
+        if sidebar_changed:
+            self.conversationsChanged.emit()
+        if CURRENT_CONVERSATION in changed:
+            self.currentConversationChanged.emit()
+        if STREAM_STATUS in changed:
+            self.streamStatusChanged.emit()
+        if STAGE_PAYLOADS in changed:
+            self.stageDataChanged.emit()
+        if SETTINGS in changed:
+            self.backendUrlChanged.emit()
+            self.apiKeyChanged.emit()
         if self.state.stream_status.error and self.state.stream_status.error != self._last_error_sent:
             self._last_error_sent = self.state.stream_status.error
             self.errorOccurred.emit(self.state.stream_status.error)
 
-    def _get_conversations(self) -> List[Dict[str, Any]]:
+    def _build_conversations(self) -> List[Dict[str, Any]]:
         current_id = self.state.current_conversation.id if self.state.current_conversation else None
         streaming = self.state.stream_status.in_flight
         return [
@@ -108,23 +177,55 @@ class QmlBridge(QObject):
             for meta in self.state.conversations
         ]
 
+    def _get_conversations(self) -> List[Dict[str, Any]]:
+        return self._snapshot("conversations", CONVERSATIONS, self._build_conversations)
+
     conversations = Property(list, fget=_get_conversations, notify=conversationsChanged)
 
     def _get_current_conversation(self) -> Dict[str, Any] | None:
-        return _conversation_to_dict(self.state.current_conversation)
+        return self._snapshot(
+            "currentConversation",
+            CURRENT_CONVERSATION,
+            lambda: _conversation_to_dict(self.state.current_conversation),
+        )
 
     currentConversation = Property("QVariant", fget=_get_current_conversation, notify=currentConversationChanged)
 
     def _get_stream_status(self) -> Dict[str, Any]:
-        return _stream_status_to_dict(self.state.stream_status)
+        return self._snapshot(
+            "streamStatus", STREAM_STATUS, lambda: _stream_status_to_dict(self.state.stream_status)
+        )
 
     streamStatus = Property("QVariant", fget=_get_stream_status, notify=streamStatusChanged)
 
     def _get_stage_data(self) -> Dict[str, Any]:
-        return _stage_payload_to_dict(self.state.stage_payloads)
+        return self._snapshot(
+            "stageData", STAGE_PAYLOADS, lambda: _stage_payload_to_dict(self.state.stage_payloads)
+        )
 
     stageData = Property("QVariant", fget=_get_stage_data, notify=stageDataChanged)
 
+    # List models (row-level updates for QML views) ----------------------
+    def _get_conversation_model(self) -> ConversationListModel:
+        return self._conversation_model
+
+    conversationModel = Property(QObject, fget=_get_conversation_model, constant=True)
+
+    def _get_message_model(self) -> MessageListModel:
+        return self._message_model
+
+    messageModel = Property(QObject, fget=_get_message_model, constant=True)
+
+    def _get_stage1_model(self) -> Stage1ListModel:
+        return self._stage1_model
+
+    stage1Model = Property(QObject, fget=_get_stage1_model, constant=True)
+
+    def _get_stage2_model(self) -> Stage2ListModel:
+        return self._stage2_model
+
+    stage2Model = Property(QObject, fget=_get_stage2_model, constant=True)
+
     def _get_backend_url(self) -> str:
         return self.state.backend_url
 
@@ -181,6 +282,11 @@ class QmlBridge(QObject):
         await self._wrap_errors(self.controller.select_conversation(conversation_id))
         return True
 
+    @asyncSlot(int, result=bool)
+    async def loadMessageStages(self, index: int) -> bool:
+        message = await self._wrap_errors(self.controller.load_message_stages(index))
+        return message is not None
+
     @asyncSlot(str, result=bool)
     async def sendMessage(self, content: str) -> bool:
         if not content or not content.strip():
@@ -193,7 +299,11 @@ class QmlBridge(QObject):
             return False
 
         task = await self._wrap_errors(
-            self.stream_runner.start(convo_id, content),
+            self.stream_runner.start(
+                convo_id,
+                content,
+                on_event=lambda event: self.controller.handle_stream_event(convo_id, event),
+            ),
             rethrow=True,
         )
         if isinstance(task, asyncio.Task):
@@ -212,6 +322,9 @@ class QmlBridge(QObject):
         if not backend_url:
             self.errorOccurred.emit("Backend URL is required")
             return False
+        if backend_url != self.state.backend_url:
+            # Cached conversations belong to the previous backend
+            self.controller.cache.clear()
         self.state.set_backend_url(backend_url)
         self.state.set_api_key(api_key)
         self.controller.api.update_config(base_url=backend_url, api_key=api_key)
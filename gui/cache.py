@@ -0,0 +1,174 @@
+"""Client-side cache of parsed conversations for the desktop GUI."""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from .models import AssistantMessage, Conversation, ConversationMetadata
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 32
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+
+def approximate_size(convo: Conversation) -> int:
+    """Rough in-memory footprint of a conversation, counted in text characters."""
+    size = len(convo.id) + len(convo.title) + len(convo.created_at)
+    for message in convo.messages:
+        if isinstance(message, AssistantMessage):
+            size += sum(len(item.model) + len(item.response) for item in message.stage1)
+            size += sum(len(item.model) + len(item.ranking) for item in message.stage2)
+            size += len(message.stage3.model) + len(message.stage3.response)
+        else:
+            size += len(message.content)
+    return size
+
+
+class ConversationCache:
+    """
+    LRU cache of parsed ``Conversation`` objects, bounded by entry count and
+    approximate size. With ``disk_dir`` set, entries and the conversation
+    list are mirrored to JSON files so they survive restarts; entries read
+    back from disk keep their ETag and count as unverified until the
+    backend confirms or replaces them (see ``needs_revalidation``).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        disk_dir: Path | None = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._entries: "OrderedDict[str, Conversation]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        # Entries read back from disk, not yet confirmed by the backend
+        self._unverified: Set[str] = set()
+        self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, conversation_id: str) -> bool:
+        return conversation_id in self._entries
+
+    # Memory tier ----------------------------------------------------------
+    def get(self, conversation_id: str) -> Optional[Conversation]:
+        convo = self._entries.get(conversation_id)
+        if convo is not None:
+            self._entries.move_to_end(conversation_id)
+            return convo
+        convo = self._read_disk(conversation_id)
+        if convo is not None:
+            self._store(convo)
+            self._unverified.add(conversation_id)
+        return convo
+
+    def needs_revalidation(self, conversation_id: str) -> bool:
+        """True for an entry loaded from disk that the backend has not confirmed yet."""
+        return conversation_id in self._unverified
+
+    def mark_verified(self, conversation_id: str) -> None:
+        self._unverified.discard(conversation_id)
+
+    def put(self, convo: Conversation) -> None:
+        self._store(convo)
+        self._unverified.discard(convo.id)
+        self._write_disk(convo)
+
+    def invalidate(self, conversation_id: str) -> None:
+        self._unverified.discard(conversation_id)
+        if conversation_id in self._entries:
+            del self._entries[conversation_id]
+            self.total_bytes -= self._sizes.pop(conversation_id, 0)
+        path = self._entry_path(conversation_id)
+        if path is not None and path.exists():
+            path.unlink()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._sizes.clear()
+        self._unverified.clear()
+        self.total_bytes = 0
+        if self.disk_dir is not None and self.disk_dir.exists():
+            for path in self.disk_dir.glob("*.json"):
+                path.unlink()
+
+    def _store(self, convo: Conversation) -> None:
+        if convo.id in self._entries:
+            self.total_bytes -= self._sizes.pop(convo.id, 0)
+        size = approximate_size(convo)
+        self._entries[convo.id] = convo
+        self._entries.move_to_end(convo.id)
+        self._sizes[convo.id] = size
+        self.total_bytes += size
+        # Evict least recently used, but always keep the newest entry
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes
+        ):
+            evicted, _ = self._entries.popitem(last=False)
+            self.total_bytes -= self._sizes.pop(evicted, 0)
+            self._unverified.discard(evicted)
+
+    # Disk tier ------------------------------------------------------------
+    def _entry_path(self, conversation_id: str) -> Path | None:
+        if self.disk_dir is None or not conversation_id or "/" in conversation_id or "\\" in conversation_id:
+            return None
+        return self.disk_dir / f"{conversation_id}.json"
+
+    def _read_disk(self, conversation_id: str) -> Optional[Conversation]:
+        path = self._entry_path(conversation_id)
+        if path is None or not path.exists():
+            return None
+        try:
+            data = json.loads(path.read_text())
+            convo = Conversation.from_dict(data)
+            convo.etag = data.get("etag")
+            return convo
+        except Exception:
+            logger.warning("Discarding unreadable cache entry %s", path)
+            path.unlink(missing_ok=True)
+            return None
+
+    def _write_disk(self, convo: Conversation) -> None:
+        path = self._entry_path(convo.id)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps({**convo.to_dict(), "etag": convo.etag}))
+        except OSError as exc:
+            logger.warning("Could not write cache entry %s: %s", path, exc)
+
+    def save_list(self, items: List[ConversationMetadata]) -> None:
+        """Remember the conversation list for the next startup."""
+        if self.disk_dir is None:
+            return
+        try:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            payload = [
+                {"id": m.id, "created_at": m.created_at, "title": m.title, "message_count": m.message_count}
+                for m in items
+            ]
+            (self.disk_dir / "index.list").write_text(json.dumps(payload))
+        except OSError as exc:
+            logger.warning("Could not write conversation list cache: %s", exc)
+
+    def load_list(self) -> List[ConversationMetadata]:
+        """Conversation list saved by the last session (empty if none)."""
+        if self.disk_dir is None:
+            return []
+        path = self.disk_dir / "index.list"
+        if not path.exists():
+            return []
+        try:
+            return [ConversationMetadata.from_dict(item) for item in json.loads(path.read_text())]
+        except Exception:
+            return []
@@ -0,0 +1,57 @@
+"""Frame-rate-limited delivery of stream events to AppState."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import List, Optional
+
+from .models import SSEEvent
+from .state import AppState
+
+# Events that end a stream are applied without waiting for the next frame
+IMMEDIATE_EVENTS = frozenset({"complete", "cancelled", "error"})
+
+
+class EventCoalescer:
+    """
+    Buffers SSE events and applies them to ``AppState`` at most once per frame.
+
+    The first event after an idle period arms a timer on the running loop
+    (a Qt timer under qasync); when it fires, everything buffered so far is
+    applied with ``AppState.apply_events`` so QML sees one notification per
+    frame instead of one per event. ``complete``/``cancelled``/``error``
+    flush right away. With ``interval <= 0`` events are applied as they arrive.
+    """
+
+    def __init__(self, state: AppState, interval: float):
+        self.state = state
+        self.interval = interval
+        self._pending: List[SSEEvent] = []
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self.flushes = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def push(self, event: SSEEvent) -> None:
+        self._pending.append(event)
+        if self.interval <= 0 or event.type in IMMEDIATE_EVENTS:
+            self.flush()
+        elif self._handle is None:
+            self._handle = asyncio.get_running_loop().call_later(self.interval, self.flush)
+
+    def flush(self) -> None:
+        """Apply everything buffered so far in one state mutation."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        self.flushes += 1
+        self.state.apply_events(batch)
+
+    def close(self) -> None:
+        """Flush what is buffered and stop the timer."""
+        self.flush()
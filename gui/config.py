@@ -8,6 +8,10 @@ DEFAULT_BACKEND_URL = "http://localhost:8001"
 CONFIG_DIR = Path.home() / ".llm-council"
 SETTINGS_FILE = CONFIG_DIR / "config.json"
 LOG_FILE = CONFIG_DIR / "gui.log"
+CACHE_DIR = CONFIG_DIR / "cache" / "conversations"
+
+# Stream events are applied to the UI state at most once per frame (seconds)
+STREAM_FRAME_INTERVAL = 0.033
 
 
 def ensure_dirs() -> None:
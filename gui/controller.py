@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
 import logging
 from typing import List, Optional
 
 from .api import CouncilAPI
-from .models import Conversation, ConversationMetadata, SSEEvent
+from .cache import ConversationCache
+from .models import AssistantMessage, Conversation, ConversationMetadata, SSEEvent
 from .state import AppState
 
 logger = logging.getLogger(__name__)
@@ -19,20 +21,111 @@ class GUIController:
     Keeps all side effects (network, state mutation) in one place.
     """
 
-    def __init__(self, api: CouncilAPI, state: AppState):
+    def __init__(self, api: CouncilAPI, state: AppState, cache: ConversationCache | None = None):
         self.api = api
         self.state = state
+        self.cache = cache if cache is not None else ConversationCache()
+        self._list_request: asyncio.Future | None = None
+
+    def restore_cached(self) -> List[ConversationMetadata]:
+        """Show the conversation list from the last session before the backend answers."""
+        items = self.cache.load_list()
+        if items and not self.state.conversations:
+            self.state.set_conversations(items)
+        return items
+
+    async def warm_up(self, prefetched: concurrent.futures.Future | None = None) -> bool:
+        """
+        Connect to the backend and load the conversation list in parallel.
+
+        ``prefetched`` is a list request already running elsewhere (see
+        ``startup.prefetch_conversations``); it is used instead of a new one
+        unless it failed. Failures are logged, not raised, and the UI's own
+        requests report them. Returns True if both steps succeeded.
+        """
+        if prefetched is not None:
+            self._list_request = asyncio.ensure_future(self._adopt_prefetched(prefetched))
+        results = await asyncio.gather(self.api.warm_up(), self.load_conversations(), return_exceptions=True)
+        errors = [r for r in results if isinstance(r, Exception)]
+        for exc in errors:
+            logger.warning("Backend warm-up failed: %s", exc)
+        return not errors
 
     async def load_conversations(self) -> List[ConversationMetadata]:
+        # Concurrent callers (warm-up and the UI) share one request
+        if self._list_request is None or self._list_request.done():
+            self._list_request = asyncio.ensure_future(self._fetch_conversations())
+        return await asyncio.shield(self._list_request)
+
+    async def _adopt_prefetched(self, prefetched: concurrent.futures.Future) -> List[ConversationMetadata]:
+        try:
+            items = await asyncio.wrap_future(prefetched)
+        except Exception as exc:
+            logger.info("Conversation prefetch failed (%s); fetching again", exc)
+            return await self._fetch_conversations()
+        self.state.set_conversations(items)
+        self.cache.save_list(items)
+        return items
+
+    async def _fetch_conversations(self) -> List[ConversationMetadata]:
         items = await self.api.list_conversations()
         self.state.set_conversations(items)
+        self.cache.save_list(items)
         return items
 
     async def select_conversation(self, conversation_id: str) -> Optional[Conversation]:
-        convo = await self.api.get_conversation(conversation_id)
+        convo = self.cache.get(conversation_id)
+        if convo is None:
+            # Only the latest assistant message's stages are rendered up front
+            convo = await self.api.get_conversation(conversation_id, fields="summary", expand="last")
+            self.cache.put(convo)
         self.state.set_current_conversation(convo)
+        if self.cache.needs_revalidation(conversation_id):
+            # Shown right away, but it may predate changes made elsewhere
+            convo = await self._revalidate(convo)
         return convo
 
+    async def _revalidate(self, cached: Conversation) -> Conversation:
+        """Check a disk-cached conversation against the backend (If-None-Match)."""
+        try:
+            fresh = await self.api.revalidate_conversation(
+                cached.id, cached.etag, fields="summary", expand="last"
+            )
+        except Exception as exc:
+            # Offline: keep showing the cached copy and try again next time
+            logger.info("Could not revalidate conversation %s: %s", cached.id, exc)
+            return cached
+        if fresh is None:
+            self.cache.mark_verified(cached.id)
+            return cached
+        self.cache.put(fresh)
+        if self.state.current_conversation is cached:
+            self.state.set_current_conversation(fresh)
+        return fresh
+
+    def handle_stream_event(self, conversation_id: str, event: SSEEvent) -> None:
+        """Drop cached copies that a streamed turn has made stale."""
+        # A cancelled turn is stored too (with whatever stages finished)
+        if event.type in ("complete", "title_complete", "cancelled", "error"):
+            self.cache.invalidate(conversation_id)
+        if event.type == "title_complete":
+            self.cache.save_list(self.state.conversations)
+
+    async def load_message_stages(self, index: int) -> Optional[AssistantMessage]:
+        """Fetch Stage 1/2 for an assistant message that was loaded in summary form."""
+        convo = self.state.current_conversation
+        if convo is None or not 0 <= index < len(convo.messages):
+            return None
+        message = convo.messages[index]
+        if not isinstance(message, AssistantMessage):
+            return None
+        if message.stages_loaded:
+            return message
+        full = await self.api.get_message_stages(convo.id, index)
+        self.state.replace_message(convo.id, index, full)
+        self.cache.put(convo)
+        return full
+
     async def create_conversation(self) -> Conversation:
         convo = await self.api.create_conversation()
         # Prepend new conversation to state list
@@ -42,6 +135,8 @@ class GUIController:
         new_list.extend(self.state.conversations)
         self.state.set_conversations(new_list)
         self.state.set_current_conversation(convo)
+        self.cache.put(convo)
+        self.cache.save_list(new_list)
         return convo
 
     async def send_and_stream(self, conversation_id: str, content: str) -> List[SSEEvent]:
@@ -55,6 +150,7 @@ class GUIController:
             async for event in self.api.stream_message(conversation_id, content):
                 events.append(event)
                 self.state.apply_event(event)
+                self.handle_stream_event(conversation_id, event)
                 if event.type == "complete":
                     break
         except Exception as exc:  # pragma: no cover - safety net
@@ -0,0 +1,192 @@
+"""QAbstractListModel adapters exposing AppState collections to QML.
+
+Each model keeps a reference to the underlying Python objects and answers
+role lookups lazily, so QML reads one field of one row instead of a freshly
+serialized list. ``set_items`` diffs the new list against the current one
+and emits row-level insert/remove/change signals, so delegates are only
+rebuilt for rows that actually changed.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Hashable, List, Sequence, Tuple
+
+from PySide6.QtCore import QAbstractListModel, QByteArray, QModelIndex, Property, Qt, Signal
+
+from .models import AssistantMessage, ConversationMetadata, Stage1Response, Stage2Ranking, UserMessage
+
+RoleGetter = Callable[[Any], Any]
+
+
+class ObjectListModel(QAbstractListModel):
+    """List model over Python objects with named roles computed on demand."""
+
+    countChanged = Signal()
+
+    # Subclasses define (role name, getter) pairs and a row key function
+    ROLES: Sequence[Tuple[str, RoleGetter]] = ()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items: List[Any] = []
+        self._keys: List[Hashable] = []
+        self._getters: Dict[int, RoleGetter] = {}
+        self._role_names: Dict[int, QByteArray] = {}
+        for offset, (name, getter) in enumerate(self.ROLES):
+            role = Qt.UserRole + 1 + offset
+            self._getters[role] = getter
+            self._role_names[role] = QByteArray(name.encode("utf-8"))
+
+    # Qt model API -----------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()) -> int:  # noqa: N802 - Qt naming
+        if parent.isValid():
+            return 0
+        return len(self._items)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._items):
+            return None
+        getter = self._getters.get(role)
+        if getter is None:
+            return None
+        return getter(self._items[index.row()])
+
+    def roleNames(self):  # noqa: N802 - Qt naming
+        return self._role_names
+
+    def _get_count(self) -> int:
+        return len(self._items)
+
+    count = Property(int, fget=_get_count, notify=countChanged)
+
+    # Python API -------------------------------------------------------------
+    def items(self) -> List[Any]:
+        return list(self._items)
+
+    def key(self, item: Any, row: int) -> Hashable:
+        """Row identity used to match old and new rows (default: position)."""
+        return row
+
+    def set_items(self, items: Sequence[Any]) -> None:
+        """Replace the rows, emitting the minimal insert/remove/change signals."""
+        new_items = list(items)
+        new_keys = [self.key(item, row) for row, item in enumerate(new_items)]
+        old_keys = self._keys
+        previous_count = len(self._items)
+        if len(set(new_keys)) != len(new_keys):
+            # Ambiguous identities: fall back to a full reset
+            self.beginResetModel()
+            self._items, self._keys = new_items, new_keys
+            self.endResetModel()
+            self._emit_count(previous_count)
+            return
+
+        # Matching prefix and suffix by key; whatever is between them is replaced
+        prefix = 0
+        limit = min(len(old_keys), len(new_keys))
+        while prefix < limit and old_keys[prefix] == new_keys[prefix]:
+            prefix += 1
+        suffix = 0
+        while (
+            suffix < limit - prefix
+            and old_keys[len(old_keys) - 1 - suffix] == new_keys[len(new_keys) - 1 - suffix]
+        ):
+            suffix += 1
+
+        removed = len(old_keys) - prefix - suffix
+        inserted = len(new_keys) - prefix - suffix
+        if removed:
+            self.beginRemoveRows(QModelIndex(), prefix, prefix + removed - 1)
+            del self._items[prefix:prefix + removed]
+            del self._keys[prefix:prefix + removed]
+            self.endRemoveRows()
+        if inserted:
+            self.beginInsertRows(QModelIndex(), prefix, prefix + inserted - 1)
+            self._items[prefix:prefix] = new_items[prefix:prefix + inserted]
+            self._keys[prefix:prefix] = new_keys[prefix:prefix + inserted]
+            self.endInsertRows()
+
+        # Rows kept by key may still have new content
+        for row, item in enumerate(new_items):
+            if prefix <= row < prefix + inserted:
+                continue
+            if self._items[row] is not item:
+                changed = self._items[row] != item
+                self._items[row] = item
+                if changed:
+                    index = self.index(row, 0)
+                    self.dataChanged.emit(index, index)
+        self._emit_count(previous_count)
+
+    def _emit_count(self, previous: int) -> None:
+        if previous != len(self._items):
+            self.countChanged.emit()
+
+
+class ConversationListModel(ObjectListModel):
+    """Sidebar conversations; the streaming flag is tracked per row."""
+
+    ROLES = (
+        ("conversationId", lambda row: row[0].id),
+        ("title", lambda row: row[0].title),
+        ("messageCount", lambda row: row[0].message_count),
+        ("streaming", lambda row: row[1]),
+    )
+
+    def key(self, item: Tuple[ConversationMetadata, bool], row: int) -> Hashable:
+        return item[0].id
+
+    def set_conversations(self, items: Sequence[ConversationMetadata], streaming_id: str | None) -> None:
+        # Copies, so in-place edits (e.g., titles) show up as row changes
+        self.set_items([
+            (ConversationMetadata(m.id, m.created_at, m.title, m.message_count), m.id == streaming_id)
+            for m in items
+        ])
+
+
+def _is_assistant(message) -> bool:
+    return isinstance(message, AssistantMessage)
+
+
+class MessageListModel(ObjectListModel):
+    """Messages of the current conversation (Stage 3 only; stages via the stage models)."""
+
+    ROLES = (
+        ("role", lambda m: "assistant" if _is_assistant(m) else getattr(m, "role", "user")),
+        ("content", lambda m: m.stage3.response if _is_assistant(m) else m.content),
+        ("chairman", lambda m: m.stage3.model if _is_assistant(m) else ""),
+        ("stagesLoaded", lambda m: m.stages_loaded if _is_assistant(m) else True),
+        ("stage1Count", lambda m: len(m.stage1) if _is_assistant(m) else 0),
+    )
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._conversation_id: str | None = None
+
+    def key(self, item, row: int) -> Hashable:
+        return (self._conversation_id, row)
+
+    def set_messages(self, conversation_id: str | None, messages: Sequence[AssistantMessage | UserMessage]) -> None:
+        self._conversation_id = conversation_id
+        self.set_items(messages)
+
+
+class Stage1ListModel(ObjectListModel):
+    ROLES = (
+        ("modelName", lambda r: r.model),
+        ("response", lambda r: r.response),
+    )
+
+    def key(self, item: Stage1Response, row: int) -> Hashable:
+        return item.model
+
+
+class Stage2ListModel(ObjectListModel):
+    ROLES = (
+        ("modelName", lambda r: r.model),
+        ("ranking", lambda r: r.ranking),
+        ("parsedRanking", lambda r: list(r.parsed_ranking)),
+    )
+
+    def key(self, item: Stage2Ranking, row: int) -> Hashable:
+        return item.model
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import Any, Dict, List, Optional, Union
 
 
@@ -53,14 +53,17 @@ class AssistantMessage:
     stage2: List[Stage2Ranking]
     stage3: Stage3Result
     metadata: Dict[str, Any] | None = None
+    # False when the backend sent the summary form (Stage 1/2 fetched on demand)
+    stages_loaded: bool = True
 
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> "AssistantMessage":
         return AssistantMessage(
-            stage1=[Stage1Response.from_dict(x) for x in data.get("stage1", [])],
-            stage2=[Stage2Ranking.from_dict(x) for x in data.get("stage2", [])],
-            stage3=Stage3Result.from_dict(data.get("stage3", {})),
+            stage1=[Stage1Response.from_dict(x) for x in data.get("stage1") or []],
+            stage2=[Stage2Ranking.from_dict(x) for x in data.get("stage2") or []],
+            stage3=Stage3Result.from_dict(data.get("stage3") or {}),
             metadata=data.get("metadata"),
+            stages_loaded=not data.get("stages_omitted", False),
         )
 
 
@@ -103,6 +106,8 @@ class Conversation:
     created_at: str
     title: str
     messages: List[Message]
+    # ETag of the response this was parsed from, for revalidating cached copies
+    etag: Optional[str] = field(default=None, compare=False, repr=False)
 
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> "Conversation":
@@ -120,6 +125,25 @@ class Conversation:
             messages=parsed_messages,
         )
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Inverse of :meth:`from_dict` (backend wire format)."""
+        messages: List[Dict[str, Any]] = []
+        for msg in self.messages:
+            if isinstance(msg, AssistantMessage):
+                item: Dict[str, Any] = {
+                    "role": "assistant",
+                    "stage1": [asdict(x) for x in msg.stage1],
+                    "stage2": [asdict(x) for x in msg.stage2],
+                    "stage3": asdict(msg.stage3),
+                    "metadata": msg.metadata,
+                }
+                if not msg.stages_loaded:
+                    item["stages_omitted"] = True
+                messages.append(item)
+            else:
+                messages.append({"role": msg.role, "content": msg.content})
+        return {"id": self.id, "created_at": self.created_at, "title": self.title, "messages": messages}
+
 
 @dataclass
 class AggregateRank:
@@ -143,4 +167,6 @@ class SSEEvent:
     type: str
     data: Optional[Dict[str, Any]] = None
     metadata: Optional[Dict[str, Any]] = None
+    # Only set for payloads that are not JSON objects
     raw: str | None = None
+    id: str | None = None
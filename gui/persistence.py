@@ -14,6 +14,8 @@ class Settings:
     backend_url: str = DEFAULT_BACKEND_URL
     api_key: Optional[str] = None
     theme: str = "dark"
+    # Mirror viewed conversations to ~/.llm-council/cache for fast startup
+    disk_cache: bool = True
 
 
 def load_settings() -> Settings:
@@ -26,6 +28,7 @@ def load_settings() -> Settings:
             backend_url=data.get("backend_url", DEFAULT_BACKEND_URL),
             api_key=data.get("api_key"),
             theme=data.get("theme", "dark"),
+            disk_cache=bool(data.get("disk_cache", True)),
         )
     except Exception:
         return Settings()
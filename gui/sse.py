@@ -0,0 +1,123 @@
+"""Incremental Server-Sent Events decoder.
+
+Implements the event-stream parsing rules of the HTML spec over raw byte
+chunks: CR, LF and CRLF line endings (also split across chunks), comments,
+multi-line ``data``, ``event``, ``id`` and ``retry`` fields. Data lines are
+kept as bytes and joined once per event, so a payload is never rebuilt by
+repeated string concatenation and can be handed to the JSON parser as is.
+"""
+
+from __future__ import annotations
+
+from typing import List, NamedTuple, Optional
+
+_BOM = b"\xef\xbb\xbf"
+
+
+class ServerSentEvent(NamedTuple):
+    """One dispatched event; ``data`` holds the joined ``data`` lines (UTF-8)."""
+
+    data: bytes
+    event: str = "message"
+    id: Optional[str] = None
+    retry: Optional[int] = None
+
+
+# Builds events without the Python-level NamedTuple constructor (hot path)
+_new_event = tuple.__new__
+
+
+class SSEDecoder:
+    """
+    Feed byte chunks, get complete events back.
+
+    Bytes are buffered until a blank line completes an event, and each
+    completed event is parsed in one go; the common single ``data:`` line
+    event takes a fast path. ``last_event_id`` and ``retry`` persist across
+    events, as the spec requires; an event left incomplete when the stream
+    ends is discarded.
+    """
+
+    def __init__(self) -> None:
+        self._pending: List[bytes] = []  # bytes of the current, incomplete event
+        self._started = False
+        self._skip_lf = False  # previous chunk ended with CR
+        self.last_event_id: str | None = None
+        self.retry: int | None = None
+
+    def feed(self, chunk: bytes) -> List[ServerSentEvent]:
+        """Consume a chunk and return the events it completed."""
+        if self._skip_lf and chunk[:1] == b"\n":
+            chunk = chunk[1:]
+        self._skip_lf = False
+        if not chunk:
+            return []
+        if not self._started:
+            head = b"".join(self._pending) + chunk
+            if len(head) < len(_BOM) and _BOM.startswith(head):
+                self._pending = [head]
+                return []
+            self._pending = []
+            chunk = head[len(_BOM):] if head.startswith(_BOM) else head
+            self._started = True
+
+        has_cr = b"\r" in chunk
+        if not has_cr and b"\n" not in chunk:
+            # No line ends here, so no event can complete: defer the join
+            self._pending.append(chunk)
+            return []
+        if has_cr:
+            # A CR at the very end may be the first half of a CRLF
+            self._skip_lf = chunk.endswith(b"\r")
+            chunk = chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        if self._pending:
+            self._pending.append(chunk)
+            chunk = b"".join(self._pending)
+            self._pending = []
+        cut = chunk.rfind(b"\n\n")
+        if cut == -1:
+            self._pending.append(chunk)
+            return []
+        if cut + 2 < len(chunk):
+            self._pending.append(chunk[cut + 2:])
+
+        events: List[ServerSentEvent] = []
+        for block in chunk[:cut].split(b"\n\n"):
+            if block[:6] == b"data: " and b"\n" not in block:
+                # One data line and nothing else: the usual shape
+                events.append(_new_event(ServerSentEvent, (block[6:], "message", self.last_event_id, self.retry)))
+            else:
+                self._parse_block(block, events)
+        return events
+
+    def _parse_block(self, block: bytes, events: List[ServerSentEvent]) -> None:
+        """Parse the lines of one event block, dispatching at blank lines and at its end."""
+        data: List[bytes] = []
+        event_name: Optional[str] = None
+        for line in block.split(b"\n") + [b""]:
+            if not line:
+                if data:
+                    events.append(_new_event(ServerSentEvent, (
+                        data[0] if len(data) == 1 else b"\n".join(data),
+                        event_name or "message",
+                        self.last_event_id,
+                        self.retry,
+                    )))
+                    data = []
+                event_name = None
+                continue
+            if line[:1] == b":":
+                continue  # comment
+            name, sep, value = line.partition(b":")
+            if sep and value[:1] == b" ":
+                value = value[1:]
+            if name == b"data":
+                data.append(value)
+            elif name == b"event":
+                event_name = value.decode("utf-8", "replace")
+            elif name == b"id":
+                if b"\x00" not in value:
+                    self.last_event_id = value.decode("utf-8", "replace")
+            elif name == b"retry":
+                if value.isdigit():
+                    self.retry = int(value)
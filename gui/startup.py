@@ -0,0 +1,68 @@
+"""Startup helpers: phase timing and a conversation-list prefetch thread."""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import Callable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfile:
+    """
+    Records named startup phases with their duration and elapsed time.
+
+    Marks are cheap and always recorded; ``--profile-startup`` prints the
+    report once the first frame is shown and the conversation list loaded.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._start = clock()
+        self._last = self._start
+        self.phases: List[Tuple[str, float, float]] = []  # (name, duration, elapsed) in seconds
+
+    def mark(self, name: str) -> None:
+        now = self._clock()
+        self.phases.append((name, now - self._last, now - self._start))
+        self._last = now
+        logger.debug("startup: %s after %.1f ms", name, (now - self._start) * 1000)
+
+    def has(self, name: str) -> bool:
+        return any(phase == name for phase, _, _ in self.phases)
+
+    def report(self) -> str:
+        lines = [f"{'phase':<28} {'ms':>8} {'elapsed':>8}"]
+        for name, duration, elapsed in self.phases:
+            lines.append(f"{name:<28} {duration * 1000:>8.1f} {elapsed * 1000:>8.1f}")
+        return "\n".join(lines)
+
+
+def prefetch_conversations(base_url: str, api_key: str | None) -> concurrent.futures.Future:
+    """
+    Fetch the conversation list on a worker thread with its own event loop.
+
+    Started before Qt and QML are set up, so the HTTP client import and the
+    request overlap with them. The future resolves to ``ConversationMetadata``
+    items (or the request's exception).
+    """
+    future: concurrent.futures.Future = concurrent.futures.Future()
+
+    def run() -> None:
+        try:
+            from .api import CouncilAPI
+
+            async def fetch():
+                async with CouncilAPI(base_url=base_url, api_key=api_key) as api:
+                    return await api.list_conversations()
+
+            future.set_result(asyncio.run(fetch()))
+        except BaseException as exc:  # surfaced to whoever awaits the future
+            future.set_exception(exc)
+
+    threading.Thread(target=run, name="conversation-prefetch", daemon=True).start()
+    return future
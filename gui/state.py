@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
 
 from . import config
 from .models import (
@@ -17,6 +17,17 @@ from .models import (
 )
 
 
+# Change topics: subscribers can ask to hear about only some of them
+CONVERSATIONS = "conversations"
+CURRENT_CONVERSATION = "current_conversation"
+STREAM_STATUS = "stream_status"
+STAGE_PAYLOADS = "stage_payloads"
+SETTINGS = "settings"
+ALL_TOPICS: FrozenSet[str] = frozenset(
+    {CONVERSATIONS, CURRENT_CONVERSATION, STREAM_STATUS, STAGE_PAYLOADS, SETTINGS}
+)
+
+
 @dataclass
 class StreamStatus:
     in_flight: bool = False
@@ -42,6 +53,8 @@ class AppState:
     """
     Lightweight state store with subscription callbacks.
     This avoids tight coupling to Qt; signals can be attached later.
+
+    Mutators only notify about topics whose value actually changed.
     """
 
     def __init__(self, backend_url: str | None = None, api_key: str | None = None):
@@ -51,105 +64,188 @@ class AppState:
         self.current_conversation: Optional[Conversation] = None
         self.stream_status = StreamStatus()
         self.stage_payloads = StagePayloads()
-        self._subscribers: List[Callable[[], None]] = []
+        self._subscribers: List[Tuple[Callable, Optional[FrozenSet[str]]]] = []
 
     # Subscription -------------------------------------------------------
-    def subscribe(self, callback: Callable[[], None]) -> None:
-        """Register a callback that fires after state changes."""
-        self._subscribers.append(callback)
+    def subscribe(self, callback: Callable, topics: Iterable[str] | None = None) -> None:
+        """
+        Register a callback that fires after state changes.
 
-    def _notify(self) -> None:
-        for cb in list(self._subscribers):
-            cb()
+        Without ``topics`` the callback takes no arguments and fires on any
+        change. With ``topics`` it fires only when one of them changed and
+        receives the set of changed topics.
+        """
+        self._subscribers.append((callback, frozenset(topics) if topics is not None else None))
+
+    def _notify(self, *topics: str) -> None:
+        changed: Set[str] = set(topics) if topics else set(ALL_TOPICS)
+        if not changed:
+            return
+        for cb, wanted in list(self._subscribers):
+            if wanted is None:
+                cb()
+            elif changed & wanted:
+                cb(frozenset(changed & wanted))
 
     # Mutators -----------------------------------------------------------
     def set_backend_url(self, url: str) -> None:
+        if url == self.backend_url:
+            return
         self.backend_url = url
-        self._notify()
+        self._notify(SETTINGS)
 
     def set_api_key(self, api_key: str | None) -> None:
+        if api_key == self.api_key:
+            return
         self.api_key = api_key
-        self._notify()
+        self._notify(SETTINGS)
 
     def set_conversations(self, items: List[ConversationMetadata]) -> None:
+        if items == self.conversations:
+            self.conversations = items
+            return
         self.conversations = items
-        self._notify()
+        self._notify(CONVERSATIONS)
 
     def set_current_conversation(self, convo: Optional[Conversation]) -> None:
         self.current_conversation = convo
+        previous_payloads = self.stage_payloads
         if convo:
             self.stage_payloads = self._stage_payloads_from_conversation(convo)
         else:
             self.reset_stage_payloads()
-        self._notify()
+        changed = [CURRENT_CONVERSATION]
+        if self.stage_payloads != previous_payloads:
+            changed.append(STAGE_PAYLOADS)
+        self._notify(*changed)
+
+    def replace_message(self, conversation_id: str, index: int, message: AssistantMessage) -> None:
+        """Swap in a fully loaded message (e.g., after fetching its stages on demand)."""
+        convo = self.current_conversation
+        if convo is None or convo.id != conversation_id or not 0 <= index < len(convo.messages):
+            return
+        convo.messages[index] = message
+        self._notify(CURRENT_CONVERSATION)
 
     def start_stream(self) -> None:
+        previous_payloads = self.stage_payloads
         self.stream_status = StreamStatus(in_flight=True, current_stage="starting", error=None)
         self.reset_stage_payloads()
-        self._notify()
+        changed = [STREAM_STATUS]
+        if self.stage_payloads != previous_payloads:
+            changed.append(STAGE_PAYLOADS)
+        self._notify(*changed)
 
     def apply_event(self, event: SSEEvent) -> None:
-        self.stream_status.in_flight = True
-        self.stream_status.current_stage = event.type
-        self.stream_status.last_event = event.type
-        if event.type == "error":
+        self.apply_events([event])
+
+    def apply_events(self, events: Sequence[SSEEvent]) -> None:
+        """
+        Apply a batch of stream events as one mutation with one notification.
+
+        An ``error`` event ends the batch: the events before it are published,
+        then the stream is marked failed.
+        """
+        previous_status = replace(self.stream_status)
+        changed: Set[str] = set()
+        error: SSEEvent | None = None
+        for event in events:
+            self.stream_status.in_flight = True
+            self.stream_status.current_stage = event.type
+            self.stream_status.last_event = event.type
+            if event.type == "error":
+                error = event
+                break
+            changed |= self._apply_stage_payload(event)
+        if error is not None:
+            # fail_stream publishes the status itself
+            if changed:
+                self._notify(*changed)
             message = ""
-            if event.data and isinstance(event.data, dict):
-                message = event.data.get("message") or ""
+            if error.data and isinstance(error.data, dict):
+                message = error.data.get("message") or ""
             self.fail_stream(message or "Streaming error")
             return
-        self._apply_stage_payload(event)
-        self._notify()
+        if self.stream_status != previous_status:
+            changed.add(STREAM_STATUS)
+        if changed:
+            self._notify(*changed)
+
+    def _set_stream_status(self, status: StreamStatus) -> None:
+        if status == self.stream_status:
+            return
+        self.stream_status = status
+        self._notify(STREAM_STATUS)
 
     def end_stream(self) -> None:
-        self.stream_status = StreamStatus(
+        self._set_stream_status(StreamStatus(
             in_flight=False, current_stage=None, last_event="complete", cancelled=False, error=None
-        )
-        self._notify()
+        ))
 
     def cancel_stream(self) -> None:
-        self.stream_status = StreamStatus(
+        self._set_stream_status(StreamStatus(
             in_flight=False, current_stage=None, last_event="cancelled", cancelled=True, error=None
-        )
-        self._notify()
+        ))
 
     def fail_stream(self, message: str) -> None:
-        self.stream_status = StreamStatus(
+        self._set_stream_status(StreamStatus(
             in_flight=False,
             current_stage=None,
             last_event="error",
             cancelled=False,
             error=message,
-        )
-        self._notify()
+        ))
 
     # Stage data helpers ------------------------------------------------
     def reset_stage_payloads(self) -> None:
         self.stage_payloads = StagePayloads(title=self.current_conversation.title if self.current_conversation else None)
 
-    def _apply_stage_payload(self, event: SSEEvent) -> None:
+    def _apply_stage_payload(self, event: SSEEvent) -> Set[str]:
+        """Apply a stage event to the payloads; returns the topics it changed."""
         if event.type == "stage1_complete" and event.data is not None:
             self.stage_payloads.stage1 = [Stage1Response.from_dict(item) for item in event.data or []]
+        elif event.type == "stage1_model_complete" and event.data:
+            # One council member's answer, shown before the rest arrive
+            response = Stage1Response.from_dict(event.data)
+            self.stage_payloads.stage1 = [
+                item for item in self.stage_payloads.stage1 if item.model != response.model
+            ] + [response]
+        elif event.type == "stage2_model_complete" and event.data:
+            ranking = Stage2Ranking.from_dict(event.data)
+            self.stage_payloads.stage2 = [
+                item for item in self.stage_payloads.stage2 if item.model != ranking.model
+            ] + [ranking]
         elif event.type == "stage2_complete":
             self.stage_payloads.stage2 = [Stage2Ranking.from_dict(item) for item in event.data or []]
             meta = event.metadata or {}
             self.stage_payloads.label_to_model = meta.get("label_to_model", {}) or {}
             self.stage_payloads.aggregate_rankings = meta.get("aggregate_rankings", []) or []
+        elif event.type == "cancelled" and event.data:
+            # Stage 1 results the backend kept when the run was stopped
+            self.stage_payloads.stage1 = [Stage1Response.from_dict(item) for item in event.data]
         elif event.type == "stage3_complete" and event.data is not None:
             self.stage_payloads.stage3 = Stage3Result.from_dict(event.data or {})
         elif event.type == "title_complete":
             title = (event.data or {}).get("title") if event.data else None
             if title:
                 self.stage_payloads.title = title
-                self._apply_title_to_state(title)
+                return {STAGE_PAYLOADS} | self._apply_title_to_state(title)
+            return set()
+        else:
+            return set()
+        return {STAGE_PAYLOADS}
 
-    def _apply_title_to_state(self, title: str) -> None:
+    def _apply_title_to_state(self, title: str) -> Set[str]:
+        changed: Set[str] = set()
         if self.current_conversation:
             self.current_conversation.title = title
+            changed.add(CURRENT_CONVERSATION)
             for meta in self.conversations:
                 if meta.id == self.current_conversation.id:
                     meta.title = title
+                    changed.add(CONVERSATIONS)
                     break
+        return changed
 
     def _stage_payloads_from_conversation(self, convo: Conversation) -> StagePayloads:
         payloads = StagePayloads(title=convo.title)
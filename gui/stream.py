@@ -3,21 +3,34 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Awaitable, Callable, List, Optional
+import logging
+from typing import Awaitable, Callable, List, Optional, Tuple
 
+from . import config
 from .api import CouncilAPI
+from .coalescer import EventCoalescer
 from .models import SSEEvent
 from .state import AppState
 
+logger = logging.getLogger(__name__)
+
 EventCallback = Callable[[SSEEvent], Awaitable[None]] | Callable[[SSEEvent], None]
 
+# Events after which the backend closes the stream
+FINAL_EVENTS = frozenset({"complete", "cancelled"})
+
 
 class StreamRunner:
-    def __init__(self, api: CouncilAPI, state: AppState):
+    def __init__(self, api: CouncilAPI, state: AppState, frame_interval: float = config.STREAM_FRAME_INTERVAL):
         self.api = api
         self.state = state
+        # Events are batched per frame before they reach the state (0 disables batching)
+        self.frame_interval = frame_interval
         self._task: Optional[asyncio.Task] = None
         self._cancel_event: Optional[asyncio.Event] = None
+        # (conversation id, run id) of the backend run being streamed
+        self._run: Optional[Tuple[str, str]] = None
+        self._on_event: EventCallback | None = None
 
     async def start(
         self,
@@ -31,52 +44,85 @@ class StreamRunner:
         """Start streaming; cancels previous stream if running. Retries on failure."""
         await self.cancel()
         self._cancel_event = asyncio.Event()
+        self._on_event = on_event
 
         async def runner():
             self.state.start_stream()
+            coalescer = EventCoalescer(self.state, self.frame_interval)
             events: List[SSEEvent] = []
             attempt = 0
-            while True:
-                try:
-                    async for event in self.api.stream_message(
-                        conversation_id, content, cancel_event=self._cancel_event
-                    ):
-                        events.append(event)
-                        if on_event:
-                            res = on_event(event)
-                            if asyncio.iscoroutine(res):
-                                await res
-                        self.state.apply_event(event)
-                        if event.type == "complete":
-                            break
-                    # Success path, exit retry loop
-                    if self._cancel_event and self._cancel_event.is_set():
-                        self.state.cancel_stream()
-                    else:
-                        self.state.end_stream()
-                    return events
-                except Exception as exc:
-                    attempt += 1
-                    if self._cancel_event and self._cancel_event.is_set():
-                        self.state.cancel_stream()
-                        return events
-                    if attempt > retries:
-                        self.state.fail_stream(str(exc))
+            try:
+                while True:
+                    try:
+                        async for event in self.api.stream_message(
+                            conversation_id, content, cancel_event=self._cancel_event
+                        ):
+                            if event.type == "run_started":
+                                self._run = (conversation_id, (event.data or {}).get("run_id"))
+                            events.append(event)
+                            if on_event:
+                                res = on_event(event)
+                                if asyncio.iscoroutine(res):
+                                    await res
+                            coalescer.push(event)
+                            if event.type in FINAL_EVENTS:
+                                break
+                        coalescer.flush()
+                        # Success path, exit retry loop
+                        cancelled = events and events[-1].type == "cancelled"
+                        if cancelled or (self._cancel_event and self._cancel_event.is_set()):
+                            self.state.cancel_stream()
+                        else:
+                            self.state.end_stream()
                         return events
-                    await asyncio.sleep(backoff * attempt)
+                    except Exception as exc:
+                        coalescer.flush()
+                        attempt += 1
+                        if self._cancel_event and self._cancel_event.is_set():
+                            self.state.cancel_stream()
+                            return events
+                        if attempt > retries:
+                            self.state.fail_stream(str(exc))
+                            return events
+                        await asyncio.sleep(backoff * attempt)
+            finally:
+                coalescer.close()
+                self._run = None
 
         self._task = asyncio.create_task(runner())
         return self._task
 
     async def cancel(self) -> None:
-        """Signal cancellation and wait for current task to settle."""
+        """
+        Stop reading the stream, cancel the backend run and wait for the task to settle.
+
+        No further events are applied once this is called, even while the
+        backend cancel is in flight. The backend then cancels the run's
+        upstream calls and keeps the finished stages; dropping the connection
+        alone would leave them running.
+        """
+        run, self._run = self._run, None
+        running = self._task is not None and not self._task.done()
         if self._cancel_event and not self._cancel_event.is_set():
             self._cancel_event.set()
+        if run and run[1] and running:
+            try:
+                await self.api.cancel_run(*run)
+            except Exception as exc:
+                # The backend won't end the stream for us
+                logger.warning("Could not cancel run %s: %s", run[1], exc)
+                self._task.cancel()
         if self._task:
             try:
                 await self._task
             except asyncio.CancelledError:
                 # Surface cancelled state to observers
                 self.state.cancel_stream()
+        if running and self._on_event:
+            # The backend's own cancelled event is no longer read
+            res = self._on_event(SSEEvent(type="cancelled"))
+            if asyncio.iscoroutine(res):
+                await res
         self._task = None
         self._cancel_event = None
+        self._on_event = None
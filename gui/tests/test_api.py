@@ -99,6 +99,19 @@ def test_parse_event_handles_invalid_json():
     assert ev.type == "raw"
 
 
+def test_parse_event_expands_compact_keys():
+    ev = CouncilAPI._parse_event('{"t":"stage1_complete","d":[{"o":"m1","r":"hi"}]}')
+    assert ev.type == "stage1_complete"
+    assert ev.data == [{"model": "m1", "response": "hi"}]
+
+
+def test_compact_keys_match_the_backend_encoding():
+    from backend import events
+    from gui import api
+
+    assert api.COMPACT_KEYS == events.EXPANDED_KEYS
+
+
 @pytest.mark.asyncio
 async def test_stream_message_honors_cancel_event():
     transport = _mock_transport(with_long_stream=True)
@@ -111,3 +124,100 @@ async def test_stream_message_honors_cancel_event():
             cancel.set()  # cancel after first event
         # Only the first event should be received because cancel stops the loop
         assert events == ["stage1_start"]
+
+
+@pytest.mark.asyncio
+async def test_conditional_gets_reuse_cached_body():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(
+            200,
+            json=[{"id": "c1", "created_at": "2024-01-01T00:00:00Z", "title": "One", "message_count": 2}],
+            headers={"ETag": '"v1"'},
+        )
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        api = CouncilAPI(base_url="http://test", client=client)
+        first = await api.list_conversations()
+        second = await api.list_conversations()
+
+        assert seen == [None, '"v1"']
+        assert [c.title for c in second] == [c.title for c in first] == ["One"]
+        assert second[0] is not first[0]
+
+        # Changing the backend drops validators
+        api.update_config(base_url="http://other")
+        await api.list_conversations()
+        assert seen[-1] is None
+
+
+@pytest.mark.asyncio
+async def test_revalidate_conversation_uses_an_etag_from_elsewhere():
+    seen = []
+    version = {"etag": '"v1"', "title": "One"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == version["etag"]:
+            return httpx.Response(304, headers={"ETag": version["etag"]})
+        body = {"id": "c1", "created_at": "2024-01-01T00:00:00Z", "title": version["title"], "messages": []}
+        return httpx.Response(200, json=body, headers={"ETag": version["etag"]})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        # A fresh client (new session) with only the disk cache's ETag
+        api = CouncilAPI(base_url="http://test", client=client)
+        assert await api.revalidate_conversation("c1", '"v1"', fields="summary") is None
+        assert seen == ['"v1"']
+
+        version.update(etag='"v2"', title="Renamed")
+        fresh = await api.revalidate_conversation("c1", '"v1"', fields="summary")
+        assert fresh.title == "Renamed"
+        assert fresh.etag == '"v2"'
+
+        fetched = await api.get_conversation("c1", fields="summary")
+        assert fetched.etag == '"v2"' and seen[-1] == '"v2"'
+
+
+@pytest.mark.asyncio
+async def test_owned_client_has_explicit_limits_and_is_recycled_on_new_backend():
+    from gui import api as api_module
+
+    api = CouncilAPI(base_url="http://one")
+    first = api._client
+    assert api._limits.max_connections == api_module.POOL_MAX_CONNECTIONS
+    assert api._limits.max_keepalive_connections == api_module.POOL_MAX_KEEPALIVE
+    assert api.http2 is api_module.HTTP2_AVAILABLE
+
+    api.update_config(base_url="http://one/")  # same backend: pool kept
+    assert api._client is first
+
+    api.update_config(base_url="http://two")
+    assert api._client is not first
+    await api.aclose()
+    assert first.is_closed
+    assert api._client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_cancel_run_posts_to_run_endpoint():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.method, request.url.path, json.loads(request.content)))
+        if request.url.path.endswith("/runs/gone/cancel"):
+            return httpx.Response(404, json={"detail": "Run not found"})
+        return httpx.Response(202, json={"run_id": "r1", "status": "cancelling"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        api = CouncilAPI(base_url="http://test", client=client)
+        assert await api.cancel_run("c1", "r1") is True
+        assert await api.cancel_run("c1", "gone", keep_partial=False) is False
+
+    assert seen == [
+        ("POST", "/api/conversations/c1/runs/r1/cancel", {"keep_partial": True}),
+        ("POST", "/api/conversations/c1/runs/gone/cancel", {"keep_partial": False}),
+    ]
@@ -5,6 +5,7 @@ from PySide6.QtCore import QCoreApplication
 from PySide6.QtTest import QSignalSpy
 
 from gui.bridge import QmlBridge
+from gui.cache import ConversationCache
 from gui.models import Conversation, ConversationMetadata, SSEEvent
 from gui.state import AppState
 from gui import bridge as bridge_module
@@ -24,6 +25,7 @@ class FakeController:
         self.created = 0
         self.raise_error = False
         self.api = FakeAPI()
+        self.cache = ConversationCache()
 
     async def load_conversations(self):
         if self.raise_error:
@@ -93,7 +95,7 @@ class FakeStreamRunner:
         self.raise_error = False
         self.api = FakeAPI()
 
-    async def start(self, conversation_id: str, content: str):
+    async def start(self, conversation_id: str, content: str, on_event=None):
         self.started = True
 
         async def _run():
@@ -222,3 +224,70 @@ class FakeAPI:
             self.base_url = base_url
         if api_key is not None:
             self.api_key = api_key
+
+
+@pytest.mark.asyncio
+async def test_bridge_emits_only_signals_for_changed_topics(qt_app):
+    state = AppState()
+    bridge = QmlBridge(FakeController(state), FakeStreamRunner(state), state)
+    await bridge.selectConversation("c1")
+
+    current_spy = QSignalSpy(bridge.currentConversationChanged)
+    status_spy = QSignalSpy(bridge.streamStatusChanged)
+    stage_spy = QSignalSpy(bridge.stageDataChanged)
+
+    state.start_stream()
+    state.apply_event(SSEEvent(type="stage1_start"))
+    state.apply_event(SSEEvent(type="stage1_complete", data=[{"model": "m1", "response": "x"}]))
+
+    assert status_spy.count() == 3
+    assert stage_spy.count() == 2  # reset on start + stage1 results
+    assert current_spy.count() == 0
+
+
+def test_notification_benchmark_reduces_reads(qt_app):
+    from gui import bench_notifications
+
+    report = bench_notifications.run(history=2, response_chars=100)
+    assert report["topics"]["signals"] < report["notify_everything"]["signals"]
+    assert report["topics"]["serialized_chars"] < report["notify_everything"]["serialized_chars"]
+
+
+@pytest.mark.asyncio
+async def test_bridge_list_models_follow_state(qt_app):
+    state = AppState()
+    bridge = QmlBridge(FakeController(state), FakeStreamRunner(state), state)
+    await bridge.loadConversations()
+    await bridge.selectConversation("c1")
+
+    assert bridge.conversationModel.rowCount() == 1
+    assert bridge.messageModel.rowCount() == 2
+    assert bridge.stage1Model.count == 1
+
+    state.start_stream()
+    assert bridge.stage1Model.count == 0
+    state.apply_event(SSEEvent(type="stage2_complete", data=[{"model": "m1", "ranking": "r"}]))
+    assert bridge.stage2Model.count == 1
+
+
+@pytest.mark.asyncio
+async def test_bridge_snapshots_rebuild_once_per_state_version(qt_app):
+    state = AppState()
+    bridge = QmlBridge(FakeController(state), FakeStreamRunner(state), state)
+    await bridge.selectConversation("c1")
+
+    first = bridge.stageData
+    for _ in range(9):
+        assert bridge.stageData is first
+    assert bridge.snapshot_counters["stageData"] == {"reads": 10, "builds": 1}
+
+    state.start_stream()
+    state.apply_event(SSEEvent(type="stage1_complete", data=[{"model": "m1", "response": "x"}]))
+    assert bridge.stageData is not first
+    bridge.stageData
+    assert bridge.snapshotCounters()["stageData"] == {"reads": 12, "builds": 2}
+
+    # Stream status changes do not invalidate the current conversation snapshot
+    current = bridge.currentConversation
+    state.apply_event(SSEEvent(type="stage2_start"))
+    assert bridge.currentConversation is current
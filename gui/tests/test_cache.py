@@ -0,0 +1,64 @@
+from gui.cache import ConversationCache, approximate_size
+from gui.models import Conversation, ConversationMetadata
+
+
+def _convo(convo_id: str, text: str = "hello") -> Conversation:
+    return Conversation.from_dict(
+        {
+            "id": convo_id,
+            "created_at": "2024-01-01T00:00:00Z",
+            "title": "T",
+            "messages": [
+                {"role": "user", "content": text},
+                {
+                    "role": "assistant",
+                    "stage3": {"model": "chair", "response": text},
+                    "stages_omitted": True,
+                },
+            ],
+        }
+    )
+
+
+def test_lru_bounded_by_count_and_size():
+    cache = ConversationCache(max_entries=2, max_bytes=10_000)
+    for convo_id in ("a", "b", "c"):
+        cache.put(_convo(convo_id))
+    assert "a" not in cache and len(cache) == 2
+
+    cache.get("b")  # touch so "c" is now least recently used
+    cache.put(_convo("big", "x" * 9_000))
+    assert "c" not in cache and "b" not in cache
+    assert "big" in cache
+    assert cache.total_bytes == approximate_size(cache.get("big"))
+
+
+def test_invalidate_and_disk_round_trip(tmp_path):
+    cache = ConversationCache(disk_dir=tmp_path)
+    cache.put(_convo("a"))
+    cache.save_list([ConversationMetadata.from_dict({"id": "a", "title": "T", "message_count": 2})])
+
+    # A new session reads entries and the list back from disk
+    restored = ConversationCache(disk_dir=tmp_path)
+    convo = restored.get("a")
+    assert convo.messages[1].stages_loaded is False
+    assert convo.messages[1].stage3.response == "hello"
+    assert [m.id for m in restored.load_list()] == ["a"]
+
+    restored.invalidate("a")
+    assert restored.get("a") is None
+    assert not (tmp_path / "a.json").exists()
+
+
+def test_disk_entries_keep_their_etag_and_need_revalidation(tmp_path):
+    convo = _convo("a")
+    convo.etag = '"v1"'
+    cache = ConversationCache(disk_dir=tmp_path)
+    cache.put(convo)
+    assert not cache.needs_revalidation("a")
+
+    restored = ConversationCache(disk_dir=tmp_path)
+    assert restored.get("a").etag == '"v1"'
+    assert restored.needs_revalidation("a")
+    restored.mark_verified("a")
+    assert not restored.needs_revalidation("a")
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from gui.coalescer import EventCoalescer
+from gui.models import SSEEvent
+from gui.state import AppState, STAGE_PAYLOADS, STREAM_STATUS, ALL_TOPICS
+from gui.stream import StreamRunner
+
+
+def _recorder(state):
+    notifications = []
+    state.subscribe(lambda changed: notifications.append(changed), topics=ALL_TOPICS)
+    return notifications
+
+
+@pytest.mark.asyncio
+async def test_coalescer_applies_frame_batch_with_one_notification():
+    state = AppState()
+    state.start_stream()
+    notifications = _recorder(state)
+    coalescer = EventCoalescer(state, interval=0.01)
+
+    coalescer.push(SSEEvent(type="stage1_start"))
+    coalescer.push(SSEEvent(type="stage1_complete", data=[{"model": "m1", "response": "a"}]))
+    coalescer.push(SSEEvent(type="stage2_start"))
+    assert notifications == []
+    assert coalescer.pending == 3
+
+    await asyncio.sleep(0.03)
+    assert coalescer.pending == 0
+    assert notifications == [frozenset({STREAM_STATUS, STAGE_PAYLOADS})]
+    assert state.stage_payloads.stage1[0].response == "a"
+    assert state.stream_status.current_stage == "stage2_start"
+
+
+@pytest.mark.asyncio
+async def test_coalescer_flushes_terminal_events_immediately():
+    state = AppState()
+    state.start_stream()
+    notifications = _recorder(state)
+    coalescer = EventCoalescer(state, interval=10)
+
+    coalescer.push(SSEEvent(type="stage3_complete", data={"model": "chair", "response": "done"}))
+    coalescer.push(SSEEvent(type="error", data={"message": "boom"}))
+
+    assert coalescer.pending == 0
+    assert coalescer.flushes == 1
+    assert state.stage_payloads.stage3.response == "done"
+    assert state.stream_status.error == "boom"
+    assert notifications[0] == frozenset({STAGE_PAYLOADS})
+
+
+@pytest.mark.asyncio
+async def test_coalescer_without_interval_applies_each_event():
+    state = AppState()
+    coalescer = EventCoalescer(state, interval=0)
+    coalescer.push(SSEEvent(type="stage1_start"))
+    coalescer.push(SSEEvent(type="stage2_start"))
+    assert coalescer.flushes == 2
+
+
+class BurstAPI:
+    async def stream_message(self, conversation_id, content, cancel_event=None):
+        for i in range(50):
+            yield SSEEvent(type="stage1_complete", data=[{"model": "m1", "response": str(i)}])
+        yield SSEEvent(type="complete")
+
+
+@pytest.mark.asyncio
+async def test_stream_runner_coalesces_burst_of_events():
+    state = AppState()
+    notifications = []
+    state.subscribe(lambda changed: notifications.append(changed), topics={STAGE_PAYLOADS})
+
+    runner = StreamRunner(BurstAPI(), state, frame_interval=0.05)
+    events = await (await runner.start("c1", "hi"))
+
+    assert len(events) == 51
+    assert state.stage_payloads.stage1[0].response == "49"
+    assert state.stream_status.last_event == "complete"
+    # The whole burst lands in one batch instead of one notification per event
+    assert len(notifications) == 1
@@ -1,13 +1,18 @@
+import asyncio
+
 import pytest
 
+from gui.cache import ConversationCache
 from gui.controller import GUIController
 from gui.state import AppState
-from gui.models import ConversationMetadata, Conversation, SSEEvent
+from gui.models import AssistantMessage, ConversationMetadata, Conversation, SSEEvent
 
 
 class FakeAPI:
-    def __init__(self):
+    def __init__(self, messages=None):
         self.stream_called = False
+        self.messages = messages or []
+        self.stage_requests = []
 
     async def list_conversations(self):
         return [
@@ -21,16 +26,23 @@ class FakeAPI:
             )
         ]
 
-    async def get_conversation(self, convo_id):
+    async def get_conversation(self, convo_id, **kwargs):
+        self.get_kwargs = kwargs
         return Conversation.from_dict(
             {
                 "id": convo_id,
                 "created_at": "2024-01-01T00:00:00Z",
                 "title": "One",
-                "messages": [],
+                "messages": self.messages,
             }
         )
 
+    async def get_message_stages(self, convo_id, index):
+        self.stage_requests.append((convo_id, index))
+        return AssistantMessage.from_dict(
+            {"stage1": [{"model": "m1", "response": "full"}], "stage2": [], "stage3": {"model": "c", "response": "r"}}
+        )
+
     async def create_conversation(self):
         return Conversation.from_dict(
             {
@@ -93,3 +105,144 @@ async def test_controller_stream_updates_state_and_terminates():
     assert [e.type for e in events] == ["stage1_start", "stage1_complete", "complete"]
     assert state.stream_status.in_flight is False
     assert state.stream_status.last_event == "complete"
+
+
+@pytest.mark.asyncio
+async def test_controller_selects_summary_and_loads_stages_on_demand():
+    api = FakeAPI(messages=[
+        {"role": "user", "content": "q"},
+        {"role": "assistant", "stage3": {"model": "c", "response": "r"}, "stages_omitted": True},
+    ])
+    state = AppState()
+    controller = GUIController(api, state)
+
+    await controller.select_conversation("c1")
+    assert api.get_kwargs == {"fields": "summary", "expand": "last"}
+    assert state.current_conversation.messages[1].stages_loaded is False
+
+    loaded = await controller.load_message_stages(1)
+    assert loaded.stage1[0].response == "full"
+    assert state.current_conversation.messages[1] is loaded
+
+    # Already loaded (or not an assistant message): no further requests
+    await controller.load_message_stages(1)
+    assert await controller.load_message_stages(0) is None
+    assert api.stage_requests == [("c1", 1)]
+
+
+@pytest.mark.asyncio
+async def test_controller_serves_cached_conversation_until_stream_invalidates():
+    api = FakeAPI()
+    state = AppState()
+    controller = GUIController(api, state)
+    calls = []
+    original = api.get_conversation
+
+    async def counting_get(convo_id, **kwargs):
+        calls.append(convo_id)
+        return await original(convo_id, **kwargs)
+
+    api.get_conversation = counting_get
+
+    first = await controller.select_conversation("c1")
+    second = await controller.select_conversation("c1")
+    assert second is first
+    assert calls == ["c1"]
+
+    controller.handle_stream_event("c1", SSEEvent(type="stage1_complete"))
+    await controller.select_conversation("c1")
+    assert calls == ["c1"]
+
+    controller.handle_stream_event("c1", SSEEvent(type="complete"))
+    await controller.select_conversation("c1")
+    assert calls == ["c1", "c1"]
+
+    # The partial turn of a cancelled run is on the server too
+    controller.handle_stream_event("c1", SSEEvent(type="cancelled"))
+    await controller.select_conversation("c1")
+    assert calls == ["c1", "c1", "c1"]
+
+
+class WarmUpAPI(FakeAPI):
+    def __init__(self, health_error=None):
+        super().__init__()
+        self.health_error = health_error
+        self.list_calls = 0
+
+    async def warm_up(self):
+        if self.health_error:
+            raise self.health_error
+        return {"status": "ok"}
+
+    async def list_conversations(self):
+        self.list_calls += 1
+        await asyncio.sleep(0)
+        return await super().list_conversations()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_prefetches_list_and_shares_it_with_ui_request():
+    api = WarmUpAPI()
+    state = AppState()
+    controller = GUIController(api, state)
+
+    ok, items = await asyncio.gather(controller.warm_up(), controller.load_conversations())
+
+    assert ok is True
+    assert api.list_calls == 1
+    assert [c.id for c in items] == ["c1"]
+    assert [c.id for c in state.conversations] == ["c1"]
+
+    await controller.load_conversations()
+    assert api.list_calls == 2  # later loads refetch
+
+
+@pytest.mark.asyncio
+async def test_warm_up_failure_is_logged_not_raised():
+    controller = GUIController(WarmUpAPI(health_error=RuntimeError("down")), AppState())
+    assert await controller.warm_up() is False
+
+
+class RevalidatingAPI(FakeAPI):
+    def __init__(self, changed):
+        super().__init__()
+        self.changed = changed
+        self.revalidated = []
+
+    async def revalidate_conversation(self, convo_id, etag, **kwargs):
+        self.revalidated.append((convo_id, etag))
+        if not self.changed:
+            return None
+        convo = await self.get_conversation(convo_id, **kwargs)
+        convo.title = "Changed elsewhere"
+        convo.etag = '"v2"'
+        return convo
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("changed", [False, True])
+async def test_disk_cached_conversation_is_shown_then_revalidated(tmp_path, changed):
+    previous_session = ConversationCache(disk_dir=tmp_path)
+    stale = await FakeAPI().get_conversation("c1")
+    stale.etag = '"v1"'
+    previous_session.put(stale)
+
+    api = RevalidatingAPI(changed)
+    state = AppState()
+    cache = ConversationCache(disk_dir=tmp_path)
+    controller = GUIController(api, state, cache)
+    shown = []
+    state.subscribe(lambda *_: shown.append(state.current_conversation.title if state.current_conversation else None))
+
+    convo = await controller.select_conversation("c1")
+
+    assert api.revalidated == [("c1", '"v1"')]
+    assert shown[0] == "One"  # the disk copy is shown before the check
+    assert state.current_conversation is convo
+    assert convo.title == ("Changed elsewhere" if changed else "One")
+    assert not cache.needs_revalidation("c1")
+    # Revalidated once per session
+    await controller.select_conversation("c1")
+    assert len(api.revalidated) == 1
+    if changed:
+        assert ConversationCache(disk_dir=tmp_path).get("c1").etag == '"v2"'
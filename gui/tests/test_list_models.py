@@ -0,0 +1,82 @@
+import pytest
+from PySide6.QtCore import QCoreApplication, Qt
+from PySide6.QtTest import QSignalSpy
+
+from gui.list_models import ConversationListModel, MessageListModel, Stage1ListModel
+from gui.models import Conversation, ConversationMetadata, Stage1Response
+
+
+@pytest.fixture(scope="module")
+def qt_app():
+    app = QCoreApplication.instance()
+    if app is None:
+        app = QCoreApplication([])
+    return app
+
+
+def _role(model, name):
+    for role, role_name in model.roleNames().items():
+        if bytes(role_name).decode() == name:
+            return role
+    raise KeyError(name)
+
+
+def _meta(convo_id, title="T"):
+    return ConversationMetadata.from_dict({"id": convo_id, "title": title, "message_count": 0})
+
+
+def test_conversation_model_emits_row_level_signals(qt_app):
+    model = ConversationListModel()
+    model.set_conversations([_meta("a"), _meta("b")], streaming_id=None)
+    assert model.rowCount() == 2
+    assert model.data(model.index(1, 0), _role(model, "conversationId")) == "b"
+
+    inserted = QSignalSpy(model.rowsInserted)
+    removed = QSignalSpy(model.rowsRemoved)
+    changed = QSignalSpy(model.dataChanged)
+    reset = QSignalSpy(model.modelReset)
+
+    # New conversation prepended: one inserted row, nothing else
+    model.set_conversations([_meta("new"), _meta("a"), _meta("b")], streaming_id=None)
+    assert inserted.count() == 1 and changed.count() == 0
+
+    # Streaming flag and title change touch single rows
+    model.set_conversations([_meta("new", "Titled"), _meta("a"), _meta("b")], streaming_id="new")
+    assert changed.count() == 1
+    assert model.data(model.index(0, 0), _role(model, "streaming")) is True
+    assert model.data(model.index(0, 0), _role(model, "title")) == "Titled"
+
+    model.set_conversations([_meta("new", "Titled"), _meta("b")], streaming_id="new")
+    assert removed.count() == 1
+    assert reset.count() == 0
+    assert model.count == 2
+
+
+def test_stage_and_message_models(qt_app):
+    stage1 = Stage1ListModel()
+    count_spy = QSignalSpy(stage1.countChanged)
+    stage1.set_items([Stage1Response("m1", "one")])
+    stage1.set_items([Stage1Response("m1", "one"), Stage1Response("m2", "two")])
+    assert count_spy.count() == 2
+    assert stage1.data(stage1.index(1, 0), _role(stage1, "response")) == "two"
+
+    messages = MessageListModel()
+    convo = Conversation.from_dict(
+        {
+            "id": "c1",
+            "created_at": "",
+            "title": "T",
+            "messages": [
+                {"role": "user", "content": "q"},
+                {"role": "assistant", "stage3": {"model": "chair", "response": "final"}, "stages_omitted": True},
+            ],
+        }
+    )
+    messages.set_messages("c1", convo.messages)
+    assert messages.data(messages.index(1, 0), _role(messages, "content")) == "final"
+    assert messages.data(messages.index(1, 0), _role(messages, "stagesLoaded")) is False
+
+    # Switching conversations replaces the rows instead of patching them
+    inserted = QSignalSpy(messages.rowsInserted)
+    messages.set_messages("c2", convo.messages[:1])
+    assert inserted.count() == 1 and messages.rowCount() == 1
@@ -32,6 +32,22 @@ def test_conversation_from_dict_parses_message_types():
     assert isinstance(convo.messages[1], models.AssistantMessage)
 
 
+def test_conversation_from_dict_tolerates_summary_form():
+    raw = {
+        "id": "abc",
+        "created_at": "2024-01-01T00:00:00Z",
+        "title": "Test",
+        "messages": [
+            {"role": "user", "content": "hello"},
+            {"role": "assistant", "stage3": {"model": "c", "response": "r"}, "metadata": None, "stages_omitted": True},
+        ],
+    }
+    message = models.Conversation.from_dict(raw).messages[1]
+    assert message.stages_loaded is False
+    assert message.stage1 == [] and message.stage2 == []
+    assert message.stage3.response == "r"
+
+
 def test_sse_event_parsing_raw_payload():
     raw = "not-json"
     ev = models.SSEEvent(type="raw", raw=raw)
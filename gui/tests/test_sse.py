@@ -0,0 +1,62 @@
+import pytest
+
+from gui.api import CouncilAPI
+from gui.sse import SSEDecoder
+
+
+def _feed_all(decoder, chunks):
+    events = []
+    for chunk in chunks:
+        events.extend(decoder.feed(chunk))
+    return events
+
+
+def test_decoder_joins_multiline_data_and_tracks_fields():
+    stream = (
+        b": keep-alive\n"
+        b"retry: 1500\n"
+        b"id: 7\n"
+        b"event: stage1_complete\n"
+        b"data: {\"a\":\n"
+        b"data:1}\n"
+        b"\n"
+        b"data: second\n\n"
+    )
+    decoder = SSEDecoder()
+    events = decoder.feed(stream)
+
+    assert [e.data for e in events] == [b'{"a":\n1}', b"second"]
+    assert events[0].event == "stage1_complete"
+    assert events[1].event == "message"
+    assert events[0].id == events[1].id == "7"
+    assert decoder.retry == 1500
+
+
+@pytest.mark.parametrize("newline", [b"\n", b"\r\n", b"\r"])
+def test_decoder_handles_line_endings_split_byte_by_byte(newline):
+    stream = b"\xef\xbb\xbfdata: one" + newline + newline + b"data: two" + newline + newline
+    events = _feed_all(SSEDecoder(), [stream[i:i + 1] for i in range(len(stream))])
+    assert [e.data for e in events] == [b"one", b"two"]
+
+
+def test_decoder_ignores_invalid_fields_and_drops_incomplete_event():
+    decoder = SSEDecoder()
+    events = decoder.feed(b"retry: soon\nid: a\x00b\nunknown: x\ndata\n\ndata: tail")
+    assert [e.data for e in events] == [b""]
+    assert decoder.retry is None
+    assert decoder.last_event_id is None
+
+
+def test_parse_event_uses_sse_event_name_and_id():
+    ev = CouncilAPI._parse_event(b'{"data": {"x": 1}}', "stage3_complete", "42")
+    assert ev.type == "stage3_complete"
+    assert ev.data == {"x": 1}
+    assert ev.id == "42"
+    assert ev.raw is None
+
+
+def test_sse_benchmark_runs_small_stream():
+    from gui import bench_sse
+
+    report = bench_sse.run(events=200, chunk_size=512, repeat=1)
+    assert report["decoder"]["events"] == report["line_concat"]["events"] == 200
@@ -0,0 +1,66 @@
+import asyncio
+import concurrent.futures
+import itertools
+
+import pytest
+
+from gui.controller import GUIController
+from gui.models import ConversationMetadata
+from gui.startup import StartupProfile, prefetch_conversations
+from gui.state import AppState
+
+
+def test_startup_profile_records_phase_durations():
+    ticks = itertools.count(0.0, 0.25)
+    profile = StartupProfile(clock=lambda: next(ticks))
+    profile.mark("import Qt")
+    profile.mark("QML load")
+
+    assert profile.phases == [("import Qt", 0.25, 0.25), ("QML load", 0.25, 0.5)]
+    assert profile.has("QML load") and not profile.has("first frame")
+    assert "QML load" in profile.report()
+
+
+def test_prefetch_reports_connection_errors_through_future():
+    future = prefetch_conversations("http://127.0.0.1:9", None)
+    with pytest.raises(Exception):
+        future.result(timeout=10)
+
+
+class CountingAPI:
+    def __init__(self):
+        self.list_calls = 0
+
+    async def warm_up(self):
+        return {"status": "ok"}
+
+    async def list_conversations(self):
+        self.list_calls += 1
+        return [ConversationMetadata("fresh", "", "Fresh", 0)]
+
+
+@pytest.mark.asyncio
+async def test_warm_up_adopts_prefetched_list():
+    api = CountingAPI()
+    state = AppState()
+    controller = GUIController(api, state)
+    prefetched = concurrent.futures.Future()
+    prefetched.set_result([ConversationMetadata("pre", "", "Prefetched", 1)])
+
+    ok, items = await asyncio.gather(controller.warm_up(prefetched), controller.load_conversations())
+
+    assert ok is True
+    assert api.list_calls == 0
+    assert [c.id for c in items] == [c.id for c in state.conversations] == ["pre"]
+
+
+@pytest.mark.asyncio
+async def test_warm_up_refetches_when_prefetch_failed():
+    api = CountingAPI()
+    state = AppState()
+    prefetched = concurrent.futures.Future()
+    prefetched.set_exception(RuntimeError("down"))
+
+    assert await GUIController(api, state).warm_up(prefetched) is True
+    assert api.list_calls == 1
+    assert [c.id for c in state.conversations] == ["fresh"]
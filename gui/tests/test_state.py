@@ -105,3 +105,56 @@ def test_stage_payloads_hydrate_from_conversation():
     assert len(state.stage_payloads.stage2) == 1
     assert state.stage_payloads.stage3.response == "done"
     assert state.stage_payloads.aggregate_rankings[0]["rankings_count"] == 2
+
+
+def test_topic_subscriptions_receive_only_changed_topics():
+    from gui import state as state_module
+
+    state = AppState()
+    seen = []
+    state.subscribe(seen.append, topics={state_module.STREAM_STATUS, state_module.STAGE_PAYLOADS})
+    titles = []
+    state.subscribe(titles.append, topics={state_module.CONVERSATIONS})
+
+    state.start_stream()
+    assert seen == [{state_module.STREAM_STATUS}]
+
+    state.apply_event(SSEEvent(type="stage1_complete", data=[{"model": "m", "response": "r"}]))
+    assert seen[-1] == {state_module.STREAM_STATUS, state_module.STAGE_PAYLOADS}
+
+    # Unchanged values do not notify
+    count = len(seen)
+    state.set_backend_url(state.backend_url)
+    state.end_stream()
+    state.end_stream()
+    assert len(seen) == count + 1
+    assert titles == []
+
+    state.set_conversations([ConversationMetadata.from_dict({"id": "c1", "title": "T"})])
+    state.set_conversations([ConversationMetadata.from_dict({"id": "c1", "title": "T"})])
+    assert titles == [{state_module.CONVERSATIONS}]
+
+
+def test_council_members_render_as_they_arrive():
+    state = AppState()
+    state.start_stream()
+
+    state.apply_event(SSEEvent(type="stage1_model_complete", data={"model": "fast", "response": "r1"}))
+    assert [r.model for r in state.stage_payloads.stage1] == ["fast"]
+    state.apply_events([
+        SSEEvent(type="stage1_model_complete", data={"model": "slow", "response": "r2"}),
+        SSEEvent(type="stage1_model_complete", data={"model": "fast", "response": "r1"}),
+    ])
+    assert [r.model for r in state.stage_payloads.stage1] == ["slow", "fast"]
+    # The stage's complete list is authoritative
+    state.apply_event(SSEEvent(type="stage1_complete", data=[
+        {"model": "fast", "response": "r1"}, {"model": "slow", "response": "r2"}
+    ]))
+    assert [r.model for r in state.stage_payloads.stage1] == ["fast", "slow"]
+
+    state.apply_event(SSEEvent(
+        type="stage2_model_complete",
+        data={"model": "slow", "ranking": "FINAL RANKING:\n1. Response A", "parsed_ranking": ["Response A"]},
+    ))
+    assert state.stage_payloads.stage2[0].parsed_ranking == ["Response A"]
+    assert state.stream_status.current_stage == "stage2_model_complete"
@@ -116,3 +116,98 @@ async def test_stream_runner_sets_error_after_retry_exhaustion():
     assert state.stream_status.last_event == "error"
     assert state.stream_status.error.startswith("always down")
     assert api.calls == 2
+
+
+class RunAPI:
+    """Streams a run until the backend is told to cancel it."""
+
+    def __init__(self):
+        self.cancelled_runs = []
+        self.stage1_sent = asyncio.Event()
+        self._stop = asyncio.Event()
+
+    async def cancel_run(self, conversation_id, run_id, keep_partial=True):
+        self.cancelled_runs.append((conversation_id, run_id))
+        self._stop.set()
+        return True
+
+    async def stream_message(self, conversation_id, content, cancel_event=None):
+        yield SSEEvent(type="run_started", data={"run_id": "r1"})
+        yield SSEEvent(type="stage1_complete", data=[{"model": "m1", "response": "r1"}])
+        self.stage1_sent.set()
+        await self._stop.wait()
+        yield SSEEvent(type="cancelled", data=[{"model": "m1", "response": "r1"}], metadata={"run_id": "r1"})
+
+
+@pytest.mark.asyncio
+async def test_stream_runner_cancel_stops_backend_run():
+    api = RunAPI()
+    state = AppState()
+    runner = StreamRunner(api, state, frame_interval=0)
+
+    task = await runner.start("c1", "hello")
+    await api.stage1_sent.wait()
+    await runner.cancel()
+    events = await task
+
+    assert api.cancelled_runs == [("c1", "r1")]
+    assert [e.type for e in events][0] == "run_started"
+    assert state.stream_status.cancelled is True
+    assert [r.response for r in state.stage_payloads.stage1] == ["r1"]
+
+
+class LocalFirstRunAPI(RunAPI):
+    """Records whether reading had already been stopped when the backend was asked to cancel."""
+
+    def __init__(self, fail_cancel=False):
+        super().__init__()
+        self.fail_cancel = fail_cancel
+        self.cancel_event = None
+        self.stopped_locally_first = None
+
+    async def cancel_run(self, conversation_id, run_id, keep_partial=True):
+        self.stopped_locally_first = self.cancel_event.is_set()
+        if self.fail_cancel:
+            raise RuntimeError("backend unreachable")
+        return await super().cancel_run(conversation_id, run_id, keep_partial)
+
+    async def stream_message(self, conversation_id, content, cancel_event=None):
+        self.cancel_event = cancel_event
+        async for event in super().stream_message(conversation_id, content, cancel_event):
+            if cancel_event.is_set():
+                return
+            yield event
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fail_cancel", [False, True])
+async def test_stream_runner_cancel_stops_reading_before_the_backend_cancel(fail_cancel):
+    api = LocalFirstRunAPI(fail_cancel=fail_cancel)
+    state = AppState()
+    runner = StreamRunner(api, state, frame_interval=0)
+    seen = []
+
+    task = await runner.start("c1", "hello", on_event=lambda event: seen.append(event.type))
+    await api.stage1_sent.wait()
+    await runner.cancel()
+
+    assert task.done()
+    assert api.stopped_locally_first is True
+    assert state.stream_status.cancelled is True
+    # Observers (the conversation cache) still hear that the turn was cancelled
+    assert seen == ["run_started", "stage1_complete", "cancelled"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_event_from_backend_ends_stream_as_cancelled():
+    api = RunAPI()
+    api._stop.set()  # cancelled elsewhere, e.g. from another client
+    state = AppState()
+    runner = StreamRunner(api, state, frame_interval=0)
+
+    events = await (await runner.start("c1", "hello"))
+
+    assert events[-1].type == "cancelled"
+    assert api.cancelled_runs == []
+    assert state.stream_status.cancelled is True
+    assert state.stream_status.last_event == "cancelled"
@@ -20,8 +20,8 @@ ApplicationWindow {
     Component.onCompleted: bridge.loadConversations()
 
     function stageComplete(key) {
-        if (key === "stage1") return bridge.stageData.stage1 && bridge.stageData.stage1.length > 0;
-        if (key === "stage2") return bridge.stageData.stage2 && bridge.stageData.stage2.length > 0;
+        if (key === "stage1") return bridge.stage1Model.count > 0;
+        if (key === "stage2") return bridge.stage2Model.count > 0;
         if (key === "stage3") return bridge.stageData.stage3 !== null;
         return false;
     }
@@ -110,11 +110,11 @@ ApplicationWindow {
                         Layout.fillWidth: true
                         Layout.fillHeight: true
                         clip: true
-                        model: bridge.conversations
+                        model: bridge.conversationModel
                         delegate: Item {
                             width: convoList.width
                             height: 64
-                            property var convo: modelData
+                            property var convo: model
                             Rectangle {
                                 anchors.fill: parent
                                 anchors.margins: 6
@@ -135,7 +135,7 @@ ApplicationWindow {
                                             elide: Label.ElideRight
                                         }
                                         Label {
-                                            text: convo.streaming ? "Streaming" : (convo.message_count + " message(s)")
+                                            text: convo.streaming ? "Streaming" : (convo.messageCount + " message(s)")
                                             color: muted
                                             font.pixelSize: 11
                                         }
@@ -153,7 +153,7 @@ ApplicationWindow {
                                 anchors.fill: parent
                                 onClicked: {
                                     convoList.currentIndex = index
-                                    bridge.selectConversation(convo.id)
+                                    bridge.selectConversation(convo.conversationId)
                                 }
                             }
                         }
@@ -282,10 +282,10 @@ ApplicationWindow {
                                 RowLayout {
                                     spacing: 8
                                     Label { text: "Stage 1 · Model Responses"; color: "white"; font.pixelSize: 16; font.bold: true }
-                                    Label { text: bridge.stageData.stage1.length ? "(" + bridge.stageData.stage1.length + ")" : ""; color: muted; font.pixelSize: 12 }
+                                    Label { text: bridge.stage1Model.count ? "(" + bridge.stage1Model.count + ")" : ""; color: muted; font.pixelSize: 12 }
                                 }
                                 Repeater {
-                                    model: bridge.stageData.stage1
+                                    model: bridge.stage1Model
                                     delegate: Rectangle {
                                         Layout.fillWidth: true
                                         height: implicitHeight
@@ -296,9 +296,9 @@ ApplicationWindow {
                                             anchors.fill: parent
                                             anchors.margins: 12
                                             spacing: 6
-                                            Label { text: modelData.model; color: accent; font.pixelSize: 13; font.bold: true }
+                                            Label { text: model.modelName; color: accent; font.pixelSize: 13; font.bold: true }
                                             Text {
-                                                text: modelData.response
+                                                text: model.response
                                                 wrapMode: Text.Wrap
                                                 color: "white"
                                                 font.pixelSize: 13
@@ -307,7 +307,7 @@ ApplicationWindow {
                                     }
                                 }
                                 Label {
-                                    visible: bridge.stageData.stage1.length === 0
+                                    visible: bridge.stage1Model.count === 0
                                     text: bridge.streamStatus.inFlight ? "Waiting for models…" : "No responses yet. Ask a question to start."
                                     color: muted
                                     font.pixelSize: 13
@@ -323,10 +323,10 @@ ApplicationWindow {
                                 RowLayout {
                                     spacing: 8
                                     Label { text: "Stage 2 · Peer Rankings"; color: "white"; font.pixelSize: 16; font.bold: true }
-                                    Label { text: bridge.stageData.stage2.length ? "(" + bridge.stageData.stage2.length + ")" : ""; color: muted; font.pixelSize: 12 }
+                                    Label { text: bridge.stage2Model.count ? "(" + bridge.stage2Model.count + ")" : ""; color: muted; font.pixelSize: 12 }
                                 }
                                 Repeater {
-                                    model: bridge.stageData.stage2
+                                    model: bridge.stage2Model
                                     delegate: Rectangle {
                                         Layout.fillWidth: true
                                         radius: 10
@@ -336,16 +336,16 @@ ApplicationWindow {
                                             anchors.fill: parent
                                             anchors.margins: 12
                                             spacing: 6
-                                            Label { text: modelData.model; color: accent; font.pixelSize: 13; font.bold: true }
+                                            Label { text: model.modelName; color: accent; font.pixelSize: 13; font.bold: true }
                                             Text {
-                                                text: modelData.ranking
+                                                text: model.ranking
                                                 wrapMode: Text.Wrap
                                                 color: "white"
                                                 font.pixelSize: 13
                                             }
                                             Label {
-                                                visible: modelData.parsed_ranking && modelData.parsed_ranking.length > 0
-                                                text: modelData.parsed_ranking ? modelData.parsed_ranking.join(" → ") : ""
+                                                visible: model.parsedRanking && model.parsedRanking.length > 0
+                                                text: model.parsedRanking ? model.parsedRanking.join(" → ") : ""
                                                 color: muted
                                                 font.pixelSize: 12
                                             }
@@ -353,7 +353,7 @@ ApplicationWindow {
                                     }
                                 }
                                 Label {
-                                    visible: bridge.stageData.stage2.length === 0
+                                    visible: bridge.stage2Model.count === 0
                                     text: bridge.streamStatus.inFlight ? "Waiting for peer rankings…" : "No rankings yet."
                                     color: muted
                                     font.pixelSize: 13